@@ -0,0 +1,87 @@
+"""
+Sync vs. async repositories under concurrent requests.
+
+    python -m benchmarks.async_repositories [clients] [requests_per_client]
+
+Each simulated request opens a session and reads its user's balance and held credits, the
+database work of GET /api/credits. A probe task measures how late the event loop wakes it: the
+sync driver blocks the loop for every query, the async driver doesn't. (Concurrent writes
+can't be compared: with the sync driver a request blocking on SQLite's write lock also blocks
+the request holding it, until the busy timeout fails one of them.)
+"""
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.domain.entities.user import User
+from src.domain.value_objects.credits import Credits
+from src.domain.value_objects.email import Email
+from src.infrastructure.database.connection import DatabaseConnection
+from src.infrastructure.repositories import create_user_repository
+
+PROBE_INTERVAL = 0.001
+
+
+async def run(driver: str, directory: Path, clients: int, requests: int) -> None:
+    db = DatabaseConnection(f"{driver}:///{directory / f'{driver}.db'}")
+    await db.create_tables()
+    async with db.get_session() as session:
+        users = create_user_repository(session)
+        for i in range(clients):
+            await users.save(User.create(Email(f"user{i}@example.com"), Credits(10)))
+
+    lags = []
+    latencies = []
+    stopping = False
+
+    async def probe() -> None:
+        while not stopping:
+            started = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(time.perf_counter() - started - PROBE_INTERVAL)
+
+    async def client(i: int) -> None:
+        email = Email(f"user{i}@example.com")
+        for _ in range(requests):
+            started = time.perf_counter()
+            async with db.get_session() as session:
+                users = create_user_repository(session)
+                user = await users.find_by_email(email)
+                await users.find_held_credits(user.id)
+            latencies.append(time.perf_counter() - started)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    stopping = True
+    await prober
+
+    if db.is_async:
+        await db.engine.dispose()
+    else:
+        db.engine.dispose()
+
+    latencies.sort()
+    lags.sort()
+    print(
+        f"{driver:<18} {len(latencies) / elapsed:7.0f} req/s  mean {statistics.mean(latencies) * 1000:6.2f} ms  "
+        f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:6.2f} ms  "
+        f"loop lag p99 {lags[int(0.99 * (len(lags) - 1))] * 1000:6.2f} ms  max {lags[-1] * 1000:6.2f} ms"
+    )
+
+
+async def main(clients: int, requests: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        for driver in ("sqlite", "sqlite+aiosqlite"):
+            await run(driver, Path(directory), clients, requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        clients=int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        requests=int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    ))
@@ -0,0 +1,91 @@
+"""
+Many parallel generations for one user, with the fake image generator.
+
+    python -m benchmarks.credit_contention [generations] [credits]
+
+The user can afford fewer generations than are fired at once, so every request races for the
+same balance. The conditional hold must grant exactly credits // 3 of them, the balance must
+never go negative, and the ledger must hold one capture per granted generation. Set
+DATABASE_URL to run against another database; by default a throwaway sqlite+aiosqlite file is used.
+"""
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+from PIL import Image
+from sqlalchemy import func, select
+
+SETTINGS = {
+    "IMAGE_GENERATOR_BACKEND": "fake",
+    "FAKE_GENERATOR_LATENCY_P50_SECONDS": "0.05",
+    "FAKE_GENERATOR_LATENCY_P99_SECONDS": "0.1",
+    "FAKE_GENERATOR_IMAGE_SIZE": "32",
+    "BLOB_STORE_BACKEND": "memory",
+    "GENERATION_CACHE_ENABLED": "false",
+    "REFERENCE_ASSET_DIR": "",
+    "GENERATION_RECORD_DIR": "",
+    "FAKE_GENERATOR_REPLAY_DIR": "",
+    "GENERATION_MAX_CONCURRENT_CALLS": "1000",
+    "PROVIDER_LIMITER_INITIAL_LIMIT": "1000",
+    "PROVIDER_LIMITER_MAX_LIMIT": "1000",
+    "PROVIDER_LIMITER_MAX_QUEUE": "10000",
+}
+
+
+def reference_image(shade: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (shade % 256, 0, 0)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+async def main(generations: int, credits: int) -> None:
+    from src.domain.entities.user import User
+    from src.domain.value_objects.credits import Credits
+    from src.domain.value_objects.email import Email
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.database.models import TransactionModel, UserModel
+    from src.infrastructure.repositories import create_user_repository
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        async with get_database().get_session() as session:
+            await create_user_repository(session).save(User.create(Email("contended@example.com"), Credits(credits)))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post(
+                    "/api/generate",
+                    data={"prompt": f"style of benchmark {i}", "user_email": "contended@example.com"},
+                    files={"image": ("photo.png", reference_image(i), "image/png")}
+                )
+                for i in range(generations)
+            ))
+            elapsed = time.perf_counter() - started
+
+        async with get_database().get_session() as session:
+            balance = (await session.execute(
+                select(UserModel.credits).where(UserModel.email == "contended@example.com")
+            )).scalar_one()
+            ledger = (await session.execute(select(func.count()).select_from(TransactionModel))).scalar_one()
+
+    statuses = Counter(response.status_code for response in responses)
+    print(f"{generations} parallel generations at 3 credits from {credits} in {elapsed:.2f} s")
+    print(f"  responses {dict(sorted(statuses.items()))}  (expected {credits // 3} x 200)")
+    print(f"  final balance {balance} (expected {credits % 3})  ledger rows {ledger}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ.update(SETTINGS)
+        os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{directory}/contention.db")
+        asyncio.run(main(count, budget))
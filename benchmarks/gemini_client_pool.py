@@ -0,0 +1,94 @@
+"""
+Per-request vs. pooled Gemini client against a local HTTP stand-in.
+
+    python -m benchmarks.gemini_client_pool [calls] [concurrency]
+
+The stand-in answers generateContent with a tiny inline image, so the numbers are the client's
+own overhead: building a genai.Client, opening connections and tearing them down.
+"""
+import asyncio
+import base64
+import json
+import statistics
+import sys
+import time
+
+from PIL import Image
+
+from src.domain.services.image_generator import GenerationRequest
+from src.infrastructure.external_services.gemini_image_generator import GeminiImageGenerator
+
+RESPONSE = json.dumps({"candidates": [{"content": {"parts": [
+    {"inlineData": {"mimeType": "image/png", "data": base64.b64encode(b"image").decode()}}
+]}}]}).encode()
+
+
+class StandIn:
+    """Minimal keep-alive HTTP/1.1 server answering every request with RESPONSE"""
+
+    def __init__(self) -> None:
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        while await reader.readline():
+            length = 0
+            while (header := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = header.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n" % len(RESPONSE)
+                + RESPONSE
+            )
+            await writer.drain()
+        writer.close()
+
+
+async def run(label: str, stand_in: StandIn, base_url: str, calls: int, concurrency: int, pooled: bool) -> None:
+    request = GenerationRequest("style of test", Image.new("RGB", (64, 64)), variations=1)
+    shared = GeminiImageGenerator(api_key="benchmark", base_url=base_url) if pooled else None
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def call() -> None:
+        async with slots:
+            started = time.perf_counter()
+            generator = shared or GeminiImageGenerator(api_key="benchmark", base_url=base_url)
+            try:
+                await generator.generate_variation(request, 0)
+            finally:
+                if shared is None:
+                    await generator.aclose()
+            latencies.append(time.perf_counter() - started)
+
+    stand_in.connections = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(calls)))
+    elapsed = time.perf_counter() - started
+    if shared is not None:
+        await shared.aclose()
+
+    latencies.sort()
+    print(
+        f"{label:<12} {calls / elapsed:7.0f} calls/s  mean {statistics.mean(latencies) * 1000:6.2f} ms  "
+        f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:6.2f} ms  connections {stand_in.connections}"
+    )
+
+
+async def main(calls: int, concurrency: int) -> None:
+    stand_in = StandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+
+    async with server:
+        for pooled in (False, True):
+            await run("pooled" if pooled else "per-request", stand_in, base_url, calls, concurrency, pooled)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        calls=int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        concurrency=int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    ))
@@ -0,0 +1,123 @@
+"""
+Per-request vs. pooled Stripe gateway against a local HTTP stand-in.
+
+    python -m benchmarks.stripe_checkout_pool [sessions] [concurrency] [latency_ms]
+
+The stand-in answers every checkout session after latency_ms, like Stripe's own API would. A
+pooled gateway runs concurrent sessions in parallel (wall time close to sessions / concurrency
+latencies) and reuses its keep-alive connections, so it opens about `concurrency` of them however
+many sessions it creates; a gateway per request opens one connection per session.
+"""
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from src.domain.value_objects.money import Money
+from src.infrastructure.external_services.stripe_payment_gateway import StripePaymentGateway
+
+
+class StandIn:
+    """Minimal keep-alive HTTP/1.1 server answering every request with a checkout session"""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.connections = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        while await reader.readline():
+            length = 0
+            while (header := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = header.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+
+            self.requests += 1
+            number = self.requests
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            await asyncio.sleep(self.latency)
+            self.in_flight -= 1
+
+            body = json.dumps({
+                "id": f"cs_test_{number}",
+                "object": "checkout.session",
+                "url": f"https://checkout.stripe.test/{number}",
+            }).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n" % len(body)
+                + body
+            )
+            await writer.drain()
+        writer.close()
+
+
+async def create_session(gateway: StripePaymentGateway) -> str:
+    session = await gateway.create_checkout_session(
+        customer_id="cus_benchmark",
+        amount=Money(5, "USD"),
+        product_name="10 credits",
+        product_description="Benchmark package",
+        success_url="https://example.com/success",
+        cancel_url="https://example.com/cancel",
+        metadata={"user_id": "1"}
+    )
+    return session.session_id
+
+
+async def run(label: str, stand_in: StandIn, api_base: str, sessions: int, concurrency: int, pooled: bool) -> None:
+    shared = StripePaymentGateway(api_key="sk_test_benchmark", api_base=api_base) if pooled else None
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def call() -> None:
+        async with slots:
+            started = time.perf_counter()
+            gateway = shared or StripePaymentGateway(api_key="sk_test_benchmark", api_base=api_base)
+            try:
+                await create_session(gateway)
+            finally:
+                if shared is None:
+                    await gateway.aclose()
+            latencies.append(time.perf_counter() - started)
+
+    stand_in.connections = 0
+    stand_in.peak_in_flight = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    if shared is not None:
+        await shared.aclose()
+
+    latencies.sort()
+    print(
+        f"{label:<12} {elapsed:6.2f} s  mean {statistics.mean(latencies) * 1000:7.2f} ms  "
+        f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:7.2f} ms  "
+        f"parallel {stand_in.peak_in_flight}  connections {stand_in.connections}"
+    )
+
+
+async def main(sessions: int, concurrency: int, latency: float) -> None:
+    stand_in = StandIn(latency)
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    api_base = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    print(f"{sessions} checkout sessions, {concurrency} at a time, {latency * 1000:.0f} ms each")
+    print(f"  serial would take {sessions * latency:.2f} s, fully parallel {sessions / concurrency * latency:.2f} s")
+    async with server:
+        for pooled in (False, True):
+            await run("pooled" if pooled else "per-request", stand_in, api_base, sessions, concurrency, pooled)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        sessions=int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        concurrency=int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+        latency=(int(sys.argv[3]) if len(sys.argv) > 3 else 50) / 1000
+    ))
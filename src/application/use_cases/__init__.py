@@ -3,11 +3,27 @@ from src.application.use_cases.complete_payment import (
     CompletePaymentResponse,
     CompletePaymentUseCase,
 )
+from src.application.use_cases.complete_generation_job import (
+    CompleteGenerationJobRequest,
+    CompleteGenerationJobUseCase,
+)
 from src.application.use_cases.generate_image import (
     GenerateImageRequest,
     GenerateImageResponse,
     GenerateImageUseCase,
 )
+from src.application.use_cases.generate_image_batch import (
+    BatchItem,
+    BatchItemResult,
+    GenerateImageBatchRequest,
+    GenerateImageBatchResponse,
+    GenerateImageBatchUseCase,
+)
+from src.application.use_cases.get_generation_job import (
+    GetGenerationJobRequest,
+    GetGenerationJobResponse,
+    GetGenerationJobUseCase,
+)
 from src.application.use_cases.get_user_credits import (
     GetUserCreditsRequest,
     GetUserCreditsResponse,
@@ -18,26 +34,52 @@ from src.application.use_cases.purchase_credits import (
     PurchaseCreditsResponse,
     PurchaseCreditsUseCase,
 )
+from src.application.use_cases.release_expired_holds import (
+    ReleaseExpiredHoldsRequest,
+    ReleaseExpiredHoldsResponse,
+    ReleaseExpiredHoldsUseCase,
+)
 from src.application.use_cases.submit_feedback import (
     SubmitFeedbackRequest,
     SubmitFeedbackResponse,
     SubmitFeedbackUseCase,
 )
+from src.application.use_cases.submit_generation_job import (
+    SubmitGenerationJobRequest,
+    SubmitGenerationJobResponse,
+    SubmitGenerationJobUseCase,
+)
 
 __all__ = [
+    "BatchItem",
+    "BatchItemResult",
+    "CompleteGenerationJobRequest",
+    "CompleteGenerationJobUseCase",
     "CompletePaymentRequest",
     "CompletePaymentResponse",
     "CompletePaymentUseCase",
+    "GenerateImageBatchRequest",
+    "GenerateImageBatchResponse",
+    "GenerateImageBatchUseCase",
     "GenerateImageRequest",
     "GenerateImageResponse",
     "GenerateImageUseCase",
+    "GetGenerationJobRequest",
+    "GetGenerationJobResponse",
+    "GetGenerationJobUseCase",
     "GetUserCreditsRequest",
     "GetUserCreditsResponse",
     "GetUserCreditsUseCase",
     "PurchaseCreditsRequest",
     "PurchaseCreditsResponse",
     "PurchaseCreditsUseCase",
+    "ReleaseExpiredHoldsRequest",
+    "ReleaseExpiredHoldsResponse",
+    "ReleaseExpiredHoldsUseCase",
     "SubmitFeedbackRequest",
     "SubmitFeedbackResponse",
     "SubmitFeedbackUseCase",
+    "SubmitGenerationJobRequest",
+    "SubmitGenerationJobResponse",
+    "SubmitGenerationJobUseCase",
 ]
@@ -0,0 +1,115 @@
+from src.application.use_cases.generate_image import GenerateImageUseCase
+from src.domain.entities.credit_transaction import CreditTransaction, TransactionType
+from src.domain.entities.generation_job import GenerationJob
+from src.domain.entities.user import User
+from src.domain.exceptions import JobLeaseLostError, UserNotFoundError
+from src.domain.repositories.generation_job_repository import GenerationJobRepository
+from src.domain.repositories.user_repository import UserRepository
+from src.domain.services.image_generator import VariationResult
+from src.domain.value_objects.credits import Credits
+from src.shared.result import Failure, Result, Success
+
+
+class CompleteGenerationJobRequest:
+    """Request for recording the outcome of a generation job."""
+
+    def __init__(
+            self,
+            job: GenerationJob,
+            worker_id: str,
+            results: list[VariationResult],
+            error: str | None = None
+    ) -> None:
+        self.job = job
+        self.worker_id = worker_id
+        self.results = results
+        self.error = error
+
+
+class CompleteGenerationJobUseCase:
+    """
+    Use case for storing job results and settling the job's credit hold.
+
+    Delivered images are captured from the hold, one credit each (one in all when every image came
+    from the result cache), and the rest is released. Jobs queued before they carried a hold were
+    charged up front, and are refunded what they didn't deliver instead.
+    """
+
+    def __init__(
+            self,
+            user_repo: UserRepository,
+            job_repo: GenerationJobRepository
+    ) -> None:
+        self._user_repo = user_repo
+        self._job_repo = job_repo
+
+    async def execute(self, request: CompleteGenerationJobRequest) -> Result[GenerationJob]:
+        job = request.job
+        user = await self._user_repo.find_by_id(job.user_id)
+        if not user:
+            return Failure(UserNotFoundError(f"User {job.user_id} not found"))
+
+        succeeded = [result for result in request.results if result.succeeded]
+
+        if succeeded:
+            job.mark_succeeded([result.image for result in succeeded])
+            charged = Credits(min(
+                len(succeeded) * GenerateImageUseCase.CREDITS_PER_IMAGE.value,
+                job.credits_charged.value
+            ))
+            reason = f"Image generation job - {len(succeeded)} of {job.variations} images delivered"
+            cached_price = GenerateImageUseCase.CREDITS_PER_CACHED_GENERATION
+            if all(result.cached for result in succeeded) and charged > cached_price:
+                charged = cached_price
+                reason = f"{reason} - cached"
+        else:
+            errors = "; ".join(str(result.error) for result in request.results if result.error)
+            job.mark_failed(request.error or errors or "Failed to generate any images")
+            charged, reason = Credits(0), f"Generation job failed: {job.error[:100]}"
+
+        # The credits are only settled by the worker whose claim actually recorded the outcome
+        completed = await self._job_repo.complete(job, request.worker_id)
+        if completed is None:
+            return Failure(JobLeaseLostError(f"Job {job.id} was claimed by another worker"))
+
+        if job.hold_id is None:
+            await self._refund(user, job.credits_charged - charged, reason)
+        else:
+            await self._settle(job, charged, reason)
+
+        return Success(completed)
+
+    async def _settle(self, job: GenerationJob, charged: Credits, reason: str) -> None:
+        """Capture the charged credits from the job's hold and release the rest"""
+        if charged.value == 0:
+            await self._user_repo.release_hold(CreditTransaction(
+                id=None,
+                user_id=job.user_id,
+                transaction_type=TransactionType.RELEASE,
+                credits=job.credits_charged,
+                description=reason,
+                hold_id=job.hold_id
+            ))
+            return
+
+        capture = CreditTransaction(
+            id=None,
+            user_id=job.user_id,
+            transaction_type=TransactionType.CAPTURE,
+            credits=Credits(-charged.value),
+            description=reason,
+            hold_id=job.hold_id
+        )
+        if await self._user_repo.capture_hold(capture) is not None:
+            return
+        # The hold outlived its TTL and was swept back; charge what was delivered directly
+        balance = await self._user_repo.apply_transaction(CreditTransaction.create_usage(job.user_id, charged, reason))
+        if balance is None:
+            print(f"[CREDITS] Hold {job.hold_id} expired and user {job.user_id} can no longer pay for it")
+
+    async def _refund(self, user: User, refund: Credits, reason: str) -> None:
+        """Refund what a job charged up front did not deliver"""
+        if refund.value > 0:
+            refund_tx = user.refund_credits(refund, reason)
+            await self._user_repo.apply_transaction(refund_tx)
+            user.clear_pending_transactions()
@@ -1,5 +1,4 @@
 from src.domain.exceptions import UserNotFoundError
-from src.domain.repositories.transaction_repository import TransactionRepository
 from src.domain.repositories.user_repository import UserRepository
 from src.domain.value_objects.credits import Credits
 from src.domain.value_objects.email import Email
@@ -27,9 +26,8 @@ class CompletePaymentResponse:
 class CompletePaymentUseCase:
     """Use case for complete payment."""
 
-    def __init__(self, user_repo: UserRepository, transaction_repo: TransactionRepository) -> None:
+    def __init__(self, user_repo: UserRepository) -> None:
         self._user_repo = user_repo
-        self._transaction_repo = transaction_repo
 
     async def execute(self, request: CompletePaymentRequest) -> Result[CompletePaymentResponse]:
         user = await self._user_repo.find_by_email(request.email)
@@ -48,11 +46,10 @@ class CompletePaymentUseCase:
             description=f"Purchase: {package.name}"
         )
 
-        await self._user_repo.update(user)
-        await self._transaction_repo.save(transaction)
+        balance = await self._user_repo.apply_transaction(transaction)
         user.clear_pending_transactions()
 
         return Success(CompletePaymentResponse(
             credits_added=request.credits.value,
-            total_credits=user.credits.value
+            total_credits=balance.value
         ))
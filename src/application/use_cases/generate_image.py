@@ -1,23 +1,89 @@
 
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from datetime import datetime, timedelta
+
 from PIL import Image
 
-from src.domain.exceptions import ImageGenerationError, InsufficientCreditsError, UserNotFoundError
-from src.domain.repositories.transaction_repository import TransactionRepository
+from src.domain.entities.credit_transaction import CreditTransaction
+from src.domain.entities.user import User
+from src.domain.exceptions import (
+    DomainException,
+    ImageGenerationError,
+    InsufficientCreditsError,
+    ServiceOverloadedError,
+)
+from src.domain.repositories.unit_of_work import UnitOfWork
 from src.domain.repositories.user_repository import UserRepository
-from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator, VariationResult
 from src.domain.value_objects.credits import Credits
 from src.domain.value_objects.email import Email
 from src.shared.result import Failure, Result, Success
 
 
+def build_generation_prompt(prompt: str, mode: str) -> str:
+    """Build the AI generation prompt based on transformation mode"""
+    if mode == "item-only" or "Same person, same pose" in prompt:
+        if "only change to" in prompt:
+            style = prompt.split("only change to")[1].strip().strip(".")
+        else:
+            style = prompt.partition("style of")[2].strip().strip(".")
+
+        return (
+            f"Create a highly realistic, photographic image. Keep the exact same person, pose, and photo composition. "
+            f"Only change the clothing/outfit to '{style}' style. "
+            f"Maintain facial features, body position, and background exactly as they are. "
+            f"Use natural lighting, realistic skin texture, and professional photography quality. "
+            f"Ensure the clothing looks authentic and properly fitted to the person's body."
+        )
+    style = prompt.partition("style of")[2].strip().strip(".")
+    return (
+        f"Create a highly realistic, professional photograph of this person in a '{style}' theme. "
+        f"Transform the entire scene with an appropriate background, natural pose, and authentic outfit "
+        f"that reflects '{style}' style. Use photographic quality with natural lighting, "
+        f"realistic skin texture, proper shadows, and lifelike details. "
+        f"Ensure the image looks like it was taken with a professional camera, not AI-generated."
+    )
+
+
 class GenerateImageRequest:
-    """Request for image generation."""
+    """
+    Request for image generation.
+
+    With a quorum and/or a deadline, the request launches `variations` variations but returns as
+    soon as `quorum` of them have succeeded or the deadline passes, cancelling the rest.
+    """
 
-    def __init__(self, email: str, prompt: str, image: Image.Image, transformation_mode: str) -> None:
+    def __init__(
+            self,
+            email: str,
+            prompt: str,
+            image: Image.Image,
+            transformation_mode: str,
+            variations: int = 3,
+            quorum: int | None = None,
+            deadline_seconds: float | None = None,
+            image_data: bytes | None = None,
+            image_content_type: str | None = None
+    ) -> None:
         self.email = Email(email)
         self.prompt = prompt
         self.image = image
         self.transformation_mode = transformation_mode
+        self.variations = variations
+        self.quorum = quorum
+        self.deadline_seconds = deadline_seconds
+        self.image_data = image_data
+        self.image_content_type = image_content_type
+
+    @property
+    def is_quorum(self) -> bool:
+        return self.quorum is not None or self.deadline_seconds is not None
+
+    @property
+    def images_wanted(self) -> int:
+        return self.quorum or self.variations
 
 
 class GenerateImageResponse:
@@ -29,105 +95,236 @@ class GenerateImageResponse:
 
 
 class GenerateImageUseCase:
-    """Use case for image generation."""
+    """
+    Use case for image generation.
+
+    Credits are held before generating, then captured for what was delivered and released for
+    the rest in one settlement. Both run in short unit-of-work scopes; no database session is
+    held while the provider is generating.
+    """
 
-    CREDITS_PER_GENERATION = Credits(3)
+    # Every request is priced per image it asks for (all its variations, or its quorum) and charged
+    # per image delivered; the default three variations cost CREDITS_PER_GENERATION
+    CREDITS_PER_IMAGE = Credits(1)
+    CREDITS_PER_GENERATION = Credits(3 * CREDITS_PER_IMAGE.value)
+    # Billing policy for requests answered entirely from the result cache
+    CREDITS_PER_CACHED_GENERATION = Credits(1)
+    MAX_VARIATIONS = 8
 
     def __init__(
             self,
-            user_repo: UserRepository,
-            transaction_repo: TransactionRepository,
-            image_generator: ImageGenerator
+            uow: UnitOfWork,
+            image_generator: ImageGenerator,
+            hold_ttl_seconds: float = 900
     ) -> None:
-        self._user_repo = user_repo
-        self._transaction_repo = transaction_repo
+        self._uow = uow
         self._image_generator = image_generator
+        self._hold_ttl = timedelta(seconds=hold_ttl_seconds)
 
     async def execute(self, request: GenerateImageRequest) -> Result[GenerateImageResponse]:
-        user = await self._user_repo.find_by_email(request.email)
-        if not user:
-            from src.domain.entities.user import User
-            user = User.create(request.email)
-            user = await self._user_repo.save(user)
+        invalid = self._validate(request)
+        if invalid is not None:
+            return Failure(invalid)
 
-        if not user.has_sufficient_credits(self.CREDITS_PER_GENERATION):
+        price = self._price(request)
+        async with self._uow.begin() as repos:
+            user = await self._get_or_create_user(repos.users, request.email)
+            hold = await self._hold(repos.users, user, price, request)
+        if hold is None:
             return Failure(InsufficientCreditsError(
-                f"Need {self.CREDITS_PER_GENERATION.value} credits, have {user.credits.value}"
+                f"Need {price.value} credits, have {user.credits.value}"
             ))
 
         try:
-            transaction = user.deduct_credits(
-                self.CREDITS_PER_GENERATION,
-                "Image generation (3 variations)"
-            )
-
-            # Save user and transaction
-            await self._user_repo.update(user)
-            await self._transaction_repo.save(transaction)
-            user.clear_pending_transactions()
-
-            # Generate prompt based on mode
-            generation_prompt = self._build_generation_prompt(
-                request.prompt,
-                request.transformation_mode
-            )
-
-            # Generate images
-            gen_request = GenerationRequest(
-                prompt=generation_prompt,
-                reference_image=request.image,
-                variations=3
-            )
-
-            images = await self._image_generator.generate(gen_request)
-
-            if not images:
-                refund_tx = user.refund_credits(
-                    self.CREDITS_PER_GENERATION,
-                    "Generation failed - no images produced"
-                )
-                await self._user_repo.update(user)
-                await self._transaction_repo.save(refund_tx)
-                user.clear_pending_transactions()
+            async with aclosing(self._variations(request)) as variations:
+                results = [result async for result in variations]
 
-                return Failure(ImageGenerationError("Failed to generate any images"))
-
-            return Success(GenerateImageResponse(
-                images=images,
-                credits_remaining=user.credits.value
-            ))
+            return await self._settle(hold, results, request)
 
         except Exception as e:
-            refund_tx = user.refund_credits(
-                self.CREDITS_PER_GENERATION,
-                f"Error during generation: {str(e)[:100]}"
-            )
-            await self._user_repo.update(user)
-            await self._transaction_repo.save(refund_tx)
-            user.clear_pending_transactions()
+            await self._release(hold, f"Error during generation: {str(e)[:100]}")
 
             return Failure(ImageGenerationError(str(e)))
 
+    async def execute_stream(
+            self,
+            request: GenerateImageRequest
+    ) -> Result[AsyncIterator[VariationResult | GenerateImageResponse]]:
+        """
+        Charge the user and return an iterator over the variations as they complete.
+
+        The iterator ends with a GenerateImageResponse, or raises ImageGenerationError once the
+        credits have been refunded if no variation succeeded.
+        """
+        invalid = self._validate(request)
+        if invalid is not None:
+            return Failure(invalid)
+
+        price = self._price(request)
+        async with self._uow.begin() as repos:
+            user = await self._get_or_create_user(repos.users, request.email)
+            hold = await self._hold(repos.users, user, price, request)
+        if hold is None:
+            return Failure(InsufficientCreditsError(
+                f"Need {price.value} credits, have {user.credits.value}"
+            ))
+        return Success(self._stream(hold, request))
+
+    async def _stream(
+            self,
+            hold: CreditTransaction,
+            request: GenerateImageRequest
+    ) -> AsyncIterator[VariationResult | GenerateImageResponse]:
+        results = []
+        settled = False
+        try:
+            try:
+                async with aclosing(self._variations(request)) as variations:
+                    async for result in variations:
+                        results.append(result)
+                        yield result
+            except Exception as e:
+                settled = True
+                await self._release(hold, f"Error during generation: {str(e)[:100]}")
+                raise ImageGenerationError(str(e)) from e
+
+            outcome = await self._settle(hold, results, request)
+            settled = True
+            if outcome.is_failure():
+                raise outcome.error
+            yield outcome.value
+        finally:
+            if not settled:
+                # The stream was closed early (the client disconnected) or cancelled. The release
+                # runs in its own task so the cancellation can't abandon it half way.
+                await asyncio.shield(asyncio.ensure_future(
+                    self._release(hold, "Generation stream closed before it finished")
+                ))
+
+    async def _variations(self, request: GenerateImageRequest) -> AsyncIterator[VariationResult]:
+        """Yield variations as they finish until enough have succeeded or the deadline passes, cancelling the rest"""
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + request.deadline_seconds if request.deadline_seconds is not None else None
+        succeeded = 0
+
+        stream = self._image_generator.stream_variations(self._build_request(request))
+        try:
+            while succeeded < request.images_wanted:
+                timeout = None if expires_at is None else max(0.0, expires_at - loop.time())
+                try:
+                    result = await asyncio.wait_for(anext(stream), timeout)
+                except (StopAsyncIteration, TimeoutError):
+                    break
+                succeeded += result.succeeded
+                yield result
+        finally:
+            # Closing the stream cancels the variations still running
+            await stream.aclose()
+
+    def _validate(self, request: GenerateImageRequest) -> DomainException | None:
+        if not 1 <= request.variations <= self.MAX_VARIATIONS:
+            return DomainException(f"Variations must be between 1 and {self.MAX_VARIATIONS}")
+        if request.quorum is not None and not 1 <= request.quorum <= request.variations:
+            return DomainException("Quorum must be between 1 and the number of variations")
+        if request.deadline_seconds is not None and request.deadline_seconds <= 0:
+            return DomainException("Deadline must be positive")
+        return None
+
+    def _price(self, request: GenerateImageRequest) -> Credits:
+        return Credits(request.images_wanted * self.CREDITS_PER_IMAGE.value)
+
+    @staticmethod
+    async def _get_or_create_user(users: UserRepository, email: Email) -> User:
+        user = await users.find_by_email(email)
+        if not user:
+            user = User.create(email)
+            user = await users.save(user)
+        return user
+
+    async def _hold(
+            self,
+            users: UserRepository,
+            user: User,
+            price: Credits,
+            request: GenerateImageRequest
+    ) -> CreditTransaction | None:
+        """Hold the price in one conditional update; returns the hold, or None if the balance is too low"""
+        if request.is_quorum:
+            reason = f"Image generation (first {request.images_wanted} of {request.variations} variations)"
+        else:
+            reason = f"Image generation ({request.variations} variations)"
+        hold = CreditTransaction.create_hold(user.id, price, reason, datetime.now() + self._hold_ttl)
+        if await users.hold_credits(hold) is None:
+            return None
+        return hold
+
+    async def _release(self, hold: CreditTransaction, reason: str) -> None:
+        async with self._uow.begin() as repos:
+            await repos.users.release_hold(CreditTransaction.create_release(hold, reason))
+
+    async def _capture(self, hold: CreditTransaction, credits: Credits, reason: str) -> Credits:
+        """Capture credits from the hold, releasing the rest; returns the new balance"""
+        async with self._uow.begin() as repos:
+            balance = await repos.users.capture_hold(CreditTransaction.create_capture(hold, credits, reason))
+            if balance is None:
+                # The hold outlived its TTL and was swept back; charge what was delivered directly
+                balance = await repos.users.apply_transaction(
+                    CreditTransaction.create_usage(hold.user_id, credits, reason)
+                )
+            if balance is None:
+                print(f"[CREDITS] Hold {hold.hold_id} expired and user {hold.user_id} can no longer pay for it")
+                balance = (await repos.users.find_by_id(hold.user_id)).credits
+        return balance
+
+    async def _settle(
+            self,
+            hold: CreditTransaction,
+            results: list[VariationResult],
+            request: GenerateImageRequest
+    ) -> Result[GenerateImageResponse]:
+        """Capture what was delivered, after the cached-result billing policy, and release the rest"""
+        images = [result.image for result in sorted(results, key=lambda r: r.index) if result.succeeded]
+
+        if not images:
+            await self._release(hold, "Generation failed - no images produced")
+            if results and all(isinstance(result.error, ServiceOverloadedError) for result in results):
+                return Failure(results[0].error)
+            if not results and request.deadline_seconds is not None:
+                return Failure(ImageGenerationError("No images were ready before the deadline"))
+            return Failure(ImageGenerationError("Failed to generate any images"))
+
+        charged = Credits(-hold.credits.value)
+        reason = hold.description
+        if len(images) < request.images_wanted:
+            charged = Credits(len(images) * self.CREDITS_PER_IMAGE.value)
+            reason = f"{reason} - {len(images)} of {request.images_wanted} images delivered"
+
+        fully_cached = all(result.cached for result in results if result.succeeded)
+        if fully_cached and charged > self.CREDITS_PER_CACHED_GENERATION:
+            charged = self.CREDITS_PER_CACHED_GENERATION
+            reason = f"{reason} - cached"
+
+        balance = await self._capture(hold, charged, reason)
+
+        return Success(GenerateImageResponse(
+            images=images,
+            credits_remaining=balance.value
+        ))
+
+    def _build_request(self, request: GenerateImageRequest) -> GenerationRequest:
+        # Generate prompt based on mode
+        generation_prompt = self._build_generation_prompt(
+            request.prompt,
+            request.transformation_mode
+        )
+        return GenerationRequest(
+            prompt=generation_prompt,
+            reference_image=request.image,
+            variations=request.variations,
+            reference_data=request.image_data,
+            reference_mime_type=request.image_content_type
+        )
+
     def _build_generation_prompt(self, prompt: str, mode: str) -> str:
         """Build the AI generation prompt based on transformation mode"""
-        if mode == "item-only" or "Same person, same pose" in prompt:
-            if "only change to" in prompt:
-                style = prompt.split("only change to")[1].strip().strip(".")
-            else:
-                style = prompt.partition("style of")[2].strip().strip(".")
-
-            return (
-                f"Create a highly realistic, photographic image. Keep the exact same person, pose, and photo composition. "
-                f"Only change the clothing/outfit to '{style}' style. "
-                f"Maintain facial features, body position, and background exactly as they are. "
-                f"Use natural lighting, realistic skin texture, and professional photography quality. "
-                f"Ensure the clothing looks authentic and properly fitted to the person's body."
-            )
-        style = prompt.partition("style of")[2].strip().strip(".")
-        return (
-            f"Create a highly realistic, professional photograph of this person in a '{style}' theme. "
-            f"Transform the entire scene with an appropriate background, natural pose, and authentic outfit "
-            f"that reflects '{style}' style. Use photographic quality with natural lighting, "
-            f"realistic skin texture, proper shadows, and lifelike details. "
-            f"Ensure the image looks like it was taken with a professional camera, not AI-generated."
-        )
+        return build_generation_prompt(prompt, mode)
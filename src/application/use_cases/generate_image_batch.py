@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from src.application.use_cases.generate_image import GenerateImageUseCase, build_generation_prompt
+from src.domain.entities.credit_transaction import CreditTransaction
+from src.domain.entities.user import User
+from src.domain.exceptions import DomainException, InsufficientCreditsError
+from src.domain.repositories.unit_of_work import UnitOfWork
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator, VariationResult
+from src.domain.value_objects.credits import Credits
+from src.domain.value_objects.email import Email
+from src.shared.result import Failure, Result, Success
+
+
+class BatchItem:
+    """One style to apply to the batch's reference image."""
+
+    def __init__(self, prompt: str, transformation_mode: str) -> None:
+        self.prompt = prompt
+        self.transformation_mode = transformation_mode
+
+
+class BatchItemResult:
+    """Images produced for one batch item, or why it failed."""
+
+    def __init__(self, item: BatchItem, images: list[str], error: str | None = None) -> None:
+        self.prompt = item.prompt
+        self.transformation_mode = item.transformation_mode
+        self.images = images
+        self.error = error
+
+
+class GenerateImageBatchRequest:
+    """Request for generating several styles from one reference image."""
+
+    def __init__(
+            self,
+            email: str,
+            image: Image.Image,
+            items: list[BatchItem],
+            image_data: bytes | None = None,
+            image_content_type: str | None = None
+    ) -> None:
+        self.email = Email(email)
+        self.image = image
+        self.items = items
+        self.image_data = image_data
+        self.image_content_type = image_content_type
+
+
+class GenerateImageBatchResponse:
+    """Response for batch image generation, one result per item in request order."""
+
+    def __init__(self, results: list[BatchItemResult], credits_remaining: int) -> None:
+        self.results = results
+        self.credits_remaining = credits_remaining
+
+
+class GenerateImageBatchUseCase:
+    """Use case for generating several styles against one reference image."""
+
+    CREDITS_PER_ITEM = GenerateImageUseCase.CREDITS_PER_GENERATION
+    CREDITS_PER_CACHED_ITEM = GenerateImageUseCase.CREDITS_PER_CACHED_GENERATION
+    MAX_ITEMS = 8
+
+    def __init__(
+            self,
+            uow: UnitOfWork,
+            image_generator: ImageGenerator,
+            hold_ttl_seconds: float = 900
+    ) -> None:
+        self._uow = uow
+        self._image_generator = image_generator
+        self._hold_ttl = timedelta(seconds=hold_ttl_seconds)
+
+    async def execute(self, request: GenerateImageBatchRequest) -> Result[GenerateImageBatchResponse]:
+        if not request.items:
+            return Failure(DomainException("A batch needs at least one prompt"))
+        if len(request.items) > self.MAX_ITEMS:
+            return Failure(DomainException(f"A batch can have at most {self.MAX_ITEMS} prompts"))
+
+        # One hold reserves the whole batch; one capture settles it once every item is done
+        total = Credits(self.CREDITS_PER_ITEM.value * len(request.items))
+        async with self._uow.begin() as repos:
+            user = await repos.users.find_by_email(request.email)
+            if not user:
+                user = await repos.users.save(User.create(request.email))
+            hold = CreditTransaction.create_hold(
+                user.id,
+                total,
+                f"Batch image generation ({len(request.items)} styles)",
+                datetime.now() + self._hold_ttl
+            )
+            balance = await repos.users.hold_credits(hold)
+        if balance is None:
+            return Failure(InsufficientCreditsError(f"Need {total.value} credits, have {user.credits.value}"))
+
+        outcomes = await asyncio.gather(
+            *(self._image_generator.generate_variations(self._build_request(request, item))
+              for item in request.items),
+            return_exceptions=True
+        )
+
+        results = []
+        charged = Credits(0)
+        for item, outcome in zip(request.items, outcomes, strict=True):
+            result, price = self._settle_item(item, outcome)
+            results.append(result)
+            charged = charged + price
+
+        balance = await self._settle(hold, charged, sum(1 for result in results if result.error is None))
+
+        return Success(GenerateImageBatchResponse(results=results, credits_remaining=balance.value))
+
+    def _settle_item(
+            self,
+            item: BatchItem,
+            outcome: list[VariationResult] | BaseException
+    ) -> tuple[BatchItemResult, Credits]:
+        """
+        Price an item: nothing if it produced nothing, with the cached-result billing policy applied.
+
+        Returns the item's result and the credits to capture for it.
+        """
+        if isinstance(outcome, BaseException):
+            return BatchItemResult(item, images=[], error=str(outcome)), Credits(0)
+
+        images = [result.image for result in outcome if result.succeeded]
+        if not images:
+            return BatchItemResult(item, images=[], error="Failed to generate any images"), Credits(0)
+
+        if all(result.cached for result in outcome if result.succeeded):
+            return BatchItemResult(item, images=images), self.CREDITS_PER_CACHED_ITEM
+        return BatchItemResult(item, images=images), self.CREDITS_PER_ITEM
+
+    async def _settle(self, hold: CreditTransaction, charged: Credits, delivered: int) -> Credits:
+        """Capture what the batch delivered and release the rest of the hold; returns the new balance"""
+        async with self._uow.begin() as repos:
+            if charged.value == 0:
+                balance = await repos.users.release_hold(
+                    CreditTransaction.create_release(hold, "Batch failed - no images produced")
+                )
+            else:
+                reason = f"{hold.description} - {delivered} delivered"
+                balance = await repos.users.capture_hold(CreditTransaction.create_capture(hold, charged, reason))
+                if balance is None:
+                    # The hold outlived its TTL and was swept back; charge what was delivered directly
+                    balance = await repos.users.apply_transaction(
+                        CreditTransaction.create_usage(hold.user_id, charged, reason)
+                    )
+            if balance is None:
+                print(f"[CREDITS] Hold {hold.hold_id} expired and user {hold.user_id} can no longer pay for it")
+                balance = (await repos.users.find_by_id(hold.user_id)).credits
+        return balance
+
+    @staticmethod
+    def _build_request(request: GenerateImageBatchRequest, item: BatchItem) -> GenerationRequest:
+        return GenerationRequest(
+            prompt=build_generation_prompt(item.prompt, item.transformation_mode),
+            reference_image=request.image,
+            variations=3,
+            reference_data=request.image_data,
+            reference_mime_type=request.image_content_type
+        )
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from src.domain.exceptions import JobNotFoundError
+from src.domain.repositories.generation_job_repository import GenerationJobRepository
+from src.shared.result import Failure, Result, Success
+
+
+class GetGenerationJobRequest:
+    """Request for getting a generation job."""
+
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+
+
+class GetGenerationJobResponse:
+    """Response for getting a generation job."""
+
+    def __init__(
+            self,
+            job_id: str,
+            status: str,
+            images: list[str],
+            error: str | None,
+            created_at: datetime,
+            updated_at: datetime
+    ) -> None:
+        self.job_id = job_id
+        self.status = status
+        self.images = images
+        self.error = error
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+
+class GetGenerationJobUseCase:
+    """Use case for polling a generation job."""
+
+    def __init__(self, job_repo: GenerationJobRepository) -> None:
+        self._job_repo = job_repo
+
+    async def execute(self, request: GetGenerationJobRequest) -> Result[GetGenerationJobResponse]:
+        job = await self._job_repo.find_by_id(request.job_id)
+        if not job:
+            return Failure(JobNotFoundError(f"Job {request.job_id} not found"))
+
+        return Success(GetGenerationJobResponse(
+            job_id=job.id,
+            status=job.status.value,
+            images=job.images,
+            error=job.error,
+            created_at=job.created_at,
+            updated_at=job.updated_at
+        ))
@@ -13,13 +13,14 @@ class GetUserCreditsRequest:
 class GetUserCreditsResponse:
     """Response for getting user credits."""
 
-    def __init__(self, email: str, credits: int):
+    def __init__(self, email: str, credits: int, held_credits: int = 0):
         self.email = email
         self.credits = credits
+        self.held_credits = held_credits
 
 
 class GetUserCreditsUseCase:
-    """Use case for getting user credits."""
+    """Use case for getting user credits: the available balance, and what in-flight generations hold."""
 
     def __init__(self, user_repo: UserRepository):
         self._user_repo = user_repo
@@ -31,7 +32,10 @@ class GetUserCreditsUseCase:
             user = User.create(request.email)
             user = await self._user_repo.save(user)
 
+        held = await self._user_repo.find_held_credits(user.id)
+
         return Success(GetUserCreditsResponse(
             email=user.email.value,
-            credits=user.credits.value
+            credits=user.credits.value,
+            held_credits=held.value
         ))
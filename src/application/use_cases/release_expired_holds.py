@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from src.domain.repositories.unit_of_work import UnitOfWork
+from src.shared.result import Result, Success
+
+
+class ReleaseExpiredHoldsRequest:
+    """Request for releasing expired credit holds."""
+
+    def __init__(self, now: datetime | None = None) -> None:
+        self.now = now or datetime.now()
+
+
+class ReleaseExpiredHoldsResponse:
+    """Response for releasing expired credit holds."""
+
+    def __init__(self, released: int) -> None:
+        self.released = released
+
+
+class ReleaseExpiredHoldsUseCase:
+    """Use case for returning credits held by generations that never settled (e.g. after a crash)."""
+
+    def __init__(self, uow: UnitOfWork) -> None:
+        self._uow = uow
+
+    async def execute(self, request: ReleaseExpiredHoldsRequest) -> Result[ReleaseExpiredHoldsResponse]:
+        async with self._uow.begin() as repos:
+            released = await repos.users.release_expired_holds(request.now)
+
+        return Success(ReleaseExpiredHoldsResponse(released=released))
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+from src.application.use_cases.generate_image import GenerateImageUseCase, build_generation_prompt
+from src.domain.entities.credit_transaction import CreditTransaction
+from src.domain.entities.generation_job import GenerationJob
+from src.domain.exceptions import InsufficientCreditsError
+from src.domain.repositories.generation_job_repository import GenerationJobRepository
+from src.domain.repositories.user_repository import UserRepository
+from src.domain.value_objects.email import Email
+from src.shared.result import Failure, Result, Success
+
+
+class SubmitGenerationJobRequest:
+    """Request for submitting a generation job."""
+
+    def __init__(self, email: str, prompt: str, image_data: bytes, transformation_mode: str) -> None:
+        self.email = Email(email)
+        self.prompt = prompt
+        self.image_data = image_data
+        self.transformation_mode = transformation_mode
+
+
+class SubmitGenerationJobResponse:
+    """Response for submitting a generation job."""
+
+    def __init__(self, job_id: str, status: str, credits_remaining: int) -> None:
+        self.job_id = job_id
+        self.status = status
+        self.credits_remaining = credits_remaining
+
+
+class SubmitGenerationJobUseCase:
+    """
+    Use case for holding credits and enqueueing a generation job.
+
+    The job carries the hold, which its worker captures or releases on completion. A job that is
+    never completed (every worker gone, the queue lost) leaves a hold that the expired-hold sweeper
+    returns to the user once the TTL passes.
+    """
+
+    CREDITS_PER_GENERATION = GenerateImageUseCase.CREDITS_PER_GENERATION
+
+    def __init__(
+            self,
+            user_repo: UserRepository,
+            job_repo: GenerationJobRepository,
+            hold_ttl_seconds: float = 3600
+    ) -> None:
+        self._user_repo = user_repo
+        self._job_repo = job_repo
+        self._hold_ttl = timedelta(seconds=hold_ttl_seconds)
+
+    async def execute(self, request: SubmitGenerationJobRequest) -> Result[SubmitGenerationJobResponse]:
+        user = await self._user_repo.find_by_email(request.email)
+        if not user:
+            from src.domain.entities.user import User
+            user = User.create(request.email)
+            user = await self._user_repo.save(user)
+
+        hold = CreditTransaction.create_hold(
+            user.id,
+            self.CREDITS_PER_GENERATION,
+            "Image generation job (3 variations)",
+            datetime.now() + self._hold_ttl
+        )
+        balance = await self._user_repo.hold_credits(hold)
+        if balance is None:
+            return Failure(InsufficientCreditsError(
+                f"Need {self.CREDITS_PER_GENERATION.value} credits, have {user.credits.value}"
+            ))
+
+        job = GenerationJob.create(
+            user_id=user.id,
+            prompt=build_generation_prompt(request.prompt, request.transformation_mode),
+            reference_image=request.image_data,
+            credits_charged=self.CREDITS_PER_GENERATION,
+            hold_id=hold.hold_id
+        )
+        job = await self._job_repo.save(job)
+
+        return Success(SubmitGenerationJobResponse(
+            job_id=job.id,
+            status=job.status.value,
+            credits_remaining=balance.value
+        ))
@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime
 from enum import Enum
 
@@ -11,10 +12,18 @@ class TransactionType(Enum):
     PURCHASE = "purchase"
     USAGE = "usage"
     REFUND = "refund"
+    HOLD = "hold"
+    CAPTURE = "capture"
+    RELEASE = "release"
 
 
 class CreditTransaction:
-    """Entity representing a credit transaction"""
+    """
+    Entity representing a credit transaction.
+
+    A hold moves credits out of the available balance until it is captured (spent) or released
+    (returned), identified by its hold_id. Captures and releases reference the hold they settle.
+    """
 
     def __init__(
             self,
@@ -25,7 +34,9 @@ class CreditTransaction:
             amount: Money | None = None,
             payment_id: str | None = None,
             description: str | None = None,
-            created_at: datetime | None = None
+            created_at: datetime | None = None,
+            hold_id: str | None = None,
+            expires_at: datetime | None = None
     ) -> None:
         self._id = id
         self._user_id = user_id
@@ -35,6 +46,8 @@ class CreditTransaction:
         self._payment_id = payment_id
         self._description = description
         self._created_at = created_at or datetime.now()
+        self._hold_id = hold_id
+        self._expires_at = expires_at
 
         self._validate()
 
@@ -49,6 +62,15 @@ class CreditTransaction:
         if self._type == TransactionType.USAGE and self._credits.value > 0:
             raise ValueError("Usage transactions must have negative credits")
 
+        if self._type in (TransactionType.HOLD, TransactionType.CAPTURE) and self._credits.value > 0:
+            raise ValueError("Hold and capture transactions must have negative credits")
+
+        if self._type in (TransactionType.HOLD, TransactionType.CAPTURE, TransactionType.RELEASE) and not self._hold_id:
+            raise ValueError("Hold, capture and release transactions must have a hold ID")
+
+        if self._type == TransactionType.HOLD and not self._expires_at:
+            raise ValueError("Hold transactions must have an expiry")
+
     @property
     def id(self) -> int | None:
         return self._id
@@ -81,6 +103,14 @@ class CreditTransaction:
     def created_at(self) -> datetime:
         return self._created_at
 
+    @property
+    def hold_id(self) -> str | None:
+        return self._hold_id
+
+    @property
+    def expires_at(self) -> datetime | None:
+        return self._expires_at
+
     @staticmethod
     def create_purchase(
             user_id: int,
@@ -130,6 +160,58 @@ class CreditTransaction:
             description=description
         )
 
+    @staticmethod
+    def create_hold(
+            user_id: int,
+            credits: Credits,
+            description: str,
+            expires_at: datetime
+    ) -> "CreditTransaction":
+        """Factory method for holds; released automatically once they expire"""
+        return CreditTransaction(
+            id=None,
+            user_id=user_id,
+            transaction_type=TransactionType.HOLD,
+            credits=Credits(-abs(credits.value)),
+            description=description,
+            hold_id=uuid.uuid4().hex,
+            expires_at=expires_at
+        )
+
+    @staticmethod
+    def create_capture(
+            hold: "CreditTransaction",
+            credits: Credits,
+            description: str
+    ) -> "CreditTransaction":
+        """Factory method for capturing part or all of a hold; the rest is released"""
+        if abs(credits.value) > abs(hold.credits.value):
+            raise ValueError("Cannot capture more credits than were held")
+
+        return CreditTransaction(
+            id=None,
+            user_id=hold.user_id,
+            transaction_type=TransactionType.CAPTURE,
+            credits=Credits(-abs(credits.value)),
+            description=description,
+            hold_id=hold.hold_id
+        )
+
+    @staticmethod
+    def create_release(
+            hold: "CreditTransaction",
+            description: str
+    ) -> "CreditTransaction":
+        """Factory method for releasing a whole hold"""
+        return CreditTransaction(
+            id=None,
+            user_id=hold.user_id,
+            transaction_type=TransactionType.RELEASE,
+            credits=Credits(abs(hold.credits.value)),
+            description=description,
+            hold_id=hold.hold_id
+        )
+
     def __eq__(self, other) -> bool:
         if not isinstance(other, CreditTransaction):
             return False
@@ -0,0 +1,150 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from src.domain.value_objects.credits import Credits
+
+
+class JobStatus(Enum):
+    """Lifecycle states of a generation job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class GenerationJob:
+    """Entity representing a queued image generation"""
+
+    def __init__(
+            self,
+            id: str,
+            user_id: int,
+            prompt: str,
+            reference_image: bytes,
+            credits_charged: Credits,
+            variations: int = 3,
+            status: JobStatus = JobStatus.QUEUED,
+            images: list[str] | None = None,
+            error: str | None = None,
+            attempts: int = 0,
+            hold_id: str | None = None,
+            created_at: datetime | None = None,
+            updated_at: datetime | None = None
+    ) -> None:
+        self._id = id
+        self._user_id = user_id
+        self._prompt = prompt
+        self._reference_image = reference_image
+        self._credits_charged = credits_charged
+        self._variations = variations
+        self._status = status
+        self._images = images or []
+        self._error = error
+        self._attempts = attempts
+        self._hold_id = hold_id
+        self._created_at = created_at or datetime.now()
+        self._updated_at = updated_at or datetime.now()
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def user_id(self) -> int:
+        return self._user_id
+
+    @property
+    def prompt(self) -> str:
+        return self._prompt
+
+    @property
+    def reference_image(self) -> bytes:
+        return self._reference_image
+
+    @property
+    def credits_charged(self) -> Credits:
+        return self._credits_charged
+
+    @property
+    def variations(self) -> int:
+        return self._variations
+
+    @property
+    def status(self) -> JobStatus:
+        return self._status
+
+    @property
+    def images(self) -> list[str]:
+        return self._images.copy()
+
+    @property
+    def error(self) -> str | None:
+        return self._error
+
+    @property
+    def attempts(self) -> int:
+        return self._attempts
+
+    @property
+    def hold_id(self) -> str | None:
+        """Hold on the user's credits, settled when the job completes; None for jobs charged up front"""
+        return self._hold_id
+
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+
+    @property
+    def updated_at(self) -> datetime:
+        return self._updated_at
+
+    @property
+    def is_finished(self) -> bool:
+        return self._status in {JobStatus.SUCCEEDED, JobStatus.FAILED}
+
+    def mark_succeeded(self, images: list[str]) -> None:
+        """Record the generated images"""
+        if not images:
+            raise ValueError("A succeeded job must have at least one image")
+        self._status = JobStatus.SUCCEEDED
+        self._images = list(images)
+        self._error = None
+        self._mark_updated()
+
+    def mark_failed(self, error: str) -> None:
+        """Record why the job failed"""
+        self._status = JobStatus.FAILED
+        self._error = error[:500]
+        self._mark_updated()
+
+    def _mark_updated(self) -> None:
+        """Mark entity as updated"""
+        self._updated_at = datetime.now()
+
+    @staticmethod
+    def create(
+            user_id: int,
+            prompt: str,
+            reference_image: bytes,
+            credits_charged: Credits,
+            hold_id: str | None = None
+    ) -> "GenerationJob":
+        """Factory method to create a new queued job"""
+        return GenerationJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            prompt=prompt,
+            reference_image=reference_image,
+            credits_charged=credits_charged,
+            hold_id=hold_id
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GenerationJob):
+            return False
+        return self._id == other._id
+
+    def __hash__(self) -> int:
+        return hash(self._id)
@@ -32,3 +32,27 @@ class AuthenticationError(DomainException):
 
 class AuthorizationError(DomainException):
     """Raised when user is not authorized for an action"""
+
+
+class JobNotFoundError(DomainException):
+    """Raised when a generation job cannot be found"""
+
+
+class JobLeaseLostError(DomainException):
+    """Raised when a worker finishes a job that another worker has since claimed"""
+
+
+class AssetNotFoundError(DomainException):
+    """Raised when a reference image asset is unknown or has expired"""
+
+
+class ServiceOverloadedError(DomainException):
+    """Raised when work is shed because a downstream service is at capacity"""
+
+
+class InvalidImageError(DomainException):
+    """Raised when an uploaded image cannot be read or is not acceptable"""
+
+
+class ImageTooLargeError(InvalidImageError):
+    """Raised when an uploaded image exceeds the byte, dimension or pixel limits"""
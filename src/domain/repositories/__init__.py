@@ -1,4 +1,6 @@
+from src.domain.repositories.generation_job_repository import GenerationJobRepository
 from src.domain.repositories.transaction_repository import TransactionRepository
+from src.domain.repositories.unit_of_work import Repositories, UnitOfWork
 from src.domain.repositories.user_repository import UserRepository
 
-__all__ = ["TransactionRepository", "UserRepository"]
+__all__ = ["GenerationJobRepository", "Repositories", "TransactionRepository", "UnitOfWork", "UserRepository"]
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+
+from src.domain.entities.generation_job import GenerationJob
+
+
+class GenerationJobRepository(ABC):
+    """Repository interface for GenerationJob entity, doubling as the durable job queue"""
+
+    @abstractmethod
+    async def save(self, job: GenerationJob) -> GenerationJob:
+        """Enqueue a new job"""
+
+    @abstractmethod
+    async def find_by_id(self, job_id: str) -> GenerationJob | None:
+        """Find job by ID"""
+
+    @abstractmethod
+    async def claim_next(self, worker_id: str, lease_seconds: int) -> GenerationJob | None:
+        """Atomically take the oldest queued job (or one whose lease expired) for a worker"""
+
+    @abstractmethod
+    async def complete(self, job: GenerationJob, worker_id: str) -> GenerationJob | None:
+        """Persist the outcome of a job still held by the worker; None if its claim was lost"""
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager
+
+from src.domain.repositories.generation_job_repository import GenerationJobRepository
+from src.domain.repositories.transaction_repository import TransactionRepository
+from src.domain.repositories.user_repository import UserRepository
+
+
+class Repositories:
+    """The repositories of one unit of work, sharing its transaction"""
+
+    def __init__(
+            self,
+            users: UserRepository,
+            transactions: TransactionRepository,
+            generation_jobs: GenerationJobRepository
+    ) -> None:
+        self.users = users
+        self.transactions = transactions
+        self.generation_jobs = generation_jobs
+
+
+class UnitOfWork(ABC):
+    """
+    Factory for short transaction scopes.
+
+    `async with uow.begin() as repos:` opens a session, commits when the block exits cleanly and
+    rolls back if it raises. Nothing is held between scopes, so slow work such as a provider call
+    can run outside of any transaction.
+    """
+
+    @abstractmethod
+    def begin(self) -> AbstractAsyncContextManager[Repositories]:
+        """Open a new transaction scope"""
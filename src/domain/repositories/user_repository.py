@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
+from src.domain.entities.credit_transaction import CreditTransaction
 from src.domain.entities.user import User
+from src.domain.value_objects.credits import Credits
 from src.domain.value_objects.email import Email
 
 
@@ -21,7 +24,47 @@ class UserRepository(ABC):
 
     @abstractmethod
     async def update(self, user: User) -> User:
-        """Update an existing user"""
+        """Update an existing user's profile fields (credit balances only change through apply_transaction)"""
+
+    @abstractmethod
+    async def apply_transaction(self, transaction: CreditTransaction) -> Credits | None:
+        """
+        Atomically apply a transaction's credit change to its user and record the transaction.
+
+        Returns the new balance, or None (and changes nothing) if it would take the balance below zero.
+        """
+
+    @abstractmethod
+    async def hold_credits(self, hold: CreditTransaction) -> Credits | None:
+        """
+        Atomically move a hold's credits out of its user's available balance.
+
+        Returns the new available balance, or None (and holds nothing) if it would go below zero.
+        """
+
+    @abstractmethod
+    async def capture_hold(self, capture: CreditTransaction) -> Credits | None:
+        """
+        Spend the captured credits of a hold, release the rest and record the capture.
+
+        Returns the new available balance, or None if the hold was already settled or swept.
+        """
+
+    @abstractmethod
+    async def release_hold(self, release: CreditTransaction) -> Credits | None:
+        """
+        Return a hold's credits to the available balance.
+
+        Returns the new available balance, or None if the hold was already settled or swept.
+        """
+
+    @abstractmethod
+    async def release_expired_holds(self, now: datetime) -> int:
+        """Release every hold that expired by now, in bulk. Returns the number of holds released."""
+
+    @abstractmethod
+    async def find_held_credits(self, user_id: int) -> Credits:
+        """Total credits held for a user and not yet captured or released"""
 
     @abstractmethod
     async def exists_by_email(self, email: Email) -> bool:
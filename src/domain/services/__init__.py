@@ -1,4 +1,5 @@
+from src.domain.services.blob_store import Blob, BlobStore
 from src.domain.services.image_generator import GenerationRequest, ImageGenerator
 from src.domain.services.payment_gateway import CheckoutSession, PaymentGateway
 
-__all__ = ["CheckoutSession", "GenerationRequest", "ImageGenerator", "PaymentGateway"]
+__all__ = ["Blob", "BlobStore", "CheckoutSession", "GenerationRequest", "ImageGenerator", "PaymentGateway"]
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+
+
+class Blob:
+    """Binary object held by a blob store"""
+
+    def __init__(self, key: str, data: bytes, content_type: str):
+        self.key = key
+        self.data = data
+        self.content_type = content_type
+
+
+class BlobStore(ABC):
+    """Interface for content-addressed binary storage"""
+
+    @abstractmethod
+    async def put(self, data: bytes, content_type: str) -> str:
+        """Store data under its content hash. Returns the key."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Blob | None:
+        """Get a blob by key"""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether the blob is still stored (an evicting store may have dropped it)"""
+
+    @abstractmethod
+    def url_for(self, key: str) -> str:
+        """Public URL the blob is served from"""
+
+    def key_from_url(self, url: str) -> str | None:
+        """Key of a URL returned by url_for, or None if the URL isn't served by this store"""
+        prefix = self.url_for("")
+        if not url.startswith(prefix):
+            return None
+        return url[len(prefix):]
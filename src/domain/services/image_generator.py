@@ -1,20 +1,123 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
 
 from PIL import Image
 
+from src.domain.exceptions import ImageGenerationError
+
 
 class GenerationRequest:
-    """Request for image generation"""
+    """
+    Request for image generation.
+
+    reference_data and reference_mime_type are the reference image's already-encoded bytes, when
+    there are any; providers upload them as they are instead of encoding reference_image again.
+    """
 
-    def __init__(self, prompt: str, reference_image: Image.Image, variations: int = 3):
+    def __init__(
+            self,
+            prompt: str,
+            reference_image: Image.Image,
+            variations: int = 3,
+            reference_data: bytes | None = None,
+            reference_mime_type: str | None = None
+    ):
         self.prompt = prompt
         self.reference_image = reference_image
         self.variations = variations
+        self.reference_data = reference_data
+        self.reference_mime_type = reference_mime_type
+
+
+class VariationResult:
+    """Outcome of a single variation: either an image or the error that stopped it"""
+
+    def __init__(
+            self,
+            index: int,
+            image: str | None = None,
+            error: Exception | None = None,
+            cached: bool = False
+    ):
+        self.index = index
+        self.image = image
+        self.error = error
+        self.cached = cached
+
+    @property
+    def succeeded(self) -> bool:
+        return self.image is not None
 
 
 class ImageGenerator(ABC):
     """Interface for AI image generation service"""
 
+    # Upper bound on variations of one request running at the same time (None = all at once)
+    max_concurrent_variations: int | None = None
+
     @abstractmethod
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        """Generate a single variation of the request. Raises on failure."""
+
+    async def generate_variations(self, request: GenerationRequest) -> list[VariationResult]:
+        """Fan the variations out concurrently, recording each result or error in order"""
+        return await self._fan_out(request, list(range(request.variations)))
+
+    async def stream_variations(self, request: GenerationRequest) -> AsyncIterator[VariationResult]:
+        """Yield each variation as soon as it finishes, in completion order"""
+        async with aclosing(self._stream(request, list(range(request.variations)))) as results:
+            async for result in results:
+                yield result
+
+    async def _fan_out(
+            self,
+            request: GenerationRequest,
+            indices: list[int],
+            produce: Callable[[GenerationRequest, int], Awaitable[str]] | None = None
+    ) -> list[VariationResult]:
+        """Collect _stream for the given indices, ordered by variation index"""
+        async with aclosing(self._stream(request, indices, produce)) as stream:
+            results = [result async for result in stream]
+        return sorted(results, key=lambda result: result.index)
+
+    async def _stream(
+            self,
+            request: GenerationRequest,
+            indices: list[int],
+            produce: Callable[[GenerationRequest, int], Awaitable[str]] | None = None
+    ) -> AsyncIterator[VariationResult]:
+        """Run produce (generate_variation by default) for the given indices, bounded by max_concurrent_variations"""
+        produce = produce or self.generate_variation
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_variations or len(indices)))
+
+        async def run(index: int) -> VariationResult:
+            async with semaphore:
+                try:
+                    return VariationResult(index, image=await produce(request, index))
+                except Exception as e:
+                    return VariationResult(index, error=e)
+
+        tasks = [asyncio.ensure_future(run(i)) for i in indices]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer may stop early (e.g. the client disconnected): don't leave provider calls running
+            for task in tasks:
+                task.cancel()
+
     async def generate(self, request: GenerationRequest) -> list[str]:
         """Generate images based on prompt and reference image."""
+        results = await self.generate_variations(request)
+        images = [result.image for result in results if result.succeeded]
+
+        if not images:
+            errors = "; ".join(f"#{r.index + 1}: {r.error!s}" for r in results if r.error)
+            raise ImageGenerationError(f"Failed to generate any images after all attempts ({errors})")
+
+        return images
+
+    async def aclose(self) -> None:
+        """Release resources held by the generator"""
@@ -35,3 +35,6 @@ class PaymentGateway(ABC):
     @abstractmethod
     async def verify_webhook_signature(self, payload: bytes, signature: str, secret: str) -> dict:
         """Verify webhook signature and return event data"""
+
+    async def aclose(self) -> None:
+        """Release resources held by the gateway"""
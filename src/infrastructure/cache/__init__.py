@@ -0,0 +1,4 @@
+from src.infrastructure.cache.generation_cache import CachingImageGenerator, GenerationResultCache
+from src.infrastructure.cache.single_flight import SingleFlight, SingleFlightImageGenerator
+
+__all__ = ["CachingImageGenerator", "GenerationResultCache", "SingleFlight", "SingleFlightImageGenerator"]
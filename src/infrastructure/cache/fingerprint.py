@@ -0,0 +1,33 @@
+import asyncio
+import hashlib
+from weakref import WeakKeyDictionary
+
+from PIL import Image
+
+from src.domain.services.image_generator import GenerationRequest
+from src.infrastructure.compute import get_cpu_executor
+from src.shared.shared_tasks import await_shared
+
+_reference_fingerprints: WeakKeyDictionary[GenerationRequest, asyncio.Task] = WeakKeyDictionary()
+
+
+def fingerprint_image(image: Image.Image) -> str:
+    """Hash the decoded pixels, so container format and metadata don't change the result"""
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def fingerprint_bytes(data: bytes) -> str:
+    """Hash preprocessed bytes: the preprocessor encodes the same pixels to the same bytes"""
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+async def reference_fingerprint(request: GenerationRequest) -> str:
+    """Fingerprint the request's reference image once, off the event loop"""
+    if request.reference_data is not None:
+        fingerprint, source = fingerprint_bytes, request.reference_data
+    else:
+        fingerprint, source = fingerprint_image, request.reference_image
+    return await await_shared(_reference_fingerprints, request, lambda: get_cpu_executor().run(fingerprint, source))
@@ -0,0 +1,230 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from pathlib import Path
+
+from src.domain.services.blob_store import BlobStore
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator, VariationResult
+from src.infrastructure.cache.fingerprint import reference_fingerprint
+
+
+class GenerationResultCache:
+    """
+    Content-addressed cache of generated images.
+
+    The memory tier is an LRU bounded by the total size of the cached values. The optional disk
+    tier keeps one file per key and treats files older than the TTL as expired. Entries can be
+    invalidated, e.g. when the image they point at is no longer stored.
+    """
+
+    SWEEP_EVERY_PUTS = 100
+
+    def __init__(self, max_memory_bytes: int, disk_dir: str | None = None, ttl_seconds: int = 86400):
+        self._max_memory_bytes = max_memory_bytes
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_dir = Path(disk_dir) if disk_dir else None
+        self._ttl_seconds = ttl_seconds
+        self._puts = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        if self._disk_dir:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_fingerprint: str, prompt: str, variation_index: int, model: str) -> str:
+        """Build the cache key of a single variation"""
+        parts = (image_fingerprint, prompt, str(variation_index), model)
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return value
+
+        if self._disk_dir:
+            value = await asyncio.to_thread(self._read_disk, key)
+            if value is not None:
+                self._remember(key, value)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, value: str) -> None:
+        self._remember(key, value)
+
+        if self._disk_dir:
+            await asyncio.to_thread(self._write_disk, key, value)
+            self._puts += 1
+            if self._puts % self.SWEEP_EVERY_PUTS == 0:
+                await asyncio.to_thread(self.sweep_expired)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop an entry from both tiers"""
+        value = self._memory.pop(key, None)
+        if value is not None:
+            self._memory_bytes -= len(value)
+
+        if self._disk_dir:
+            await asyncio.to_thread(self._disk_path(key).unlink, missing_ok=True)
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+        }
+
+    def sweep_expired(self) -> int:
+        """Delete expired files from the disk tier. Returns the number of files removed."""
+        if not self._disk_dir:
+            return 0
+
+        removed = 0
+        deadline = time.time() - self._ttl_seconds
+        for path in self._disk_dir.glob("*/*"):
+            try:
+                if path.stat().st_mtime < deadline:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+
+        self.evictions += removed
+        return removed
+
+    def _remember(self, key: str, value: str) -> None:
+        """Insert into the memory tier, evicting least recently used entries over the budget"""
+        size = len(value)
+        if size > self._max_memory_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._memory[key] = value
+        self._memory_bytes += size
+
+        while self._memory_bytes > self._max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self._disk_dir / key[:2] / key
+
+    def _read_disk(self, key: str) -> str | None:
+        path = self._disk_path(key)
+        try:
+            if path.stat().st_mtime < time.time() - self._ttl_seconds:
+                path.unlink()
+                self.evictions += 1
+                return None
+            return path.read_text()
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, key: str, value: str) -> None:
+        path = self._disk_path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(value)
+        tmp_path.replace(path)
+
+
+class CachingImageGenerator(ImageGenerator):
+    """
+    ImageGenerator decorator that serves repeated variations from a GenerationResultCache.
+
+    Cached URLs into the blob store are only served while the blob is still stored, since an
+    evicting store may have dropped it; stale entries are invalidated and generated again.
+    """
+
+    def __init__(
+            self,
+            inner: ImageGenerator,
+            cache: GenerationResultCache,
+            model: str,
+            blob_store: BlobStore | None = None
+    ):
+        self._inner = inner
+        self._cache = cache
+        self._model = model
+        self._blob_store = blob_store
+        self.max_concurrent_variations = inner.max_concurrent_variations
+
+    @property
+    def cache(self) -> GenerationResultCache:
+        return self._cache
+
+    async def generate_variations(self, request: GenerationRequest) -> list[VariationResult]:
+        """Serve cached variations immediately and generate only the missing ones"""
+        async with aclosing(self.stream_variations(request)) as stream:
+            results = [result async for result in stream]
+        return sorted(results, key=lambda result: result.index)
+
+    async def stream_variations(self, request: GenerationRequest) -> AsyncIterator[VariationResult]:
+        """Yield cached variations first, then the missing ones as they are generated"""
+        missing = []
+        for index, key in enumerate(await self._keys(request)):
+            image = await self._lookup(key)
+            if image is None:
+                missing.append(index)
+            else:
+                yield VariationResult(index, image=image, cached=True)
+
+        if missing:
+            # Closing this stream early must close the inner one too, which cancels its provider calls
+            async with aclosing(self._stream(request, missing, self._generate_and_store)) as results:
+                async for result in results:
+                    yield result
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        image = await self._lookup((await self._keys(request))[index])
+        if image is not None:
+            return image
+        return await self._generate_and_store(request, index)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    async def _lookup(self, key: str) -> str | None:
+        image = await self._cache.get(key)
+        if image is None or self._blob_store is None:
+            return image
+
+        blob_key = self._blob_store.key_from_url(image)
+        if blob_key is None or await self._blob_store.exists(blob_key):
+            return image
+
+        await self._cache.invalidate(key)
+        return None
+
+    async def _generate_and_store(self, request: GenerationRequest, index: int) -> str:
+        image = await self._inner.generate_variation(request, index)
+        await self._cache.put((await self._keys(request))[index], image)
+        return image
+
+    async def _keys(self, request: GenerationRequest) -> list[str]:
+        fingerprint = await reference_fingerprint(request)
+        return [
+            GenerationResultCache.make_key(fingerprint, request.prompt, index, self._model)
+            for index in range(request.variations)
+        ]
@@ -0,0 +1,77 @@
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.infrastructure.cache.fingerprint import reference_fingerprint
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers asking for the same key.
+
+    The call runs in its own task, so a caller that goes away doesn't cancel it for the others;
+    it is only cancelled once every caller waiting on it has gone.
+    """
+
+    def __init__(self):
+        self._flights: dict[str, _Flight] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
+
+    async def do(self, key: str, call: Callable[[], Awaitable[str]]) -> str:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+class SingleFlightImageGenerator(ImageGenerator):
+    """ImageGenerator decorator that coalesces concurrent identical variations into one provider call"""
+
+    def __init__(self, inner: ImageGenerator, single_flight: SingleFlight):
+        self._inner = inner
+        self._single_flight = single_flight
+        self.max_concurrent_variations = inner.max_concurrent_variations
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        key = await self._key(request, index)
+        return await self._single_flight.do(key, lambda: self._inner.generate_variation(request, index))
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    @staticmethod
+    async def _key(request: GenerationRequest, index: int) -> str:
+        fingerprint = await reference_fingerprint(request)
+        return hashlib.blake2b(f"{fingerprint}\0{request.prompt}\0{index}".encode(), digest_size=32).hexdigest()
@@ -0,0 +1,8 @@
+from src.infrastructure.compute.cpu_executor import (
+    CpuExecutor,
+    get_cpu_executor,
+    initialize_cpu_executor,
+    shutdown_cpu_executor,
+)
+
+__all__ = ["CpuExecutor", "get_cpu_executor", "initialize_cpu_executor", "shutdown_cpu_executor"]
@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def _timed(fn: Callable[..., T], *args: Any) -> tuple[float, T]:
+    """Run fn in the pool and report when it actually started (CLOCK_MONOTONIC is shared by processes)"""
+    return time.monotonic(), fn(*args)
+
+
+class CpuExecutor:
+    """
+    Shared pool for CPU-bound image work (decode, resize, encode, base64).
+
+    A thread pool is enough when the work releases the GIL (most Pillow codecs do); a process pool
+    isolates pure-Python work from the event loop, at the cost of pickling arguments and results,
+    so functions must be module-level. At most max_concurrency jobs are submitted at once; the rest
+    wait here, and the time from run() to the job starting is recorded as queue time.
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int | None = None, max_concurrency: int | None = None):
+        workers = max_workers or os.cpu_count() or 1
+        if kind == "thread":
+            self._pool: Executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu")
+        elif kind == "process":
+            # spawn: forking a process that runs an event loop and other threads is not safe
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            raise ValueError(f"Unknown CPU executor kind: {kind}")
+
+        self._kind = kind
+        self._workers = workers
+        self._semaphore = asyncio.Semaphore(max_concurrency or workers * 2)
+
+        self._waiting = 0
+        self._running = 0
+        self.completed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+
+    def stats(self) -> dict[str, float | str]:
+        return {
+            "kind": self._kind,
+            "workers": self._workers,
+            "waiting": self._waiting,
+            "running": self._running,
+            "completed": self.completed,
+            "queue_time_avg_ms": round(self.queue_time_total / self.completed * 1000, 2) if self.completed else 0.0,
+            "queue_time_max_ms": round(self.queue_time_max * 1000, 2),
+            "run_time_avg_ms": round(self.run_time_total / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) in the pool and await its result"""
+        submitted = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            started, result = await asyncio.get_running_loop().run_in_executor(self._pool, _timed, fn, *args)
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+
+        finished = time.monotonic()
+        queue_time = max(0.0, started - submitted)
+        self.completed += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        self.run_time_total += finished - started
+        return result
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_cpu_executor: CpuExecutor | None = None
+
+
+def initialize_cpu_executor(
+        kind: str = "thread",
+        max_workers: int | None = None,
+        max_concurrency: int | None = None
+) -> CpuExecutor:
+    """Create the process-wide CPU executor"""
+    global _cpu_executor
+    _cpu_executor = CpuExecutor(kind, max_workers, max_concurrency)
+    return _cpu_executor
+
+
+def get_cpu_executor() -> CpuExecutor:
+    """Get the process-wide CPU executor, falling back to a default thread pool"""
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = CpuExecutor()
+    return _cpu_executor
+
+
+def shutdown_cpu_executor() -> None:
+    """Stop the process-wide CPU executor's workers"""
+    global _cpu_executor
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown()
+        _cpu_executor = None
@@ -14,9 +14,18 @@ class Settings(BaseSettings):
     gemini_api_key: str | None = None
     stripe_secret_key: str | None = None
     stripe_webhook_secret: str | None = None
+    # Bearer token for /api/internal/metrics; the endpoint is disabled while unset
+    internal_metrics_token: str | None = None
 
-    # Database
-    database_url: str = "sqlite:///./credits.db"
+    # Database (async drivers, e.g. sqlite+aiosqlite or postgresql+asyncpg, keep queries off the event loop)
+    database_url: str = "sqlite+aiosqlite:///./credits.db"
+    # Connection pool: "queue", or "null" to open a connection per checkout (e.g. for tests)
+    database_pool: str = "queue"
+    database_pool_size: int = 5
+    database_pool_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = -1
+    database_pool_pre_ping: bool = False
 
     # URLs
     frontend_url: str = "http://localhost:3000"
@@ -26,6 +35,110 @@ class Settings(BaseSettings):
 
     # Business Rules
     credits_per_generation: int = 3
+    # Credits held by a generation are released back if not settled within the TTL
+    credit_hold_ttl_seconds: int = 900
+    credit_hold_sweep_interval_seconds: float = 60.0
+
+    # Stripe client
+    stripe_api_base: str | None = None
+    stripe_timeout: float = 30.0
+    stripe_connect_timeout: float = 5.0
+    stripe_max_network_retries: int = 2
+
+    # Image generation ("gemini", or "fake" for offline load tests)
+    image_generator_backend: str = "gemini"
+    gemini_model: str = "gemini-2.5-flash-image"
+    generation_max_concurrent_variations: int = 3
+    generation_max_concurrent_calls: int = 16
+    gemini_base_url: str | None = None
+    gemini_pool_max_connections: int = 32
+    gemini_pool_max_keepalive: int = 16
+    gemini_pool_keepalive_expiry: float = 60.0
+
+    # CPU-bound image work (decode, resize, encode, base64) runs on a "thread" or "process" pool
+    cpu_executor_kind: str = "thread"
+    cpu_executor_max_workers: int | None = None
+    cpu_executor_max_concurrency: int | None = None
+
+    # Upload limits, checked while streaming and from the image header before decoding
+    max_upload_bytes: int = 20 * 1024 * 1024
+    max_upload_pixels: int = 50_000_000
+    max_upload_dimension: int = 12_000
+
+    # Process-wide budget for in-flight image buffers; requests wait, then are shed with 503
+    memory_budget_bytes: int = 1024 * 1024 * 1024
+    memory_budget_wait_timeout_seconds: float = 10.0
+    memory_budget_provider_response_bytes: int = 8 * 1024 * 1024
+
+    # Reference image preprocessing (fit is "crop" or "pad"; an empty aspect ratio keeps the original)
+    reference_max_edge: int = 1024
+    reference_aspect_ratio: str = "1:1"
+    reference_fit: str = "crop"
+    reference_format: str = "JPEG"
+    reference_quality: int = 90
+    reference_cache_entries: int = 256
+    # Preprocessed reference images reusable by asset id (memory LRU plus an optional disk tier)
+    reference_asset_memory_bytes: int = 256 * 1024 * 1024
+    reference_asset_dir: str | None = "./assets"
+    reference_asset_ttl_seconds: int = 24 * 3600
+
+    # Fake image generator (lognormal latency between p50 and p99, injected failures and timeouts)
+    fake_generator_latency_p50_seconds: float = 8.0
+    fake_generator_latency_p99_seconds: float = 20.0
+    fake_generator_failure_rate: float = 0.0
+    fake_generator_timeout_rate: float = 0.0
+    fake_generator_timeout_seconds: float = 60.0
+    fake_generator_image_size: int = 1024
+    # Capture real provider responses here, and replay them from the fake generator
+    generation_record_dir: str | None = None
+    fake_generator_replay_dir: str | None = None
+
+    # Provider resilience: retries with jittered backoff, a process-wide retry budget and a circuit breaker
+    generation_max_retries: int = 1
+    generation_retry_base_delay_seconds: float = 0.5
+    generation_retry_max_delay_seconds: float = 8.0
+    generation_retry_budget_ratio: float = 0.1
+    generation_retry_budget_min_per_second: float = 1.0
+    generation_retry_budget_window_seconds: float = 10.0
+    generation_circuit_failure_threshold: int = 5
+    generation_circuit_reset_timeout_seconds: float = 30.0
+    generation_circuit_half_open_max_calls: int = 1
+
+    # Adaptive provider concurrency (AIMD on latency and overload errors)
+    provider_limiter_enabled: bool = True
+    provider_limiter_initial_limit: int = 8
+    provider_limiter_min_limit: int = 1
+    provider_limiter_max_limit: int = 32
+    provider_limiter_latency_tolerance: float = 2.0
+    provider_limiter_max_queue: int = 64
+    provider_limiter_queue_timeout_seconds: float = 30.0
+
+    # Generated image storage ("filesystem", "memory", or "none" for inline data URIs)
+    blob_store_backend: str = "filesystem"
+    blob_store_dir: str = "./blobs"
+    blob_store_memory_bytes: int = 256 * 1024 * 1024
+    image_url_base: str = "/api/images"
+
+    # Output renditions: "original" keeps the provider's PNG, or "webp", "avif", "jpeg", "png"
+    rendition_default_format: str = "original"
+    rendition_quality: int = 80
+    rendition_thumbnail_edge: int = 256
+    rendition_cache_entries: int = 4096
+
+    # Generation result cache
+    generation_single_flight_enabled: bool = True
+    generation_cache_enabled: bool = True
+    generation_cache_memory_bytes: int = 256 * 1024 * 1024
+    generation_cache_dir: str | None = None
+    generation_cache_ttl_seconds: int = 7 * 24 * 3600
+
+    # Generation job workers
+    job_worker_concurrency: int = 4
+    job_poll_interval_seconds: float = 1.0
+    job_lease_seconds: int = 600
+    job_max_attempts: int = 3
+    # A queued job's credit hold has to outlive its wait in the queue and every attempt's lease
+    job_credit_hold_ttl_seconds: int = 3600
 
     # Server
     host: str = "0.0.0.0"
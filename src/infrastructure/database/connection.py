@@ -2,21 +2,60 @@ import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 
+from src.infrastructure.database.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+)
 
-class DatabaseConnection:
-    """Manages database connection and sessions"""
 
-    def __init__(self, database_url: str):
+class DatabaseConnection:
+    """
+    Manages database connection and sessions.
+
+    pool is "queue" (a bounded pool of pool_size connections plus max_overflow extra ones, waiting
+    up to pool_timeout seconds for a free one) or "null" (a new connection per checkout, e.g. for
+    tests). In-memory SQLite keeps SQLAlchemy's single shared connection, and reports no gauges.
+    """
+
+    def __init__(
+            self,
+            database_url: str,
+            pool: str = "queue",
+            pool_size: int = 5,
+            max_overflow: int = 10,
+            pool_timeout: float = 30.0,
+            pool_recycle: int = -1,
+            pool_pre_ping: bool = False
+    ):
         self.database_url = database_url
+        self.pool_metrics = PoolMetrics()
 
         self.is_async = database_url.startswith("postgresql+asyncpg") or database_url.startswith("sqlite+aiosqlite")
 
+        if pool == "null":
+            pool_options = {"poolclass": NullPool}
+        elif pool != "queue":
+            raise ValueError(f"Unknown database pool: {pool}")
+        elif _is_in_memory_sqlite(database_url):
+            pool_options = {}
+        else:
+            pool_options = {
+                "poolclass": InstrumentedAsyncAdaptedQueuePool if self.is_async else InstrumentedQueuePool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": pool_timeout,
+                "pool_recycle": pool_recycle,
+                "pool_pre_ping": pool_pre_ping,
+            }
+
         if self.is_async:
-            self.engine = create_async_engine(database_url, echo=False, future=True)
+            self.engine = create_async_engine(database_url, echo=False, future=True, **pool_options)
             self.SessionFactory = async_sessionmaker(
                 self.engine,
                 class_=AsyncSession,
@@ -27,7 +66,8 @@ class DatabaseConnection:
             self.engine = create_engine(
                 database_url,
                 connect_args=connect_args,
-                echo=False
+                echo=False,
+                **pool_options
             )
             self.SessionFactory = sessionmaker(
                 autocommit=False,
@@ -35,6 +75,20 @@ class DatabaseConnection:
                 bind=self.engine
             )
 
+        if pool_options:
+            self.pool_metrics.instrument(self.engine.pool)
+
+    def pool_stats(self) -> dict[str, float | str]:
+        """Gauges of the connection pool: configured size, connections in use and checkout waits"""
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool | NullPool):
+            return {"pool": type(pool).__name__}
+
+        stats = {"pool": type(pool).__name__, **self.pool_metrics.stats()}
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), idle=pool.checkedin(), overflow=pool.overflow())
+        return stats
+
     async def create_tables(self):
         """Create all tables"""
         from src.infrastructure.database.models import Base
@@ -46,8 +100,8 @@ class DatabaseConnection:
             Base.metadata.create_all(bind=self.engine)
 
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[Session, None]:
-        """Get a database session"""
+    async def get_session(self) -> AsyncGenerator[Session | AsyncSession, None]:
+        """Get a database session (an AsyncSession when the URL uses an async driver)"""
         if self.is_async:
             async with self.SessionFactory() as session:
                 try:
@@ -71,14 +125,14 @@ class DatabaseConnection:
 _db_connection: DatabaseConnection | None = None
 
 
-def initialize_database(database_url: str = None) -> DatabaseConnection:
-    """Initialize database connection"""
+def initialize_database(database_url: str = None, **pool_options) -> DatabaseConnection:
+    """Initialize database connection; pool_options are passed on to DatabaseConnection"""
     global _db_connection
 
     if database_url is None:
-        database_url = os.getenv("DATABASE_URL", "sqlite:///./credits.db")
+        database_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./credits.db")
 
-    _db_connection = DatabaseConnection(database_url)
+    _db_connection = DatabaseConnection(database_url, **pool_options)
     return _db_connection
 
 
@@ -88,3 +142,8 @@ def get_database() -> DatabaseConnection:
     if _db_connection is None:
         raise RuntimeError("Database not initialized. Call initialize_database() first.")
     return _db_connection
+
+
+def _is_in_memory_sqlite(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, LargeBinary, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -32,4 +32,42 @@ class TransactionModel(Base):
     credits = Column(Integer, nullable=False)
     amount = Column(Float, nullable=True)
     description = Column(String(500), nullable=True)
+    # Hold settled by a capture or release
+    hold_id = Column(String(32), index=True, nullable=True)
     created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class CreditHoldModel(Base):
+    """SQLAlchemy credit hold model: credits taken out of a user's available balance, pending settlement"""
+
+    __tablename__ = "credit_holds"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    credits = Column(Integer, nullable=False)
+    description = Column(String(500), nullable=True)
+    expires_at = Column(DateTime, index=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+
+class GenerationJobModel(Base):
+    """SQLAlchemy generation job model, used as a durable work queue"""
+
+    __tablename__ = "generation_jobs"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    status = Column(String(20), index=True, nullable=False)
+    prompt = Column(Text, nullable=False)
+    reference_image = Column(LargeBinary, nullable=False)
+    variations = Column(Integer, default=3, nullable=False)
+    credits_charged = Column(Integer, nullable=False)
+    images = Column(Text, nullable=True)
+    error = Column(String(500), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    # Hold on the user's credits, settled when the job completes
+    hold_id = Column(String(32), nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, index=True, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
@@ -0,0 +1,98 @@
+import time
+from collections import deque
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Checkout-wait and in-use gauges of a connection pool.
+
+    In-use connections are counted from the pool's checkout and checkin events; checkout waits
+    are reported by the instrumented pools below, over the most recent WINDOW checkouts.
+    """
+
+    WINDOW = 1024
+
+    def __init__(self) -> None:
+        self._waits: deque[float] = deque(maxlen=self.WINDOW)
+
+        self.in_use = 0
+        self.max_in_use = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+
+    def instrument(self, pool: Pool) -> None:
+        """Listen to the pool's events (kept when the pool is recreated) and time its checkouts"""
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        if isinstance(pool, InstrumentedQueuePool):
+            pool.metrics = self
+
+    def observe_wait(self, seconds: float) -> None:
+        self._waits.append(seconds)
+
+    def observe_timeout(self) -> None:
+        self.timeouts += 1
+
+    def stats(self) -> dict[str, float]:
+        waits = sorted(self._waits)
+        return {
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "checkout_wait_ms_p50": _percentile_ms(waits, 0.5),
+            "checkout_wait_ms_p99": _percentile_ms(waits, 0.99),
+            "checkout_wait_ms_max": _percentile_ms(waits, 1.0),
+        }
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        self.checkouts += 1
+        self.in_use += 1
+        self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self.in_use = max(0, self.in_use - 1)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool reporting how long each checkout waited for a connection to its PoolMetrics"""
+
+    metrics: PoolMetrics | None = None
+
+    def connect(self):
+        if self.metrics is None:
+            return super().connect()
+
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.observe_timeout()
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool reporting its checkout waits, for async engines"""
+
+
+def _percentile_ms(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return round(sorted_values[index] * 1000, 2)
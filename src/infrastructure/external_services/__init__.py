@@ -1,4 +1,5 @@
+from src.infrastructure.external_services.fake_image_generator import FakeImageGenerator, RecordingImageGenerator
 from src.infrastructure.external_services.gemini_image_generator import GeminiImageGenerator
 from src.infrastructure.external_services.stripe_payment_gateway import StripePaymentGateway
 
-__all__ = ["GeminiImageGenerator", "StripePaymentGateway"]
+__all__ = ["FakeImageGenerator", "GeminiImageGenerator", "RecordingImageGenerator", "StripePaymentGateway"]
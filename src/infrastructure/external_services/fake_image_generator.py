@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from pathlib import Path
+
+from src.domain.services.blob_store import BlobStore
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.infrastructure.cache.fingerprint import reference_fingerprint
+from src.infrastructure.compute import get_cpu_executor
+from src.infrastructure.imaging.codecs import b64decode_text, b64encode_text, render_noise_png, to_data_uri
+from src.shared.shared_tasks import await_shared
+
+# z-score of the 99th percentile of a standard normal distribution
+Z_99 = 2.3263
+
+
+class SimulatedProviderError(Exception):
+    """Provider failure injected by FakeImageGenerator"""
+
+    code = 503
+
+
+def _recording_key(fingerprint: str, prompt: str, index: int) -> str:
+    return hashlib.blake2b(f"{fingerprint}\0{prompt}\0{index}".encode(), digest_size=32).hexdigest()
+
+
+class FakeImageGenerator(ImageGenerator):
+    """
+    Offline ImageGenerator for load tests.
+
+    Latency is lognormal with the given median and 99th percentile. Calls fail with a 503-like
+    error at failure_rate and hang for timeout_seconds before raising TimeoutError at timeout_rate.
+    Images are a synthetic PNG, or responses captured by RecordingImageGenerator when replay_dir
+    has one for the request.
+    """
+
+    def __init__(
+            self,
+            latency_p50: float = 8.0,
+            latency_p99: float = 20.0,
+            failure_rate: float = 0.0,
+            timeout_rate: float = 0.0,
+            timeout_seconds: float = 60.0,
+            image_size: int = 1024,
+            replay_dir: str | None = None,
+            max_concurrent_variations: int = 3,
+            blob_store: BlobStore | None = None,
+            seed: int | None = None
+    ):
+        self._mu = math.log(latency_p50)
+        self._sigma = max(0.0, math.log(latency_p99 / latency_p50) / Z_99)
+        self._failure_rate = failure_rate
+        self._timeout_rate = timeout_rate
+        self._timeout_seconds = timeout_seconds
+        self._image_size = image_size
+        self._replay_dir = Path(replay_dir) if replay_dir else None
+        self._blob_store = blob_store
+        self._random = random.Random(seed)
+        self._synthetic_png: dict[int, asyncio.Task] = {}
+        self.max_concurrent_variations = max_concurrent_variations
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        recording = await self._find_recording(request, index)
+        roll = self._random.random()
+
+        if roll < self._timeout_rate:
+            await asyncio.sleep(self._timeout_seconds)
+            raise TimeoutError(f"Simulated provider timeout after {self._timeout_seconds:.0f}s")
+
+        latency = recording["latency"] if recording else self._random.lognormvariate(self._mu, self._sigma)
+        await asyncio.sleep(latency)
+
+        if roll < self._timeout_rate + self._failure_rate:
+            raise SimulatedProviderError("Simulated provider failure")
+
+        if recording:
+            data = await get_cpu_executor().run(b64decode_text, recording["data"])
+            return await self._publish(data, recording["mime_type"])
+
+        data = await await_shared(
+            self._synthetic_png,
+            self._image_size,
+            lambda: get_cpu_executor().run(render_noise_png, self._image_size)
+        )
+        return await self._publish(data, "image/png")
+
+    async def _find_recording(self, request: GenerationRequest, index: int) -> dict | None:
+        if self._replay_dir is None:
+            return None
+        path = self._replay_dir / f"{_recording_key(await reference_fingerprint(request), request.prompt, index)}.json"
+        if not path.exists():
+            return None
+        return json.loads(await asyncio.to_thread(path.read_text))
+
+    async def _publish(self, data: bytes, mime: str) -> str:
+        if self._blob_store is not None:
+            return self._blob_store.url_for(await self._blob_store.put(data, mime))
+        return await get_cpu_executor().run(to_data_uri, data, mime)
+
+
+class RecordingImageGenerator(ImageGenerator):
+    """
+    ImageGenerator decorator that captures real responses and their latency for FakeImageGenerator
+    to replay. Images are resolved through the blob store, so recordings are self-contained.
+    """
+
+    def __init__(self, inner: ImageGenerator, record_dir: str, blob_store: BlobStore | None = None):
+        self._inner = inner
+        self._record_dir = Path(record_dir)
+        self._record_dir.mkdir(parents=True, exist_ok=True)
+        self._blob_store = blob_store
+        self.max_concurrent_variations = inner.max_concurrent_variations
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        started = time.monotonic()
+        image = await self._inner.generate_variation(request, index)
+        latency = time.monotonic() - started
+
+        try:
+            data, mime = await self._resolve(image)
+            recording = {
+                "latency": latency,
+                "mime_type": mime,
+                "data": await get_cpu_executor().run(b64encode_text, data),
+            }
+            key = _recording_key(await reference_fingerprint(request), request.prompt, index)
+            await asyncio.to_thread((self._record_dir / f"{key}.json").write_text, json.dumps(recording))
+        except Exception as e:
+            print(f"Failed to record variation {index + 1}: {e!s}")
+
+        return image
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+    async def _resolve(self, image: str) -> tuple[bytes, str]:
+        if image.startswith("data:"):
+            header, _, encoded = image.partition(",")
+            return await get_cpu_executor().run(b64decode_text, encoded), header[len("data:"):].split(";")[0]
+
+        blob = await self._blob_store.get(image.rsplit("/", 1)[-1]) if self._blob_store else None
+        if blob is None:
+            raise ValueError(f"Cannot resolve {image}")
+        return blob.data, blob.content_type
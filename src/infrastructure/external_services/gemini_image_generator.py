@@ -1,69 +1,149 @@
-import base64
+import asyncio
+from contextlib import AbstractAsyncContextManager, nullcontext
+from weakref import WeakKeyDictionary
 
+import httpx
 from google import genai
 from google.genai import types
+from PIL import Image
 
+from src.domain.exceptions import ImageGenerationError
+from src.domain.services.blob_store import BlobStore
 from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.infrastructure.compute import get_cpu_executor
+from src.infrastructure.imaging.codecs import encode_for_upload, to_data_uri
+from src.infrastructure.resilience.memory_budget import MemoryBudget
+from src.shared.shared_tasks import await_shared
+
+# Appended to the prompt of each variation so they come out visibly different
+PROMPT_SUFFIXES = (
+    "High-resolution, photorealistic quality with natural daylight.",
+    "Professional studio lighting with soft shadows and realistic details.",
+    "Natural outdoor lighting with authentic textures and lifelike appearance.",
+    "Warm golden-hour light with a shallow depth of field.",
+    "Soft overcast light with even skin tones and crisp focus.",
+    "Editorial magazine style with balanced contrast and true-to-life colors.",
+    "Candid documentary style with available light and natural grain.",
+    "Bright window light with gentle fill and clean, realistic details.",
+)
 
 
 class GeminiImageGenerator(ImageGenerator):
-    """Gemini API implementation of ImageGenerator"""
-
-    def __init__(self, api_key: str):
-        self._client = genai.Client(api_key=api_key)
-        self._model = "gemini-2.5-flash-image"
-
-    async def generate(self, request: GenerationRequest) -> list[str]:
-        """Generate images using Gemini API"""
-        generated_images = []
-        variations = self._create_prompt_variations(request.prompt, request.variations)
-
-        for i, variant_prompt in enumerate(variations):
-            try:
-                print(f"Generating variation {i + 1}/{request.variations}...")
-
-                max_retries = 2
-                for attempt in range(max_retries):
-                    try:
-                        response = self._client.models.generate_content(
-                            model=self._model,
-                            contents=[variant_prompt, request.reference_image],
-                            config=types.GenerateContentConfig(
-                                response_modalities=["IMAGE"],
-                                image_config=types.ImageConfig(aspect_ratio="1:1")
-                            ),
-                        )
-
-                        if response and response.candidates:
-                            candidate = response.candidates[0]
-                            if candidate.content and candidate.content.parts:
-                                for part in candidate.content.parts:
-                                    if getattr(part, "inline_data", None):
-                                        mime = getattr(part.inline_data, "mime_type", "image/png")
-                                        encoded = base64.b64encode(part.inline_data.data).decode("utf-8")
-                                        generated_images.append(f"data:{mime};base64,{encoded}")
-                                        break
-                                break
-
-                    except Exception as retry_error:
-                        print(f"Attempt {attempt + 1} failed: {retry_error}")
-                        if attempt == max_retries - 1:
-                            raise
-
-            except Exception as e:
-                print(f"Error generating variation {i + 1}: {e!s}")
-                continue
-
-        if not generated_images:
-            raise Exception("Failed to generate any images after all attempts")
-
-        return generated_images
+    """
+    Gemini API implementation of ImageGenerator.
+
+    Meant to live for the whole process: it owns a pooled keep-alive HTTP transport and the
+    process-wide cap on in-flight provider calls, and must be closed with aclose() on shutdown.
+    Without an API key the service still starts, and generation fails with ImageGenerationError.
+    """
+
+    def __init__(
+            self,
+            api_key: str | None,
+            model: str = "gemini-2.5-flash-image",
+            max_concurrent_variations: int = 3,
+            max_concurrent_calls: int = 16,
+            base_url: str | None = None,
+            max_connections: int = 32,
+            max_keepalive_connections: int = 16,
+            keepalive_expiry: float = 60.0,
+            blob_store: BlobStore | None = None,
+            memory_budget: MemoryBudget | None = None,
+            response_bytes_estimate: int = 8 * 1024 * 1024
+    ):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        # An explicit transport keeps the SDK on httpx, so the pool limits apply
+        self._client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                base_url=base_url,
+                async_client_args={"transport": httpx.AsyncHTTPTransport(limits=limits)}
+            )
+        ) if api_key else None
+        self._model = model
+        self._call_semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self._blob_store = blob_store
+        self._memory_budget = memory_budget
+        self._response_bytes_estimate = response_bytes_estimate
+        self.max_concurrent_variations = max_concurrent_variations
+        self._reference_parts: WeakKeyDictionary[GenerationRequest, asyncio.Task] = WeakKeyDictionary()
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        """Generate a single variation using Gemini API (one attempt; retries are the caller's policy)"""
+        variant_prompt = self._create_prompt_variations(request.prompt, request.variations)[index]
+        reference_part = await self._get_reference_part(request)
+        print(f"Generating variation {index + 1}/{request.variations}...")
+
+        # The response body, its decoded image and the published copy are alive at once
+        async with self._reserve_memory():
+            async with self._call_semaphore:
+                response = await self._get_client().aio.models.generate_content(
+                    model=self._model,
+                    contents=[variant_prompt, reference_part],
+                    config=types.GenerateContentConfig(
+                        response_modalities=["IMAGE"],
+                        image_config=types.ImageConfig(aspect_ratio="1:1")
+                    ),
+                )
+
+            inline_data = self._extract_inline_data(response)
+            if not inline_data:
+                raise ImageGenerationError(f"Variation {index + 1}: response contained no image data")
+            return await self._publish(inline_data)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections"""
+        if self._client is not None:
+            await self._client.aio.aclose()
+            self._client.close()
+
+    def _get_client(self) -> genai.Client:
+        if self._client is None:
+            raise ImageGenerationError("Gemini API key not configured")
+        return self._client
+
+    def _reserve_memory(self) -> AbstractAsyncContextManager:
+        if self._memory_budget is None:
+            return nullcontext()
+        return self._memory_budget.reserve(self._response_bytes_estimate)
+
+    async def _get_reference_part(self, request: GenerationRequest) -> types.Part:
+        """Upload the request's prepared bytes as they are, else encode the reference image once per request"""
+        if request.reference_data is not None and request.reference_mime_type is not None:
+            return types.Part.from_bytes(data=request.reference_data, mime_type=request.reference_mime_type)
+        return await await_shared(
+            self._reference_parts,
+            request,
+            lambda: self._encode_reference(request.reference_image)
+        )
+
+    @staticmethod
+    async def _encode_reference(image: Image.Image) -> types.Part:
+        data, mime_type = await get_cpu_executor().run(encode_for_upload, image)
+        return types.Part.from_bytes(data=data, mime_type=mime_type)
+
+    def _extract_inline_data(self, response: types.GenerateContentResponse) -> types.Blob | None:
+        """Return the first inline image of the response"""
+        if response and response.candidates:
+            candidate = response.candidates[0]
+            if candidate.content and candidate.content.parts:
+                for part in candidate.content.parts:
+                    if getattr(part, "inline_data", None):
+                        return part.inline_data
+        return None
+
+    async def _publish(self, inline_data: types.Blob) -> str:
+        """Store the image in the blob store and return its URL, or fall back to a data URI"""
+        mime = inline_data.mime_type or "image/png"
+        if self._blob_store is not None:
+            return self._blob_store.url_for(await self._blob_store.put(inline_data.data, mime))
+
+        return await get_cpu_executor().run(to_data_uri, inline_data.data, mime)
 
     def _create_prompt_variations(self, base_prompt: str, count: int) -> list[str]:
-        """Create variations of the base prompt"""
-        variations = [
-            f"{base_prompt} High-resolution, photorealistic quality with natural daylight.",
-            f"{base_prompt} Professional studio lighting with soft shadows and realistic details.",
-            f"{base_prompt} Natural outdoor lighting with authentic textures and lifelike appearance."
-        ]
-        return variations[:count]
+        """Create variations of the base prompt, cycling through the suffixes if more are asked for"""
+        return [f"{base_prompt} {PROMPT_SUFFIXES[i % len(PROMPT_SUFFIXES)]}" for i in range(count)]
@@ -0,0 +1,277 @@
+from src.domain.services.blob_store import BlobStore
+from src.domain.services.image_generator import ImageGenerator
+from src.domain.services.payment_gateway import PaymentGateway
+from src.infrastructure.cache import (
+    CachingImageGenerator,
+    GenerationResultCache,
+    SingleFlight,
+    SingleFlightImageGenerator,
+)
+from src.infrastructure.compute import get_cpu_executor
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.external_services.fake_image_generator import FakeImageGenerator, RecordingImageGenerator
+from src.infrastructure.external_services.gemini_image_generator import GeminiImageGenerator
+from src.infrastructure.external_services.stripe_payment_gateway import StripePaymentGateway
+from src.infrastructure.imaging import ReferenceAssetStore, ReferenceImagePreprocessor, RenditionService
+from src.infrastructure.resilience import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    ConcurrencyLimitedImageGenerator,
+    ResilientImageGenerator,
+    RetryBudget,
+    get_memory_budget,
+)
+from src.infrastructure.storage import InMemoryBlobStore, LocalBlobStore
+
+_blob_store: BlobStore | None = None
+_image_generator: ImageGenerator | None = None
+_payment_gateway: PaymentGateway | None = None
+_generation_cache: GenerationResultCache | None = None
+_single_flight: SingleFlight | None = None
+_provider_limiter: AdaptiveConcurrencyLimiter | None = None
+_circuit_breaker: CircuitBreaker | None = None
+_retry_budget: RetryBudget | None = None
+_reference_preprocessor: ReferenceImagePreprocessor | None = None
+_reference_assets: ReferenceAssetStore | None = None
+_rendition_service: RenditionService | None = None
+
+
+def initialize_blob_store(settings: Settings) -> BlobStore | None:
+    """Create the process-wide store for generated images"""
+    global _blob_store
+
+    if settings.blob_store_backend == "filesystem":
+        _blob_store = LocalBlobStore(settings.blob_store_dir, public_base_url=settings.image_url_base)
+    elif settings.blob_store_backend == "memory":
+        _blob_store = InMemoryBlobStore(settings.image_url_base, max_bytes=settings.blob_store_memory_bytes)
+    elif settings.blob_store_backend == "none":
+        _blob_store = None
+    else:
+        raise ValueError(f"Unknown blob store backend: {settings.blob_store_backend}")
+    return _blob_store
+
+
+def get_blob_store_instance() -> BlobStore | None:
+    """Get the process-wide blob store (None when images are returned inline)"""
+    return _blob_store
+
+
+def initialize_rendition_service(settings: Settings) -> RenditionService | None:
+    """Create the process-wide rendition service; needs the blob store, so call initialize_blob_store() first"""
+    global _rendition_service
+
+    if _blob_store is None:
+        _rendition_service = None
+    else:
+        _rendition_service = RenditionService(
+            _blob_store,
+            default_format=settings.rendition_default_format,
+            quality=settings.rendition_quality,
+            thumbnail_edge=settings.rendition_thumbnail_edge,
+            cache_entries=settings.rendition_cache_entries
+        )
+    return _rendition_service
+
+
+def get_rendition_service_instance() -> RenditionService | None:
+    """Get the process-wide rendition service (None when images are returned inline)"""
+    return _rendition_service
+
+
+def initialize_reference_preprocessor(settings: Settings) -> ReferenceImagePreprocessor:
+    """Create the process-wide preprocessor for uploaded reference images"""
+    global _reference_preprocessor
+
+    _reference_preprocessor = ReferenceImagePreprocessor(
+        max_edge=settings.reference_max_edge,
+        aspect_ratio=settings.reference_aspect_ratio or None,
+        fit=settings.reference_fit,
+        output_format=settings.reference_format,
+        quality=settings.reference_quality,
+        cache_entries=settings.reference_cache_entries
+    )
+    return _reference_preprocessor
+
+
+def get_reference_preprocessor_instance() -> ReferenceImagePreprocessor:
+    """Get the process-wide reference image preprocessor"""
+    if _reference_preprocessor is None:
+        raise RuntimeError("Reference preprocessor not initialized. Call initialize_reference_preprocessor() first.")
+    return _reference_preprocessor
+
+
+def initialize_reference_assets(settings: Settings) -> ReferenceAssetStore:
+    """Create the process-wide store of reusable preprocessed reference images"""
+    global _reference_assets
+
+    _reference_assets = ReferenceAssetStore(
+        max_memory_bytes=settings.reference_asset_memory_bytes,
+        disk_dir=settings.reference_asset_dir,
+        ttl_seconds=settings.reference_asset_ttl_seconds
+    )
+    return _reference_assets
+
+
+def get_reference_assets_instance() -> ReferenceAssetStore:
+    """Get the process-wide reference asset store"""
+    if _reference_assets is None:
+        raise RuntimeError("Reference assets not initialized. Call initialize_reference_assets() first.")
+    return _reference_assets
+
+
+def initialize_image_generator(settings: Settings) -> ImageGenerator:
+    """Create the process-wide image generator, publishing into the blob store if one is initialized"""
+    global _image_generator, _generation_cache, _single_flight, _provider_limiter, _circuit_breaker, _retry_budget
+
+    generator = _create_provider(settings)
+    if settings.generation_record_dir:
+        generator = RecordingImageGenerator(generator, settings.generation_record_dir, blob_store=_blob_store)
+
+    if settings.provider_limiter_enabled:
+        _provider_limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=settings.provider_limiter_initial_limit,
+            min_limit=settings.provider_limiter_min_limit,
+            max_limit=settings.provider_limiter_max_limit,
+            latency_tolerance=settings.provider_limiter_latency_tolerance,
+            max_queue=settings.provider_limiter_max_queue,
+            queue_timeout=settings.provider_limiter_queue_timeout_seconds
+        )
+        generator = ConcurrencyLimitedImageGenerator(generator, _provider_limiter)
+
+    # Each retry attempt goes through the limiter on its own
+    _circuit_breaker = CircuitBreaker(
+        "Image generation provider",
+        failure_threshold=settings.generation_circuit_failure_threshold,
+        reset_timeout=settings.generation_circuit_reset_timeout_seconds,
+        half_open_max_calls=settings.generation_circuit_half_open_max_calls
+    )
+    _retry_budget = RetryBudget(
+        ratio=settings.generation_retry_budget_ratio,
+        min_per_second=settings.generation_retry_budget_min_per_second,
+        window_seconds=settings.generation_retry_budget_window_seconds
+    )
+    generator = ResilientImageGenerator(
+        generator,
+        _circuit_breaker,
+        _retry_budget,
+        max_retries=settings.generation_max_retries,
+        base_delay=settings.generation_retry_base_delay_seconds,
+        max_delay=settings.generation_retry_max_delay_seconds
+    )
+
+    # Identical variations already in flight share one provider call
+    if settings.generation_single_flight_enabled:
+        _single_flight = SingleFlight()
+        generator = SingleFlightImageGenerator(generator, _single_flight)
+
+    # Cache hits are served without touching the provider stack
+    if settings.generation_cache_enabled:
+        _generation_cache = GenerationResultCache(
+            max_memory_bytes=settings.generation_cache_memory_bytes,
+            disk_dir=settings.generation_cache_dir,
+            ttl_seconds=settings.generation_cache_ttl_seconds
+        )
+        # Keep fake results apart from real ones
+        model = settings.gemini_model if settings.image_generator_backend == "gemini" else settings.image_generator_backend
+        generator = CachingImageGenerator(generator, _generation_cache, model=model, blob_store=_blob_store)
+
+    _image_generator = generator
+    return _image_generator
+
+
+def _create_provider(settings: Settings) -> ImageGenerator:
+    """Create the generator that actually produces images, as selected by image_generator_backend"""
+    if settings.image_generator_backend == "gemini":
+        return GeminiImageGenerator(
+            api_key=settings.gemini_api_key,
+            model=settings.gemini_model,
+            max_concurrent_variations=settings.generation_max_concurrent_variations,
+            max_concurrent_calls=settings.generation_max_concurrent_calls,
+            base_url=settings.gemini_base_url,
+            max_connections=settings.gemini_pool_max_connections,
+            max_keepalive_connections=settings.gemini_pool_max_keepalive,
+            keepalive_expiry=settings.gemini_pool_keepalive_expiry,
+            blob_store=_blob_store,
+            memory_budget=get_memory_budget(),
+            response_bytes_estimate=settings.memory_budget_provider_response_bytes
+        )
+    if settings.image_generator_backend == "fake":
+        return FakeImageGenerator(
+            latency_p50=settings.fake_generator_latency_p50_seconds,
+            latency_p99=settings.fake_generator_latency_p99_seconds,
+            failure_rate=settings.fake_generator_failure_rate,
+            timeout_rate=settings.fake_generator_timeout_rate,
+            timeout_seconds=settings.fake_generator_timeout_seconds,
+            image_size=settings.fake_generator_image_size,
+            replay_dir=settings.fake_generator_replay_dir,
+            max_concurrent_variations=settings.generation_max_concurrent_variations,
+            blob_store=_blob_store
+        )
+    raise ValueError(f"Unknown image generator backend: {settings.image_generator_backend}")
+
+
+def get_image_generator_instance() -> ImageGenerator:
+    """Get the process-wide image generator"""
+    if _image_generator is None:
+        raise RuntimeError("Image generator not initialized. Call initialize_image_generator() first.")
+    return _image_generator
+
+
+async def close_image_generator() -> None:
+    """Release the image generator's pooled connections"""
+    global _image_generator
+    if _image_generator is not None:
+        await _image_generator.aclose()
+        _image_generator = None
+
+
+def initialize_payment_gateway(settings: Settings) -> PaymentGateway:
+    """Create the process-wide payment gateway"""
+    global _payment_gateway
+
+    _payment_gateway = StripePaymentGateway(
+        api_key=settings.stripe_secret_key,
+        webhook_secret=settings.stripe_webhook_secret,
+        api_base=settings.stripe_api_base,
+        timeout=settings.stripe_timeout,
+        connect_timeout=settings.stripe_connect_timeout,
+        max_network_retries=settings.stripe_max_network_retries
+    )
+    return _payment_gateway
+
+
+def get_payment_gateway_instance() -> PaymentGateway:
+    """Get the process-wide payment gateway"""
+    if _payment_gateway is None:
+        raise RuntimeError("Payment gateway not initialized. Call initialize_payment_gateway() first.")
+    return _payment_gateway
+
+
+async def close_payment_gateway() -> None:
+    """Release the payment gateway's pooled connections"""
+    global _payment_gateway
+    if _payment_gateway is not None:
+        await _payment_gateway.aclose()
+        _payment_gateway = None
+
+
+def collect_stats() -> dict[str, dict]:
+    """Gather the counters of the process-wide provider components"""
+    stats = {"cpu_executor": get_cpu_executor().stats(), "memory_budget": get_memory_budget().stats()}
+    if _generation_cache is not None:
+        stats["generation_cache"] = _generation_cache.stats()
+    if _rendition_service is not None:
+        stats["renditions"] = _rendition_service.stats()
+    if _reference_preprocessor is not None:
+        stats["reference_preprocessor"] = _reference_preprocessor.stats()
+    if _reference_assets is not None:
+        stats["reference_assets"] = _reference_assets.stats()
+    if _single_flight is not None:
+        stats["single_flight"] = _single_flight.stats()
+    if _provider_limiter is not None:
+        stats["provider_limiter"] = _provider_limiter.stats()
+    if _circuit_breaker is not None:
+        stats["circuit_breaker"] = _circuit_breaker.stats()
+    if _retry_budget is not None:
+        stats["retry_budget"] = _retry_budget.stats()
+    return stats
@@ -1,3 +1,4 @@
+import httpx
 import stripe
 
 from src.domain.exceptions import PaymentProcessingError
@@ -7,16 +8,44 @@ from src.domain.value_objects.money import Money
 
 
 class StripePaymentGateway(PaymentGateway):
-    """Stripe implementation of PaymentGateway"""
+    """
+    Stripe implementation of PaymentGateway.
 
-    def __init__(self, api_key: str, webhook_secret: str = None):
-        stripe.api_key = api_key
+    Meant to live for the whole process: it owns one StripeClient on top of a pooled async httpx
+    transport (no global stripe.api_key), and must be closed with aclose() on shutdown.
+    """
+
+    def __init__(
+            self,
+            api_key: str | None,
+            webhook_secret: str = None,
+            api_base: str | None = None,
+            timeout: float = 30.0,
+            connect_timeout: float = 5.0,
+            max_network_retries: int = 2
+    ):
         self._webhook_secret = webhook_secret
+        self._http_client = stripe.HTTPXClient(timeout=httpx.Timeout(timeout, connect=connect_timeout))
+        self._client = stripe.StripeClient(
+            api_key,
+            base_addresses={"api": api_base} if api_base else None,
+            max_network_retries=max_network_retries,
+            http_client=self._http_client
+        ) if api_key else None
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections"""
+        await self._http_client.close_async()
+
+    def _get_client(self) -> stripe.StripeClient:
+        if self._client is None:
+            raise PaymentProcessingError("Stripe secret key not configured")
+        return self._client
 
     async def create_customer(self, email: Email) -> str:
         """Create a Stripe customer"""
         try:
-            customer = stripe.Customer.create(email=email.value)
+            customer = await self._get_client().v1.customers.create_async(params={"email": email.value})
             return customer.id
         except stripe.StripeError as e:
             raise PaymentProcessingError(f"Failed to create Stripe customer: {e!s}")
@@ -33,10 +62,10 @@ class StripePaymentGateway(PaymentGateway):
     ) -> CheckoutSession:
         """Create a Stripe checkout session"""
         try:
-            session = stripe.checkout.Session.create(
-                customer=customer_id,
-                payment_method_types=["card"],
-                line_items=[
+            session = await self._get_client().v1.checkout.sessions.create_async(params={
+                "customer": customer_id,
+                "payment_method_types": ["card"],
+                "line_items": [
                     {
                         "price_data": {
                             "currency": amount.currency.lower(),
@@ -49,11 +78,11 @@ class StripePaymentGateway(PaymentGateway):
                         "quantity": 1,
                     }
                 ],
-                mode="payment",
-                success_url=success_url,
-                cancel_url=cancel_url,
-                metadata=metadata
-            )
+                "mode": "payment",
+                "success_url": success_url,
+                "cancel_url": cancel_url,
+                "metadata": metadata
+            })
 
             return CheckoutSession(
                 session_id=session.id,
@@ -0,0 +1,19 @@
+from src.infrastructure.imaging.codecs import decode_image, encode_for_upload, to_data_uri
+from src.infrastructure.imaging.reference_assets import ReferenceAssetStore
+from src.infrastructure.imaging.reference_preprocessor import PreparedImage, ReferenceImagePreprocessor
+from src.infrastructure.imaging.renditions import Renditions, RenditionService
+from src.infrastructure.imaging.upload_validation import UploadValidator, ValidatedUpload, sniff_image_format
+
+__all__ = [
+    "PreparedImage",
+    "ReferenceAssetStore",
+    "ReferenceImagePreprocessor",
+    "RenditionService",
+    "Renditions",
+    "UploadValidator",
+    "ValidatedUpload",
+    "decode_image",
+    "encode_for_upload",
+    "sniff_image_format",
+    "to_data_uri",
+]
@@ -0,0 +1,59 @@
+import base64
+import os
+from io import BytesIO
+
+from PIL import Image, PngImagePlugin
+
+# Module-level so they can run in a process pool
+
+
+def decode_image(data: bytes) -> Image.Image:
+    """Fully decode an encoded image, so later pixel access doesn't touch the codec"""
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image
+
+
+def encode_for_upload(image: Image.Image) -> tuple[bytes, str]:
+    """Encode an image the way the provider SDK would: PNG for PNGs and alpha, JPEG otherwise"""
+    buffer = BytesIO()
+    if isinstance(image, PngImagePlugin.PngImageFile) or image.mode == "RGBA":
+        image.save(buffer, format="PNG")
+        return buffer.getvalue(), "image/png"
+    image.convert("RGB").save(buffer, format="JPEG")
+    return buffer.getvalue(), "image/jpeg"
+
+
+def to_data_uri(data: bytes, mime_type: str) -> str:
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode('utf-8')}"
+
+
+def b64encode_text(data: bytes) -> str:
+    return base64.b64encode(data).decode("utf-8")
+
+
+def b64decode_text(text: str) -> bytes:
+    return base64.b64decode(text)
+
+
+def render_noise_png(size: int) -> bytes:
+    """Noise, so the PNG is about as large as a real photo of the same size"""
+    buffer = BytesIO()
+    Image.frombytes("RGB", (size, size), os.urandom(size * size * 3)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def transcode_image(data: bytes, output_format: str, max_edge: int | None, quality: int) -> bytes:
+    """Re-encode an image, optionally downscaled so its longest edge is at most max_edge"""
+    image = Image.open(BytesIO(data))
+    if max_edge and max(image.size) > max_edge:
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    if output_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    buffer = BytesIO()
+    if output_format == "PNG":
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.save(buffer, format=output_format, quality=quality)
+    return buffer.getvalue()
@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from src.domain.exceptions import AssetNotFoundError
+from src.infrastructure.compute import get_cpu_executor
+from src.infrastructure.imaging.codecs import decode_image
+from src.infrastructure.imaging.reference_preprocessor import CONTENT_TYPES, PreparedImage
+from src.infrastructure.imaging.upload_validation import sniff_image_format
+
+ASSET_ID = re.compile(r"[0-9a-f]{64}")
+
+
+class ReferenceAssetStore:
+    """
+    Preprocessed reference images kept for reuse across generations, addressed by asset id.
+
+    The asset id is the hash of the preprocessed bytes. The memory tier is an LRU of decoded
+    images bounded by their pixel and encoded size; the optional disk tier keeps the encoded
+    bytes. Assets expire ttl_seconds after they were last stored, in both tiers.
+    """
+
+    SWEEP_EVERY_PUTS = 100
+
+    def __init__(self, max_memory_bytes: int, disk_dir: str | None = None, ttl_seconds: int = 86400):
+        self._max_memory_bytes = max_memory_bytes
+        self._memory: OrderedDict[str, tuple[PreparedImage, float]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_dir = Path(disk_dir) if disk_dir else None
+        self._ttl_seconds = ttl_seconds
+        self._puts = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self._disk_dir:
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def ttl_seconds(self) -> int:
+        return self._ttl_seconds
+
+    async def put(self, prepared: PreparedImage) -> str:
+        """Store a preprocessed image and return its asset id; storing it again renews its expiry"""
+        asset_id = await get_cpu_executor().run(_sha256_hex, prepared.data)
+        self._remember(asset_id, prepared, time.time() + self._ttl_seconds)
+
+        if self._disk_dir:
+            await asyncio.to_thread(self._write_disk, asset_id, prepared.data)
+            self._puts += 1
+            if self._puts % self.SWEEP_EVERY_PUTS == 0:
+                await asyncio.to_thread(self.sweep_expired)
+        return asset_id
+
+    async def get(self, asset_id: str) -> PreparedImage:
+        """Get a stored asset; raises AssetNotFoundError if it is unknown or has expired"""
+        if not ASSET_ID.fullmatch(asset_id):
+            raise AssetNotFoundError(f"Asset {asset_id} not found")
+
+        entry = self._memory.get(asset_id)
+        if entry is not None:
+            prepared, expires_at = entry
+            if expires_at > time.time():
+                self._memory.move_to_end(asset_id)
+                self.hits += 1
+                return prepared
+            self._forget(asset_id)
+            self.evictions += 1
+
+        if self._disk_dir:
+            stored = await asyncio.to_thread(self._read_disk, asset_id)
+            if stored is not None:
+                data, expires_at = stored
+                image_format = sniff_image_format(data[:16])
+                prepared = PreparedImage(
+                    data,
+                    CONTENT_TYPES.get(image_format, "application/octet-stream"),
+                    await get_cpu_executor().run(decode_image, data)
+                )
+                self._remember(asset_id, prepared, expires_at)
+                self.hits += 1
+                return prepared
+
+        self.misses += 1
+        raise AssetNotFoundError(f"Asset {asset_id} not found")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+        }
+
+    def sweep_expired(self) -> int:
+        """Delete expired files from the disk tier. Returns the number of files removed."""
+        if not self._disk_dir:
+            return 0
+
+        removed = 0
+        deadline = time.time() - self._ttl_seconds
+        for path in self._disk_dir.glob("*/*"):
+            try:
+                if path.stat().st_mtime < deadline:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+
+        self.evictions += removed
+        return removed
+
+    def _remember(self, asset_id: str, prepared: PreparedImage, expires_at: float) -> None:
+        """Insert into the memory tier, evicting least recently used entries over the budget"""
+        size = _memory_size(prepared)
+        if size > self._max_memory_bytes:
+            return
+
+        self._forget(asset_id)
+        self._memory[asset_id] = (prepared, expires_at)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self._max_memory_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= _memory_size(evicted)
+            self.evictions += 1
+
+    def _forget(self, asset_id: str) -> None:
+        entry = self._memory.pop(asset_id, None)
+        if entry is not None:
+            self._memory_bytes -= _memory_size(entry[0])
+
+    def _disk_path(self, asset_id: str) -> Path:
+        return self._disk_dir / asset_id[:2] / asset_id
+
+    def _read_disk(self, asset_id: str) -> tuple[bytes, float] | None:
+        path = self._disk_path(asset_id)
+        try:
+            expires_at = path.stat().st_mtime + self._ttl_seconds
+            if expires_at < time.time():
+                path.unlink()
+                self.evictions += 1
+                return None
+            return path.read_bytes(), expires_at
+        except FileNotFoundError:
+            return None
+
+    def _write_disk(self, asset_id: str, data: bytes) -> None:
+        path = self._disk_path(asset_id)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+
+def _memory_size(prepared: PreparedImage) -> int:
+    width, height = prepared.image.size
+    return width * height * len(prepared.image.getbands()) + len(prepared.data)
+
+
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
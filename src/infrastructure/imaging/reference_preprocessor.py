@@ -0,0 +1,160 @@
+import hashlib
+from collections import OrderedDict
+from io import BytesIO
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from src.domain.exceptions import InvalidImageError
+from src.infrastructure.compute import get_cpu_executor
+from src.infrastructure.imaging.codecs import decode_image
+
+CONTENT_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+
+class PreparedImage:
+    """A reference image after preprocessing: the compact encoding and the decoded image"""
+
+    def __init__(self, data: bytes, content_type: str, image: Image.Image):
+        self.data = data
+        self.content_type = content_type
+        self.image = image
+
+
+class ReferenceImagePreprocessor:
+    """
+    Normalize uploaded reference images before they are sent to the provider.
+
+    Applies EXIF orientation, drops metadata and alpha (unless the output format keeps it),
+    center-crops or pads to the target aspect ratio, downscales to max_edge and re-encodes.
+    Work runs on the shared CPU executor; results are kept in an LRU keyed by the hash of the
+    uploaded bytes.
+    """
+
+    def __init__(
+            self,
+            max_edge: int = 1024,
+            aspect_ratio: str | None = "1:1",
+            fit: str = "crop",
+            output_format: str = "JPEG",
+            quality: int = 90,
+            cache_entries: int = 256
+    ):
+        if fit not in ("crop", "pad"):
+            raise ValueError(f"Unknown fit mode: {fit}")
+        if output_format.upper() not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self._max_edge = max_edge
+        self._aspect_ratio = self._parse_aspect_ratio(aspect_ratio)
+        self._fit = fit
+        self._format = output_format.upper()
+        self._quality = quality
+        self._cache_entries = cache_entries
+        self._cache: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+    async def prepare(self, data: bytes) -> PreparedImage:
+        """Preprocess uploaded bytes; raises InvalidImageError if they are not a readable image"""
+        key = await get_cpu_executor().run(_sha256_hex, data)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            encoded, content_type = cached
+            return PreparedImage(encoded, content_type, await get_cpu_executor().run(decode_image, encoded))
+
+        self.misses += 1
+        encoded, image = await get_cpu_executor().run(
+            preprocess_image, data, self._max_edge, self._aspect_ratio, self._fit, self._format, self._quality
+        )
+        self.bytes_in += len(data)
+        self.bytes_out += len(encoded)
+
+        self._cache[key] = (encoded, CONTENT_TYPES[self._format])
+        while len(self._cache) > self._cache_entries:
+            self._cache.popitem(last=False)
+        return PreparedImage(encoded, CONTENT_TYPES[self._format], image)
+
+    @staticmethod
+    def _parse_aspect_ratio(aspect_ratio: str | None) -> float | None:
+        if not aspect_ratio:
+            return None
+        width, _, height = aspect_ratio.partition(":")
+        return float(width) / float(height)
+
+
+def _sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def preprocess_image(
+        data: bytes,
+        max_edge: int,
+        aspect_ratio: float | None,
+        fit: str,
+        output_format: str,
+        quality: int
+) -> tuple[bytes, Image.Image]:
+    """Decode, normalize and re-encode an upload, returning the new bytes and their decoded image"""
+    try:
+        image = Image.open(BytesIO(data))
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise InvalidImageError("Could not read the uploaded image") from e
+
+    image = _convert_mode(image, output_format)
+    image = _fit_aspect_ratio(image, aspect_ratio, fit)
+    if max(image.size) > max_edge:
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+    # A fresh save carries no EXIF, ICC or text chunks over from the upload
+    buffer = BytesIO()
+    if output_format == "PNG":
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.save(buffer, format=output_format, quality=quality, optimize=True)
+    # The encoded bytes are what the provider receives; the image is kept for its size and for
+    # providers that only take pixels, so decoding the bytes again would be wasted work
+    return buffer.getvalue(), image
+
+
+def _convert_mode(image: Image.Image, output_format: str) -> Image.Image:
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or (image.mode == "P" and "transparency" in image.info)
+    if has_alpha and output_format != "JPEG":
+        return image.convert("RGBA")
+    if has_alpha:
+        # Flatten onto white rather than letting transparent pixels turn black
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _fit_aspect_ratio(image: Image.Image, aspect_ratio: float | None, fit: str) -> Image.Image:
+    if aspect_ratio is None:
+        return image
+
+    width, height = image.size
+    if fit == "crop":
+        target_width = min(width, round(height * aspect_ratio))
+        target_height = min(height, round(width / aspect_ratio))
+        return ImageOps.fit(image, (target_width, target_height), Image.Resampling.LANCZOS)
+
+    target_width = max(width, round(height * aspect_ratio))
+    target_height = max(height, round(width / aspect_ratio))
+    fill = (255, 255, 255, 0) if image.mode == "RGBA" else "white"
+    return ImageOps.pad(image, (target_width, target_height), Image.Resampling.LANCZOS, color=fill)
@@ -0,0 +1,138 @@
+import asyncio
+from collections import OrderedDict
+
+from PIL import features
+
+from src.domain.services.blob_store import BlobStore
+from src.infrastructure.compute import get_cpu_executor
+from src.infrastructure.imaging.codecs import transcode_image
+
+FORMATS = {
+    "avif": ("AVIF", "image/avif"),
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "png": ("PNG", "image/png"),
+}
+
+# Preferred order when the choice comes from the Accept header
+NEGOTIATION_ORDER = ["avif", "webp"]
+
+
+class Renditions:
+    """URLs of the renditions of one generated image"""
+
+    def __init__(self, image: str, thumbnail: str | None):
+        self.image = image
+        self.thumbnail = thumbnail
+
+
+class RenditionService:
+    """
+    Produce re-encoded and thumbnail renditions of generated images held in the blob store.
+
+    Transcoding runs on the shared CPU executor. The mapping from (source key, format, size) to
+    the rendition's own content-addressed key is kept in an LRU, and concurrent requests for the
+    same rendition share one transcode, so each rendition is produced once. Entries whose blob was
+    evicted from the store since are dropped on lookup and the rendition is produced again.
+    """
+
+    def __init__(
+            self,
+            blob_store: BlobStore,
+            default_format: str = "original",
+            quality: int = 80,
+            thumbnail_edge: int = 256,
+            cache_entries: int = 4096
+    ):
+        self._blob_store = blob_store
+        self._default_format = default_format
+        self._quality = quality
+        self._thumbnail_edge = thumbnail_edge
+        self._cache_entries = cache_entries
+        self._keys: OrderedDict[tuple[str, str, int | None], str] = OrderedDict()
+        self._pending: dict[tuple[str, str, int | None], asyncio.Task] = {}
+        self._supported = {name for name, (pil_format, _) in FORMATS.items() if self._pil_supports(pil_format)}
+
+        self.hits = 0
+        self.stale = 0
+        self.produced = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "stale": self.stale, "produced": self.produced, "entries": len(self._keys)}
+
+    def negotiate(self, requested: str | None, accept: str | None) -> str:
+        """Pick the output format: an explicit request wins, then the Accept header, then the default"""
+        if requested:
+            requested = requested.lower()
+            if requested == "original" or requested in self._supported:
+                return requested
+        if accept:
+            accepted = {part.split(";")[0].strip().lower() for part in accept.split(",")}
+            for name in NEGOTIATION_ORDER:
+                if name in self._supported and FORMATS[name][1] in accepted:
+                    return name
+        return self._default_format
+
+    async def render(self, image: str, output_format: str) -> Renditions:
+        """
+        Full-size image in output_format plus a thumbnail. Images that aren't in the blob store
+        (inline data URIs) or fail to transcode are returned unchanged, without a thumbnail.
+        """
+        source_key = self._blob_store.key_from_url(image)
+        if source_key is None:
+            return Renditions(image, None)
+
+        thumbnail_format = "webp" if output_format == "original" and "webp" in self._supported else output_format
+        try:
+            full_key, thumbnail_key = await asyncio.gather(
+                self._rendition(source_key, output_format, None),
+                self._rendition(source_key, thumbnail_format, self._thumbnail_edge)
+            )
+        except Exception as e:
+            print(f"Failed to render {source_key}: {e!s}")
+            return Renditions(image, None)
+        return Renditions(self._blob_store.url_for(full_key), self._blob_store.url_for(thumbnail_key))
+
+    async def _rendition(self, source_key: str, output_format: str, max_edge: int | None) -> str:
+        if output_format == "original" and max_edge is None:
+            return source_key
+
+        cache_key = (source_key, output_format, max_edge)
+        key = self._keys.get(cache_key)
+        if key is not None:
+            if await self._blob_store.exists(key):
+                self._keys.move_to_end(cache_key)
+                self.hits += 1
+                return key
+            self._keys.pop(cache_key, None)
+            self.stale += 1
+
+        task = self._pending.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._produce(source_key, output_format, max_edge))
+            self._pending[cache_key] = task
+            task.add_done_callback(lambda _: self._pending.pop(cache_key, None))
+        key = await asyncio.shield(task)
+
+        self._keys[cache_key] = key
+        while len(self._keys) > self._cache_entries:
+            self._keys.popitem(last=False)
+        return key
+
+    async def _produce(self, source_key: str, output_format: str, max_edge: int | None) -> str:
+        source = await self._blob_store.get(source_key)
+        if source is None:
+            raise KeyError(f"Blob {source_key} not found")
+
+        pil_format, content_type = FORMATS.get(output_format, (None, source.content_type))
+        if pil_format is None:
+            # "original" thumbnail: keep the source format
+            pil_format = source.content_type.split("/")[-1].upper()
+
+        data = await get_cpu_executor().run(transcode_image, source.data, pil_format, max_edge, self._quality)
+        self.produced += 1
+        return await self._blob_store.put(data, content_type)
+
+    @staticmethod
+    def _pil_supports(pil_format: str) -> bool:
+        return pil_format in ("JPEG", "PNG") or bool(features.check(pil_format.lower()))
@@ -0,0 +1,98 @@
+import warnings
+from io import BytesIO
+from typing import Protocol
+
+from PIL import Image, UnidentifiedImageError
+
+from src.domain.exceptions import ImageTooLargeError, InvalidImageError
+
+CHUNK_SIZE = 64 * 1024
+
+
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+
+class ValidatedUpload:
+    """Upload bytes that passed validation, with what the header said about them"""
+
+    def __init__(self, data: bytes, image_format: str, width: int, height: int):
+        self.data = data
+        self.image_format = image_format
+        self.width = width
+        self.height = height
+
+    @property
+    def decoded_bytes(self) -> int:
+        """Rough memory cost of decoding it (4 bytes per pixel)"""
+        return self.width * self.height * 4
+
+
+def sniff_image_format(head: bytes) -> str | None:
+    """Identify the image format from its magic bytes, ignoring whatever the client claimed"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+class UploadValidator:
+    """
+    Read an upload in chunks up to max_bytes and vet it before anything decodes it.
+
+    The format comes from the magic bytes, and dimensions from the header alone (PIL doesn't
+    touch pixel data on open), so oversized, disguised or decompression-bomb uploads are
+    rejected before any pixel memory is allocated.
+    """
+
+    def __init__(self, max_bytes: int, max_pixels: int, max_dimension: int):
+        self._max_bytes = max_bytes
+        self._max_pixels = max_pixels
+        self._max_dimension = max_dimension
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    async def read(self, upload: AsyncReadable, declared_size: int | None = None) -> ValidatedUpload:
+        """Read and validate an upload; raises InvalidImageError or ImageTooLargeError"""
+        if declared_size is not None and declared_size > self._max_bytes:
+            raise self._too_many_bytes()
+
+        buffer = bytearray()
+        while chunk := await upload.read(CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) > self._max_bytes:
+                raise self._too_many_bytes()
+
+        data = bytes(buffer)
+        image_format, width, height = self.check_header(data)
+        return ValidatedUpload(data, image_format, width, height)
+
+    def check_header(self, data: bytes) -> tuple[str, int, int]:
+        """Return the sniffed format and header dimensions, or raise if they are not acceptable"""
+        image_format = sniff_image_format(data[:16])
+        if image_format is None:
+            raise InvalidImageError("Unsupported file type. Please upload a JPEG, PNG or WebP image.")
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                with Image.open(BytesIO(data), formats=[image_format]) as image:
+                    width, height = image.size
+        except Image.DecompressionBombError as e:
+            raise ImageTooLargeError("Image has too many pixels") from e
+        except (UnidentifiedImageError, OSError, SyntaxError) as e:
+            raise InvalidImageError("Could not read the uploaded image") from e
+
+        if max(width, height) > self._max_dimension:
+            raise ImageTooLargeError(f"Image dimensions must be at most {self._max_dimension}px")
+        if width * height > self._max_pixels:
+            raise ImageTooLargeError(f"Image must have at most {self._max_pixels // 1_000_000} megapixels")
+        return image_format, width, height
+
+    def _too_many_bytes(self) -> ImageTooLargeError:
+        return ImageTooLargeError(f"Image must be at most {self._max_bytes // (1024 * 1024)} MB")
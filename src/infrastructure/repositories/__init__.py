@@ -1,4 +1,28 @@
-from src.infrastructure.repositories.transaction_repository import SQLAlchemyTransactionRepository
-from src.infrastructure.repositories.user_repository import SQLAlchemyUserRepository
+from src.infrastructure.repositories.factory import (
+    create_generation_job_repository,
+    create_transaction_repository,
+    create_user_repository,
+)
+from src.infrastructure.repositories.generation_job_repository import (
+    AsyncSQLAlchemyGenerationJobRepository,
+    SQLAlchemyGenerationJobRepository,
+)
+from src.infrastructure.repositories.transaction_repository import (
+    AsyncSQLAlchemyTransactionRepository,
+    SQLAlchemyTransactionRepository,
+)
+from src.infrastructure.repositories.unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.user_repository import AsyncSQLAlchemyUserRepository, SQLAlchemyUserRepository
 
-__all__ = ["SQLAlchemyTransactionRepository", "SQLAlchemyUserRepository"]
+__all__ = [
+    "AsyncSQLAlchemyGenerationJobRepository",
+    "AsyncSQLAlchemyTransactionRepository",
+    "AsyncSQLAlchemyUserRepository",
+    "SQLAlchemyGenerationJobRepository",
+    "SQLAlchemyTransactionRepository",
+    "SQLAlchemyUnitOfWork",
+    "SQLAlchemyUserRepository",
+    "create_generation_job_repository",
+    "create_transaction_repository",
+    "create_user_repository",
+]
@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.infrastructure.repositories.generation_job_repository import (
+    AsyncSQLAlchemyGenerationJobRepository,
+    SQLAlchemyGenerationJobRepository,
+)
+from src.infrastructure.repositories.transaction_repository import (
+    AsyncSQLAlchemyTransactionRepository,
+    SQLAlchemyTransactionRepository,
+)
+from src.infrastructure.repositories.user_repository import AsyncSQLAlchemyUserRepository, SQLAlchemyUserRepository
+
+
+def create_user_repository(session: Session | AsyncSession) -> SQLAlchemyUserRepository:
+    """User repository matching the session type"""
+    if isinstance(session, AsyncSession):
+        return AsyncSQLAlchemyUserRepository(session)
+    return SQLAlchemyUserRepository(session)
+
+
+def create_transaction_repository(session: Session | AsyncSession) -> SQLAlchemyTransactionRepository:
+    """Transaction repository matching the session type"""
+    if isinstance(session, AsyncSession):
+        return AsyncSQLAlchemyTransactionRepository(session)
+    return SQLAlchemyTransactionRepository(session)
+
+
+def create_generation_job_repository(session: Session | AsyncSession) -> SQLAlchemyGenerationJobRepository:
+    """Generation job repository matching the session type"""
+    if isinstance(session, AsyncSession):
+        return AsyncSQLAlchemyGenerationJobRepository(session)
+    return SQLAlchemyGenerationJobRepository(session)
@@ -0,0 +1,183 @@
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, Select, Update, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.domain.entities.generation_job import GenerationJob, JobStatus
+from src.domain.repositories.generation_job_repository import GenerationJobRepository
+from src.domain.value_objects.credits import Credits
+from src.infrastructure.database.models import GenerationJobModel
+
+
+class SQLAlchemyGenerationJobRepository(GenerationJobRepository):
+    """SQLAlchemy implementation of GenerationJobRepository on a sync Session"""
+
+    def __init__(self, session: Session):
+        self._session = session
+
+    async def save(self, job: GenerationJob) -> GenerationJob:
+        """Enqueue a new job"""
+        model = self._to_model(job)
+        self._session.add(model)
+        self._session.flush()
+        return self._to_entity(model)
+
+    async def find_by_id(self, job_id: str) -> GenerationJob | None:
+        """Find job by ID"""
+        model = self._session.execute(
+            select(GenerationJobModel).where(GenerationJobModel.id == job_id)
+        ).scalar_one_or_none()
+        return self._to_entity(model) if model else None
+
+    async def claim_next(self, worker_id: str, lease_seconds: int) -> GenerationJob | None:
+        """Atomically take the oldest queued job (or one whose lease expired) for a worker"""
+        now = datetime.now()
+        candidate_id = self._session.execute(self._candidate_query(now)).scalar_one_or_none()
+        if candidate_id is None:
+            return None
+
+        claimed = self._session.execute(self._claim_statement(candidate_id, worker_id, lease_seconds, now))
+        if claimed.rowcount != 1:
+            return None
+
+        return await self.find_by_id(candidate_id)
+
+    async def complete(self, job: GenerationJob, worker_id: str) -> GenerationJob | None:
+        """Persist the outcome of a job still held by the worker; None if its claim was lost"""
+        completed = self._session.execute(self._complete_statement(job, worker_id))
+        if completed.rowcount != 1:
+            return None
+
+        return await self.find_by_id(job.id)
+
+    @staticmethod
+    def _claimable(now: datetime) -> ColumnElement[bool]:
+        return or_(
+            GenerationJobModel.status == JobStatus.QUEUED.value,
+            (GenerationJobModel.status == JobStatus.RUNNING.value) & (GenerationJobModel.lease_expires_at < now),
+        )
+
+    def _candidate_query(self, now: datetime) -> Select:
+        return (
+            select(GenerationJobModel.id)
+            .where(self._claimable(now))
+            .order_by(GenerationJobModel.created_at)
+            .limit(1)
+        )
+
+    def _claim_statement(self, job_id: str, worker_id: str, lease_seconds: int, now: datetime) -> Update:
+        # The status check is repeated in the UPDATE so two workers can't claim the same row
+        return (
+            update(GenerationJobModel)
+            .where(GenerationJobModel.id == job_id, self._claimable(now))
+            .values(
+                status=JobStatus.RUNNING.value,
+                locked_by=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                attempts=GenerationJobModel.attempts + 1,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _complete_statement(job: GenerationJob, worker_id: str) -> Update:
+        # Only the claim this worker took (the attempt it was handed) may finish the job: once the
+        # lease expires another worker re-claims it, and its completion must not be applied twice
+        return (
+            update(GenerationJobModel)
+            .where(
+                GenerationJobModel.id == job.id,
+                GenerationJobModel.status == JobStatus.RUNNING.value,
+                GenerationJobModel.locked_by == worker_id,
+                GenerationJobModel.attempts == job.attempts,
+            )
+            .values(
+                status=job.status.value,
+                images=json.dumps(job.images) if job.images else None,
+                error=job.error,
+                updated_at=job.updated_at,
+                locked_by=None,
+                lease_expires_at=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _to_entity(self, model: GenerationJobModel) -> GenerationJob:
+        """Convert ORM model to domain entity"""
+        return GenerationJob(
+            id=model.id,
+            user_id=model.user_id,
+            prompt=model.prompt,
+            reference_image=model.reference_image,
+            credits_charged=Credits(model.credits_charged),
+            variations=model.variations,
+            status=JobStatus(model.status),
+            images=json.loads(model.images) if model.images else None,
+            error=model.error,
+            attempts=model.attempts,
+            hold_id=model.hold_id,
+            created_at=model.created_at,
+            updated_at=model.updated_at
+        )
+
+    def _to_model(self, entity: GenerationJob) -> GenerationJobModel:
+        """Convert domain entity to ORM model"""
+        return GenerationJobModel(
+            id=entity.id,
+            user_id=entity.user_id,
+            status=entity.status.value,
+            prompt=entity.prompt,
+            reference_image=entity.reference_image,
+            variations=entity.variations,
+            credits_charged=entity.credits_charged.value,
+            images=json.dumps(entity.images) if entity.images else None,
+            error=entity.error,
+            attempts=entity.attempts,
+            hold_id=entity.hold_id,
+            created_at=entity.created_at,
+            updated_at=entity.updated_at
+        )
+
+
+class AsyncSQLAlchemyGenerationJobRepository(SQLAlchemyGenerationJobRepository):
+    """SQLAlchemy implementation of GenerationJobRepository on an AsyncSession"""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def save(self, job: GenerationJob) -> GenerationJob:
+        """Enqueue a new job"""
+        model = self._to_model(job)
+        self._session.add(model)
+        await self._session.flush()
+        return self._to_entity(model)
+
+    async def find_by_id(self, job_id: str) -> GenerationJob | None:
+        """Find job by ID"""
+        result = await self._session.execute(select(GenerationJobModel).where(GenerationJobModel.id == job_id))
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
+
+    async def claim_next(self, worker_id: str, lease_seconds: int) -> GenerationJob | None:
+        """Atomically take the oldest queued job (or one whose lease expired) for a worker"""
+        now = datetime.now()
+        candidate_id = (await self._session.execute(self._candidate_query(now))).scalar_one_or_none()
+        if candidate_id is None:
+            return None
+
+        claimed = await self._session.execute(self._claim_statement(candidate_id, worker_id, lease_seconds, now))
+        if claimed.rowcount != 1:
+            return None
+
+        return await self.find_by_id(candidate_id)
+
+    async def complete(self, job: GenerationJob, worker_id: str) -> GenerationJob | None:
+        """Persist the outcome of a job still held by the worker; None if its claim was lost"""
+        completed = await self._session.execute(self._complete_statement(job, worker_id))
+        if completed.rowcount != 1:
+            return None
+
+        return await self.find_by_id(job.id)
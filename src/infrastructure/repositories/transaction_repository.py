@@ -1,5 +1,5 @@
-
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.domain.entities.credit_transaction import CreditTransaction, TransactionType
@@ -10,7 +10,7 @@ from src.infrastructure.database.models import TransactionModel
 
 
 class SQLAlchemyTransactionRepository(TransactionRepository):
-    """SQLAlchemy implementation of TransactionRepository"""
+    """SQLAlchemy implementation of TransactionRepository on a sync Session"""
 
     def __init__(self, session: Session):
         self._session = session
@@ -19,49 +19,24 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
         """Save a new transaction"""
         model = self._to_model(transaction)
         self._session.add(model)
-
-        if hasattr(self._session, "flush"):
-            self._session.flush()
-        else:
-            self._session.flush()
-
+        self._session.flush()
         return self._to_entity(model)
 
     async def find_by_user_id(self, user_id: int, limit: int = 50) -> list[CreditTransaction]:
         """Find transactions for a user"""
-        if hasattr(self._session, "execute"):  # Async session
-            result = self._session.execute(
-                select(TransactionModel)
-                .where(TransactionModel.user_id == user_id)
-                .order_by(TransactionModel.created_at.desc())
-                .limit(limit)
-            )
-            models = result.scalars().all()
-        else:  # Sync session
-            models = (
-                self._session.query(TransactionModel)
-                .filter(TransactionModel.user_id == user_id)
-                .order_by(TransactionModel.created_at.desc())
-                .limit(limit)
-                .all()
-            )
-
+        models = self._session.execute(
+            select(TransactionModel)
+            .where(TransactionModel.user_id == user_id)
+            .order_by(TransactionModel.created_at.desc())
+            .limit(limit)
+        ).scalars().all()
         return [self._to_entity(model) for model in models]
 
     async def find_by_payment_id(self, payment_id: str) -> CreditTransaction | None:
         """Find transaction by payment ID"""
-        if hasattr(self._session, "execute"):  # Async session
-            result = self._session.execute(
-                select(TransactionModel).where(TransactionModel.stripe_payment_id == payment_id)
-            )
-            model = result.scalar_one_or_none()
-        else:  # Sync session
-            model = (
-                self._session.query(TransactionModel)
-                .filter(TransactionModel.stripe_payment_id == payment_id)
-                .first()
-            )
-
+        model = self._session.execute(
+            select(TransactionModel).where(TransactionModel.stripe_payment_id == payment_id)
+        ).scalar_one_or_none()
         return self._to_entity(model) if model else None
 
     def _to_entity(self, model: TransactionModel) -> CreditTransaction:
@@ -74,7 +49,8 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
             amount=Money(model.amount) if model.amount else None,
             payment_id=model.stripe_payment_id,
             description=model.description,
-            created_at=model.created_at
+            created_at=model.created_at,
+            hold_id=model.hold_id
         )
 
     def _to_model(self, entity: CreditTransaction) -> TransactionModel:
@@ -87,5 +63,38 @@ class SQLAlchemyTransactionRepository(TransactionRepository):
             credits=entity.credits.value,
             amount=entity.amount.value if entity.amount else None,
             description=entity.description,
+            hold_id=entity.hold_id,
             created_at=entity.created_at
         )
+
+
+class AsyncSQLAlchemyTransactionRepository(SQLAlchemyTransactionRepository):
+    """SQLAlchemy implementation of TransactionRepository on an AsyncSession"""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def save(self, transaction: CreditTransaction) -> CreditTransaction:
+        """Save a new transaction"""
+        model = self._to_model(transaction)
+        self._session.add(model)
+        await self._session.flush()
+        return self._to_entity(model)
+
+    async def find_by_user_id(self, user_id: int, limit: int = 50) -> list[CreditTransaction]:
+        """Find transactions for a user"""
+        result = await self._session.execute(
+            select(TransactionModel)
+            .where(TransactionModel.user_id == user_id)
+            .order_by(TransactionModel.created_at.desc())
+            .limit(limit)
+        )
+        return [self._to_entity(model) for model in result.scalars().all()]
+
+    async def find_by_payment_id(self, payment_id: str) -> CreditTransaction | None:
+        """Find transaction by payment ID"""
+        result = await self._session.execute(
+            select(TransactionModel).where(TransactionModel.stripe_payment_id == payment_id)
+        )
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
@@ -0,0 +1,26 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.domain.repositories.unit_of_work import Repositories, UnitOfWork
+from src.infrastructure.database.connection import DatabaseConnection
+from src.infrastructure.repositories.factory import (
+    create_generation_job_repository,
+    create_transaction_repository,
+    create_user_repository,
+)
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """UnitOfWork opening one session of the database connection per scope"""
+
+    def __init__(self, db: DatabaseConnection):
+        self._db = db
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[Repositories]:
+        async with self._db.get_session() as session:
+            yield Repositories(
+                users=create_user_repository(session),
+                transactions=create_transaction_repository(session),
+                generation_jobs=create_generation_job_repository(session)
+            )
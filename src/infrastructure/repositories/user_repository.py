@@ -1,86 +1,271 @@
+from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import Executable, Update, delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.domain.entities.credit_transaction import CreditTransaction, TransactionType
 from src.domain.entities.user import User
 from src.domain.repositories.user_repository import UserRepository
 from src.domain.value_objects.credits import Credits
 from src.domain.value_objects.email import Email
 from src.domain.value_objects.money import Money
-from src.infrastructure.database.models import UserModel
+from src.infrastructure.database.models import CreditHoldModel, TransactionModel, UserModel
 
 
 class SQLAlchemyUserRepository(UserRepository):
-    """SQLAlchemy implementation of UserRepository"""
+    """SQLAlchemy implementation of UserRepository on a sync Session"""
 
     def __init__(self, session: Session):
         self._session = session
 
     async def find_by_id(self, user_id: int) -> User | None:
         """Find user by ID"""
-        if hasattr(self._session, "execute"):
-            result = self._session.execute(
-                select(UserModel).where(UserModel.id == user_id)
-            )
-            model = result.scalar_one_or_none()
-        else:
-            model = self._session.query(UserModel).filter(UserModel.id == user_id).first()
-
+        model = self._session.execute(select(UserModel).where(UserModel.id == user_id)).scalar_one_or_none()
         return self._to_entity(model) if model else None
 
     async def find_by_email(self, email: Email) -> User | None:
         """Find user by email"""
-        if hasattr(self._session, "execute"):
-            result = self._session.execute(select(UserModel).where(UserModel.email == email.value))
-            model = result.scalar_one_or_none()
-        else:
-            model = self._session.query(UserModel).filter(UserModel.email == email.value).first()
-
+        model = self._session.execute(select(UserModel).where(UserModel.email == email.value)).scalar_one_or_none()
         return self._to_entity(model) if model else None
 
     async def save(self, user: User) -> User:
         """Save a new user"""
         model = self._to_model(user)
         self._session.add(model)
-
-        if hasattr(self._session, "flush"):
-            self._session.flush()
-        else:
-            self._session.flush()
-
+        self._session.flush()
         return self._to_entity(model)
 
     async def update(self, user: User) -> User:
         """Update an existing user"""
-        if hasattr(self._session, "execute"):
-            result = self._session.execute(
-                select(UserModel).where(UserModel.id == user.id)
-            )
-            model = result.scalar_one()
-        else:
-            model = self._session.query(UserModel).filter(UserModel.id == user.id).one()
+        model = self._session.execute(select(UserModel).where(UserModel.id == user.id)).scalar_one()
+        self._apply(model, user)
+        self._session.flush()
+        return self._to_entity(model)
+
+    async def apply_transaction(self, transaction: CreditTransaction) -> Credits | None:
+        """Atomically apply a transaction's credit change and record it; None if it would overdraw"""
+        return self._change_balance(self._transaction_statements(transaction))
+
+    async def hold_credits(self, hold: CreditTransaction) -> Credits | None:
+        """Move a hold's credits out of the available balance; None if it would overdraw"""
+        return self._change_balance(self._hold_statements(hold))
+
+    async def capture_hold(self, capture: CreditTransaction) -> Credits | None:
+        """Spend part or all of a hold and release the rest; None if the hold is gone"""
+        return self._settle_hold(capture)
 
+    async def release_hold(self, release: CreditTransaction) -> Credits | None:
+        """Return a hold's credits to the available balance; None if the hold is gone"""
+        return self._settle_hold(release)
+
+    async def release_expired_holds(self, now: datetime) -> int:
+        """Release every hold that expired by now"""
+        *first, last = self._sweep_statements(now)
+        for statement in first:
+            self._session.execute(statement)
+        return len(self._session.execute(last).all())
+
+    async def find_held_credits(self, user_id: int) -> Credits:
+        """Total credits held for a user"""
+        return Credits(self._session.execute(self._held_query(user_id)).scalar_one())
+
+    async def exists_by_email(self, email: Email) -> bool:
+        """Check if user exists by email"""
+        result = self._session.execute(select(UserModel.id).where(UserModel.email == email.value))
+        return result.scalar_one_or_none() is not None
+
+    @staticmethod
+    def _apply(model: UserModel, user: User) -> None:
+        """
+        Copy the profile fields of the entity onto the ORM model.
+
+        Balances are left alone: they only change through apply_transaction, so a stale entity
+        can't overwrite a concurrent deduction.
+        """
         model.email = user.email.value
-        model.credits = user.credits.value
         model.stripe_customer_id = user.stripe_customer_id
-        model.total_purchased = user.total_purchased.value
         model.updated_at = user.updated_at
 
-        if hasattr(self._session, "flush"):
-            self._session.flush()
-        else:
-            self._session.flush()
+    def _change_balance(self, statements: list[Executable]) -> Credits | None:
+        """Run statements from the builders below: the first returns the new balance, or no row to stop"""
+        first, *rest = statements
+        balance = self._session.execute(first).scalar_one_or_none()
+        if balance is None:
+            return None
+        for statement in rest:
+            self._session.execute(statement)
+        return Credits(balance)
 
-        return self._to_entity(model)
+    def _settle_hold(self, settlement: CreditTransaction) -> Credits | None:
+        if self._is_postgresql():
+            return self._change_balance(self._settle_statements(settlement))
 
-    async def exists_by_email(self, email: Email) -> bool:
-        """Check if user exists by email"""
-        if hasattr(self._session, "execute"):
-            result = self._session.execute(
-                select(UserModel.id).where(UserModel.email == email.value)
+        claimed = self._session.execute(self._claim_hold_statement(settlement)).one_or_none()
+        if claimed is None:
+            return None
+        held, balance = claimed
+        for statement in self._settle_statements(settlement, held):
+            result = self._session.execute(statement)
+            if isinstance(statement, Update):
+                balance = result.scalar_one()
+        return Credits(balance)
+
+    def _is_postgresql(self) -> bool:
+        return self._session.get_bind().dialect.name == "postgresql"
+
+    def _transaction_statements(self, transaction: CreditTransaction) -> list[Executable]:
+        """
+        Statements applying a transaction: the first returns the new balance (no row if it would
+        overdraw), the rest record the transaction.
+
+        On PostgreSQL the insert rides along in a data-modifying CTE, so it is a single round trip;
+        elsewhere it is a conditional UPDATE ... RETURNING followed by the INSERT.
+        """
+        delta = transaction.credits.value
+        values = {"credits": UserModel.credits + delta, "updated_at": datetime.now()}
+        if transaction.amount is not None:
+            values["total_purchased"] = UserModel.total_purchased + transaction.amount.value
+
+        change = update(UserModel).where(UserModel.id == transaction.user_id)
+        if delta < 0:
+            change = change.where(UserModel.credits >= -delta)
+        change = change.values(values).returning(UserModel.credits)
+
+        return self._change_and_record(change, TransactionModel, self._transaction_row(transaction))
+
+    def _hold_statements(self, hold: CreditTransaction) -> list[Executable]:
+        """Statements taking a hold's credits out of the balance and recording the hold"""
+        held = -hold.credits.value
+        change = (
+            update(UserModel)
+            .where(UserModel.id == hold.user_id, UserModel.credits >= held)
+            .values(credits=UserModel.credits - held, updated_at=datetime.now())
+            .returning(UserModel.credits)
+        )
+        return self._change_and_record(change, CreditHoldModel, {
+            "id": hold.hold_id,
+            "user_id": hold.user_id,
+            "credits": held,
+            "description": hold.description,
+            "expires_at": hold.expires_at,
+            "created_at": hold.created_at,
+        })
+
+    @staticmethod
+    def _claim_hold_statement(settlement: CreditTransaction) -> Executable:
+        """Delete the hold, returning its credits and the balance; no row if the hold is gone"""
+        balance = select(UserModel.credits).where(UserModel.id == CreditHoldModel.user_id)
+        return (
+            delete(CreditHoldModel)
+            .where(CreditHoldModel.id == settlement.hold_id)
+            .returning(CreditHoldModel.credits, balance.correlate(CreditHoldModel).scalar_subquery())
+        )
+
+    def _settle_statements(self, settlement: CreditTransaction, held: int | None = None) -> list[Executable]:
+        """
+        Statements settling a hold: the captured credits are recorded in the ledger and the rest of
+        the hold goes back to the available balance.
+
+        On PostgreSQL the hold is deleted in a CTE that the balance update joins, so settling is a
+        single statement returning the new balance, or no row if the hold is gone. Elsewhere the
+        hold was already claimed by _claim_hold_statement (only one settlement can delete it) and
+        these credit back what was held but not captured (the UPDATE returns the new balance),
+        then record the capture. A full capture leaves the balance alone, so it is just the ledger insert.
+        """
+        captured = -settlement.credits.value if settlement.transaction_type == TransactionType.CAPTURE else 0
+        record = self._transaction_row(settlement) if captured else None
+
+        if held is not None:
+            statements = []
+            if held > captured:
+                statements.append(
+                    update(UserModel)
+                    .where(UserModel.id == settlement.user_id)
+                    .values(credits=UserModel.credits + held - captured, updated_at=datetime.now())
+                    .returning(UserModel.credits)
+                )
+            if record:
+                statements.append(insert(TransactionModel).values(record))
+            return statements
+
+        hold = CreditHoldModel.id == settlement.hold_id
+        settled = delete(CreditHoldModel).where(hold).returning(CreditHoldModel.user_id, CreditHoldModel.credits)
+        settled = settled.cte("settled")
+        change = (
+            update(UserModel)
+            .where(UserModel.id == settled.c.user_id)
+            .values(credits=UserModel.credits + settled.c.credits - captured, updated_at=datetime.now())
+            .returning(UserModel.credits)
+        )
+        return self._change_and_record(change, TransactionModel, record)
+
+    def _sweep_statements(self, now: datetime) -> list[Executable]:
+        """
+        Statements releasing every hold expired by now; the last returns one row per hold released.
+
+        On PostgreSQL the holds are deleted in a CTE and their totals credited back per user in the
+        same statement; elsewhere the balances are credited first, then the holds deleted.
+        """
+        expired = CreditHoldModel.expires_at <= now
+
+        if not self._is_postgresql():
+            released = select(func.sum(CreditHoldModel.credits)).where(
+                CreditHoldModel.user_id == UserModel.id, expired
+            ).scalar_subquery()
+            credit = (
+                update(UserModel)
+                .where(UserModel.id.in_(select(CreditHoldModel.user_id).where(expired)))
+                .values(credits=UserModel.credits + released, updated_at=now)
             )
-            return result.scalar_one_or_none() is not None
-        return self._session.query(UserModel.id).filter(UserModel.email == email.value).first() is not None
+            return [credit, delete(CreditHoldModel).where(expired).returning(CreditHoldModel.id)]
+
+        swept = delete(CreditHoldModel).where(expired).returning(
+            CreditHoldModel.id, CreditHoldModel.user_id, CreditHoldModel.credits
+        ).cte("swept")
+        totals = select(
+            swept.c.user_id, func.sum(swept.c.credits).label("credits")
+        ).group_by(swept.c.user_id).cte("totals")
+        credited = (
+            update(UserModel)
+            .where(UserModel.id == totals.c.user_id)
+            .values(credits=UserModel.credits + totals.c.credits, updated_at=now)
+            .returning(UserModel.id)
+            .cte("credited")
+        )
+        return [select(swept.c.id).add_cte(credited)]
+
+    @staticmethod
+    def _held_query(user_id: int) -> Executable:
+        return select(func.coalesce(func.sum(CreditHoldModel.credits), 0)).where(CreditHoldModel.user_id == user_id)
+
+    def _change_and_record(self, change: Update, model: type, record: dict | None) -> list[Executable]:
+        """A balance change returning the new balance, followed by the insert of record (if any) into model"""
+        if record is None:
+            return [change]
+        if not self._is_postgresql():
+            return [change, insert(model).values(record)]
+
+        changed = change.cte("changed")
+        columns = model.__table__.c
+        recorded = insert(model).from_select(
+            list(record),
+            select(*(literal(value, columns[name].type) for name, value in record.items())).select_from(changed)
+        ).cte("recorded")
+        return [select(changed.c.credits).add_cte(recorded)]
+
+    @staticmethod
+    def _transaction_row(transaction: CreditTransaction) -> dict:
+        return {
+            "user_id": transaction.user_id,
+            "stripe_payment_id": transaction.payment_id,
+            "type": transaction.transaction_type.value,
+            "credits": transaction.credits.value,
+            "amount": transaction.amount.value if transaction.amount else None,
+            "description": transaction.description,
+            "hold_id": transaction.hold_id,
+            "created_at": transaction.created_at,
+        }
 
     def _to_entity(self, model: UserModel) -> User:
         """Convert ORM model to domain entity"""
@@ -105,3 +290,92 @@ class SQLAlchemyUserRepository(UserRepository):
             created_at=entity.created_at,
             updated_at=entity.updated_at
         )
+
+
+class AsyncSQLAlchemyUserRepository(SQLAlchemyUserRepository):
+    """SQLAlchemy implementation of UserRepository on an AsyncSession"""
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def find_by_id(self, user_id: int) -> User | None:
+        """Find user by ID"""
+        result = await self._session.execute(select(UserModel).where(UserModel.id == user_id))
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
+
+    async def find_by_email(self, email: Email) -> User | None:
+        """Find user by email"""
+        result = await self._session.execute(select(UserModel).where(UserModel.email == email.value))
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
+
+    async def save(self, user: User) -> User:
+        """Save a new user"""
+        model = self._to_model(user)
+        self._session.add(model)
+        await self._session.flush()
+        return self._to_entity(model)
+
+    async def update(self, user: User) -> User:
+        """Update an existing user"""
+        result = await self._session.execute(select(UserModel).where(UserModel.id == user.id))
+        model = result.scalar_one()
+        self._apply(model, user)
+        await self._session.flush()
+        return self._to_entity(model)
+
+    async def apply_transaction(self, transaction: CreditTransaction) -> Credits | None:
+        """Atomically apply a transaction's credit change and record it; None if it would overdraw"""
+        return await self._change_balance(self._transaction_statements(transaction))
+
+    async def hold_credits(self, hold: CreditTransaction) -> Credits | None:
+        """Move a hold's credits out of the available balance; None if it would overdraw"""
+        return await self._change_balance(self._hold_statements(hold))
+
+    async def capture_hold(self, capture: CreditTransaction) -> Credits | None:
+        """Spend part or all of a hold and release the rest; None if the hold is gone"""
+        return await self._settle_hold(capture)
+
+    async def release_hold(self, release: CreditTransaction) -> Credits | None:
+        """Return a hold's credits to the available balance; None if the hold is gone"""
+        return await self._settle_hold(release)
+
+    async def release_expired_holds(self, now: datetime) -> int:
+        """Release every hold that expired by now"""
+        *first, last = self._sweep_statements(now)
+        for statement in first:
+            await self._session.execute(statement)
+        return len((await self._session.execute(last)).all())
+
+    async def find_held_credits(self, user_id: int) -> Credits:
+        """Total credits held for a user"""
+        return Credits((await self._session.execute(self._held_query(user_id))).scalar_one())
+
+    async def exists_by_email(self, email: Email) -> bool:
+        """Check if user exists by email"""
+        result = await self._session.execute(select(UserModel.id).where(UserModel.email == email.value))
+        return result.scalar_one_or_none() is not None
+
+    async def _change_balance(self, statements: list[Executable]) -> Credits | None:
+        first, *rest = statements
+        balance = (await self._session.execute(first)).scalar_one_or_none()
+        if balance is None:
+            return None
+        for statement in rest:
+            await self._session.execute(statement)
+        return Credits(balance)
+
+    async def _settle_hold(self, settlement: CreditTransaction) -> Credits | None:
+        if self._is_postgresql():
+            return await self._change_balance(self._settle_statements(settlement))
+
+        claimed = (await self._session.execute(self._claim_hold_statement(settlement))).one_or_none()
+        if claimed is None:
+            return None
+        held, balance = claimed
+        for statement in self._settle_statements(settlement, held):
+            result = await self._session.execute(statement)
+            if isinstance(statement, Update):
+                balance = result.scalar_one()
+        return Credits(balance)
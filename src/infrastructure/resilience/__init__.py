@@ -0,0 +1,21 @@
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker, CircuitState
+from src.infrastructure.resilience.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitedImageGenerator,
+)
+from src.infrastructure.resilience.memory_budget import MemoryBudget, get_memory_budget, initialize_memory_budget
+from src.infrastructure.resilience.resilient_image_generator import ResilientImageGenerator
+from src.infrastructure.resilience.retry import RetryBudget, backoff_delay
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "CircuitState",
+    "ConcurrencyLimitedImageGenerator",
+    "MemoryBudget",
+    "ResilientImageGenerator",
+    "RetryBudget",
+    "backoff_delay",
+    "get_memory_budget",
+    "initialize_memory_budget",
+]
@@ -0,0 +1,86 @@
+import time
+from enum import Enum
+
+from src.domain.exceptions import ImageGenerationError
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After failure_threshold failures in a row the circuit opens and calls fail fast until
+    reset_timeout has passed. It then lets half_open_max_calls probes through: one success closes
+    it again, one failure re-opens it.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0,
+            half_open_max_calls: int = 1
+    ):
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+    def before_call(self) -> None:
+        """Raise ImageGenerationError instead of calling a provider that is known to be unhealthy"""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        if state is CircuitState.HALF_OPEN and self._probes < self._half_open_max_calls:
+            self._probes += 1
+            return
+
+        self.rejected += 1
+        retry_in = max(0.0, self._reset_timeout - (time.monotonic() - self._opened_at))
+        raise ImageGenerationError(f"{self._name} is unavailable, retry in {retry_in:.0f}s")
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state is CircuitState.HALF_OPEN or self._failures >= self._failure_threshold:
+            if self._state is not CircuitState.OPEN:
+                self.times_opened += 1
+                print(f"[CIRCUIT] {self._name} opened after {self._failures} consecutive failures")
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def record_ignored(self) -> None:
+        """Give back a half-open probe whose outcome says nothing about the provider's health"""
+        if self._state is CircuitState.HALF_OPEN and self._probes > 0:
+            self._probes -= 1
@@ -0,0 +1,185 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from src.domain.exceptions import ServiceOverloadedError
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+
+OVERLOAD_STATUS_CODES = {429, 503, 504}
+
+
+def is_overload_error(error: Exception) -> bool:
+    """Whether an error signals that the provider is saturated (throttling, unavailable, timeout)"""
+    if isinstance(error, TimeoutError | ServiceOverloadedError):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code in OVERLOAD_STATUS_CODES
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit driven by observed latency and errors.
+
+    The limit grows by one per limit's worth of fast successful calls and is cut multiplicatively
+    when a call fails with an overload error or is slower than latency_tolerance times the baseline
+    (the fastest call seen in the previous sampling window). Callers over the limit wait in a
+    bounded FIFO queue and are shed with ServiceOverloadedError when it is full or they time out.
+    """
+
+    BASELINE_WINDOW = 100
+    ERROR_BACKOFF = 0.5
+    LATENCY_BACKOFF = 0.9
+
+    def __init__(
+            self,
+            initial_limit: int = 8,
+            min_limit: int = 1,
+            max_limit: int = 32,
+            latency_tolerance: float = 2.0,
+            max_queue: int = 64,
+            queue_timeout: float = 30.0,
+            is_overload: Callable[[Exception], bool] = is_overload_error
+    ):
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_tolerance = latency_tolerance
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._is_overload = is_overload
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._baseline: float | None = None
+        self._window_min = float("inf")
+        self._window_samples = 0
+        self._last_decrease = 0.0
+
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "baseline_latency_ms": round((self._baseline or 0.0) * 1000, 1),
+        }
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one unit of concurrency for the duration of a provider call"""
+        await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.release(time.monotonic() - started, e)
+            raise
+        except BaseException:
+            # Cancelled: free the slot without treating it as a signal
+            self.release(None, None)
+            raise
+        self.release(time.monotonic() - started, None)
+
+    async def acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        if len(self._waiters) >= self._max_queue:
+            self.rejected += 1
+            raise ServiceOverloadedError("Provider concurrency limit reached, try again shortly")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self._queue_timeout)
+        except TimeoutError:
+            self.timed_out += 1
+            raise ServiceOverloadedError(
+                f"Waited more than {self._queue_timeout:.0f}s for provider capacity"
+            ) from None
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted right as we were cancelled: hand it on
+                self.release(None, None)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, latency: float | None, error: Exception | None) -> None:
+        self._in_flight -= 1
+
+        if error is not None:
+            if self._is_overload(error):
+                self._decrease(self.ERROR_BACKOFF)
+        elif latency is not None:
+            self._observe_latency(latency)
+
+        self._wake_waiters()
+
+    def _observe_latency(self, latency: float) -> None:
+        self._window_min = min(self._window_min, latency)
+        self._window_samples += 1
+        if self._baseline is None or self._window_samples >= self.BASELINE_WINDOW:
+            self._baseline = self._window_min
+            self._window_min = float("inf")
+            self._window_samples = 0
+
+        if latency > self._baseline * self._latency_tolerance:
+            self._decrease(self.LATENCY_BACKOFF)
+        else:
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+    def _decrease(self, factor: float) -> None:
+        # One decrease per baseline latency, so a burst of failures from the same moment counts once
+        now = time.monotonic()
+        if now - self._last_decrease < (self._baseline or 0.0):
+            return
+        self._last_decrease = now
+        self._limit = max(self._min_limit, self._limit * factor)
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+
+class ConcurrencyLimitedImageGenerator(ImageGenerator):
+    """ImageGenerator decorator that runs every provider call under an AdaptiveConcurrencyLimiter"""
+
+    def __init__(self, inner: ImageGenerator, limiter: AdaptiveConcurrencyLimiter):
+        self._inner = inner
+        self._limiter = limiter
+        self.max_concurrent_variations = inner.max_concurrent_variations
+
+    @property
+    def limiter(self) -> AdaptiveConcurrencyLimiter:
+        return self._limiter
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        async with self._limiter.slot():
+            return await self._inner.generate_variation(request, index)
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
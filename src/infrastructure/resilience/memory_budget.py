@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from src.domain.exceptions import ServiceOverloadedError
+
+
+class MemoryBudget:
+    """
+    Process-wide byte semaphore for large in-flight buffers (uploads, decoded images, provider responses).
+
+    Callers reserve an estimated cost before allocating and release it when the buffers are dropped.
+    Reservations are granted in FIFO order; a caller that can't get its bytes within wait_timeout is
+    shed with ServiceOverloadedError. A single reservation larger than the whole budget is clamped,
+    so it runs alone instead of never running.
+    """
+
+    def __init__(self, max_bytes: int, wait_timeout: float = 10.0):
+        self._max_bytes = max_bytes
+        self._wait_timeout = wait_timeout
+        self._in_use = 0
+        self._waiters: deque[tuple[int, asyncio.Future]] = deque()
+
+        self.peak = 0
+        self.acquired = 0
+        self.shed = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "capacity_bytes": self._max_bytes,
+            "in_use_bytes": self._in_use,
+            "peak_bytes": self.peak,
+            "waiting": len(self._waiters),
+            "acquired": self.acquired,
+            "shed": self.shed,
+            "wait_time_avg_ms": round(self.wait_time_total / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "wait_time_max_ms": round(self.wait_time_max * 1000, 2),
+        }
+
+    @asynccontextmanager
+    async def reserve(self, size: int) -> AsyncIterator[None]:
+        """Hold size bytes of the budget for the duration of the block"""
+        size = await self.acquire(size)
+        try:
+            yield
+        finally:
+            self.release(size)
+
+    async def acquire(self, size: int) -> int:
+        """Wait for size bytes and return the amount actually reserved (pass it to release)"""
+        size = min(max(0, size), self._max_bytes)
+        started = time.monotonic()
+
+        if not self._waiters and self._in_use + size <= self._max_bytes:
+            self._grant(size)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((size, waiter))
+            try:
+                await asyncio.wait_for(waiter, self._wait_timeout)
+            except TimeoutError:
+                self.shed += 1
+                raise ServiceOverloadedError("Server is busy processing images, try again shortly") from None
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release(size)
+                raise
+            finally:
+                self._remove_waiter(waiter)
+                # A shed or cancelled head of the queue may have been blocking smaller requests
+                self._wake_waiters()
+
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+        return size
+
+    def release(self, size: int) -> None:
+        self._in_use -= size
+        self._wake_waiters()
+
+    def _grant(self, size: int) -> None:
+        self._in_use += size
+        self.peak = max(self.peak, self._in_use)
+
+    def _wake_waiters(self) -> None:
+        while self._waiters:
+            size, waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            if self._in_use + size > self._max_bytes:
+                return
+            self._waiters.popleft()
+            self._grant(size)
+            waiter.set_result(None)
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        for entry in self._waiters:
+            if entry[1] is waiter:
+                self._waiters.remove(entry)
+                return
+
+
+_memory_budget: MemoryBudget | None = None
+
+
+def initialize_memory_budget(max_bytes: int, wait_timeout: float = 10.0) -> MemoryBudget:
+    """Create the process-wide memory budget"""
+    global _memory_budget
+    _memory_budget = MemoryBudget(max_bytes, wait_timeout)
+    return _memory_budget
+
+
+def get_memory_budget() -> MemoryBudget:
+    """Get the process-wide memory budget, falling back to a 1 GiB budget"""
+    global _memory_budget
+    if _memory_budget is None:
+        _memory_budget = MemoryBudget(1024 * 1024 * 1024)
+    return _memory_budget
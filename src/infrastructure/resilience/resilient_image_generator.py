@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+
+from src.domain.exceptions import DomainException, ServiceOverloadedError
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from src.infrastructure.resilience.retry import RetryBudget, backoff_delay
+
+# Client errors that will fail the same way however often they are retried
+NON_RETRYABLE_STATUS_CODES = {400, 401, 403, 404, 422}
+
+# Statuses below 500 that say the provider may answer next time: a request timeout, a rate limit
+TRANSIENT_STATUS_CODES = {408, 429}
+
+
+def _status_code(error: Exception) -> int | None:
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether an error may pass on its own: a timeout, a dropped connection, a 408, 429 or 5xx.
+
+    Everything else, a missing API key or a response without an image among them, fails the
+    same way on every attempt, so it fails fast instead of spending the retry budget.
+    """
+    if isinstance(error, ServiceOverloadedError):
+        return False
+    if isinstance(error, (TimeoutError, httpx.TransportError)):
+        return True
+    status = _status_code(error)
+    return status is not None and (status in TRANSIENT_STATUS_CODES or status >= 500)
+
+
+def is_provider_failure(error: Exception) -> bool:
+    """Whether an error says the provider is unhealthy, as opposed to rejecting this one request"""
+    if isinstance(error, DomainException):
+        return False
+    return _status_code(error) not in NON_RETRYABLE_STATUS_CODES
+
+
+class ResilientImageGenerator(ImageGenerator):
+    """
+    ImageGenerator decorator that retries each variation with jittered exponential backoff,
+    spending from a process-wide retry budget, behind a circuit breaker.
+    """
+
+    def __init__(
+            self,
+            inner: ImageGenerator,
+            circuit_breaker: CircuitBreaker,
+            retry_budget: RetryBudget,
+            max_retries: int = 2,
+            base_delay: float = 0.5,
+            max_delay: float = 8.0
+    ):
+        self._inner = inner
+        self._circuit_breaker = circuit_breaker
+        self._retry_budget = retry_budget
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.max_concurrent_variations = inner.max_concurrent_variations
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        self._retry_budget.record_call()
+        attempt = 0
+
+        while True:
+            self._circuit_breaker.before_call()
+            try:
+                image = await self._inner.generate_variation(request, index)
+            except Exception as e:
+                if is_provider_failure(e):
+                    self._circuit_breaker.record_failure()
+                else:
+                    self._circuit_breaker.record_ignored()
+
+                if (
+                        attempt >= self._max_retries
+                        or not is_retryable(e)
+                        or not self._retry_budget.try_acquire_retry()
+                ):
+                    raise
+
+                delay = backoff_delay(attempt, self._base_delay, self._max_delay)
+                print(f"Variation {index + 1} attempt {attempt + 1} failed: {e}; retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self._circuit_breaker.record_ignored()
+                raise
+
+            self._circuit_breaker.record_success()
+            return image
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
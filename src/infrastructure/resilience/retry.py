@@ -0,0 +1,54 @@
+import random
+import time
+from collections import deque
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(max_delay, base_delay * 2**attempt)]"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class RetryBudget:
+    """
+    Process-wide cap on retries as a fraction of calls over a sliding window.
+
+    Retries are allowed while they stay under ratio * calls in the window, with a floor of
+    min_per_second so a quiet process can still retry. During an outage this keeps retries from
+    multiplying outbound traffic.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_per_second: float = 1.0, window_seconds: float = 10.0):
+        self._ratio = ratio
+        self._min_retries = min_per_second * window_seconds
+        self._window = window_seconds
+        self._calls: deque[float] = deque()
+        self._retries: deque[float] = deque()
+
+        self.exhausted = 0
+
+    def stats(self) -> dict[str, int]:
+        self._expire(time.monotonic())
+        return {
+            "calls_in_window": len(self._calls),
+            "retries_in_window": len(self._retries),
+            "exhausted": self.exhausted,
+        }
+
+    def record_call(self) -> None:
+        self._calls.append(time.monotonic())
+
+    def try_acquire_retry(self) -> bool:
+        """Spend one retry from the budget, or return False if it is used up"""
+        now = time.monotonic()
+        self._expire(now)
+        if len(self._retries) >= max(self._min_retries, self._ratio * len(self._calls)):
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self._window
+        for timestamps in (self._calls, self._retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
@@ -0,0 +1,4 @@
+from src.infrastructure.storage.local_blob_store import LocalBlobStore
+from src.infrastructure.storage.memory_blob_store import InMemoryBlobStore
+
+__all__ = ["InMemoryBlobStore", "LocalBlobStore"]
@@ -0,0 +1,26 @@
+import hashlib
+import mimetypes
+import re
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+
+_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/avif": "avif",
+}
+
+
+def content_key(data: bytes, content_type: str) -> str:
+    """Key of a blob: the SHA-256 of its bytes plus an extension that carries the content type"""
+    extension = _EXTENSIONS.get(content_type) or (mimetypes.guess_extension(content_type) or ".bin").lstrip(".")
+    return f"{hashlib.sha256(data).hexdigest()}.{extension}"
+
+
+def content_type_of(key: str) -> str:
+    return mimetypes.guess_type(f"blob.{key.rsplit('.', 1)[-1]}")[0] or "application/octet-stream"
+
+
+def is_valid_key(key: str) -> bool:
+    return bool(KEY_PATTERN.match(key))
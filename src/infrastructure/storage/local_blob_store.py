@@ -0,0 +1,51 @@
+import asyncio
+import os
+from pathlib import Path
+
+from src.domain.services.blob_store import Blob, BlobStore
+from src.infrastructure.storage.content_addressing import content_key, content_type_of, is_valid_key
+
+
+class LocalBlobStore(BlobStore):
+    """Filesystem implementation of BlobStore, shareable between API and worker processes"""
+
+    def __init__(self, root_dir: str, public_base_url: str):
+        self._root = Path(root_dir)
+        self._public_base_url = public_base_url.rstrip("/")
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    async def put(self, data: bytes, content_type: str) -> str:
+        key = content_key(data, content_type)
+        await asyncio.to_thread(self._write, key, data)
+        return key
+
+    async def get(self, key: str) -> Blob | None:
+        if not is_valid_key(key):
+            return None
+        data = await asyncio.to_thread(self._read, key)
+        return Blob(key, data, content_type_of(key)) if data is not None else None
+
+    async def exists(self, key: str) -> bool:
+        return is_valid_key(key) and await asyncio.to_thread(self._path(key).exists)
+
+    def url_for(self, key: str) -> str:
+        return f"{self._public_base_url}/{key}"
+
+    def _path(self, key: str) -> Path:
+        return self._root / key[:2] / key
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if path.exists():
+            # Same key means same bytes
+            return
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def _read(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
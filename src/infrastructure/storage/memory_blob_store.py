@@ -0,0 +1,40 @@
+from collections import OrderedDict
+
+from src.domain.services.blob_store import Blob, BlobStore
+from src.infrastructure.storage.content_addressing import content_key, content_type_of
+
+
+class InMemoryBlobStore(BlobStore):
+    """In-process implementation of BlobStore, evicting least recently used blobs over a byte budget"""
+
+    def __init__(self, public_base_url: str, max_bytes: int = 256 * 1024 * 1024):
+        self._public_base_url = public_base_url.rstrip("/")
+        self._max_bytes = max_bytes
+        self._blobs: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+
+    async def put(self, data: bytes, content_type: str) -> str:
+        key = content_key(data, content_type)
+        if key in self._blobs:
+            self._blobs.move_to_end(key)
+            return key
+
+        self._blobs[key] = data
+        self._size += len(data)
+        while self._size > self._max_bytes and len(self._blobs) > 1:
+            _, evicted = self._blobs.popitem(last=False)
+            self._size -= len(evicted)
+        return key
+
+    async def get(self, key: str) -> Blob | None:
+        data = self._blobs.get(key)
+        if data is None:
+            return None
+        self._blobs.move_to_end(key)
+        return Blob(key, data, content_type_of(key))
+
+    async def exists(self, key: str) -> bool:
+        return key in self._blobs
+
+    def url_for(self, key: str) -> str:
+        return f"{self._public_base_url}/{key}"
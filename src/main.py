@@ -1,15 +1,55 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.application.use_cases.release_expired_holds import (
+    ReleaseExpiredHoldsRequest,
+    ReleaseExpiredHoldsUseCase,
+)
+from src.infrastructure.compute import initialize_cpu_executor, shutdown_cpu_executor
 from src.infrastructure.database.connection import initialize_database
-from src.presentation.api.routes import credits, feedback, health, image_generation, payments, webhooks
+from src.infrastructure.external_services.registry import (
+    close_image_generator,
+    close_payment_gateway,
+    initialize_blob_store,
+    initialize_image_generator,
+    initialize_payment_gateway,
+    initialize_reference_assets,
+    initialize_reference_preprocessor,
+    initialize_rendition_service,
+)
+from src.infrastructure.repositories import SQLAlchemyUnitOfWork
+from src.infrastructure.resilience import initialize_memory_budget
+from src.presentation.api.middleware import RequestSizeLimitMiddleware
+from src.presentation.api.routes import (
+    credits,
+    feedback,
+    health,
+    image_generation,
+    images,
+    internal,
+    payments,
+    webhooks,
+)
 from src.infrastructure.config.settings import get_settings, initialize_settings
 
 
 
+async def sweep_expired_holds(use_case: ReleaseExpiredHoldsUseCase, interval: float) -> None:
+    """Periodically return credits held by generations that never settled"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await use_case.execute(ReleaseExpiredHoldsRequest())
+            if result.is_success() and result.value.released:
+                print(f"Released {result.value.released} expired credit holds")
+        except Exception as e:
+            print(f"Failed to release expired credit holds: {e!s}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -21,14 +61,48 @@ async def lifespan(app: FastAPI):
     print(f"Environment: {settings.environment}")
 
     # Initialize database
-    db = initialize_database(settings.database_url)
+    db = initialize_database(
+        settings.database_url,
+        pool=settings.database_pool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_pool_max_overflow,
+        pool_timeout=settings.database_pool_timeout_seconds,
+        pool_recycle=settings.database_pool_recycle_seconds,
+        pool_pre_ping=settings.database_pool_pre_ping
+    )
     await db.create_tables()
     print("Database initialized")
 
+    # Initialize long-lived provider clients
+    initialize_cpu_executor(
+        settings.cpu_executor_kind,
+        settings.cpu_executor_max_workers,
+        settings.cpu_executor_max_concurrency
+    )
+    initialize_memory_budget(settings.memory_budget_bytes, settings.memory_budget_wait_timeout_seconds)
+    initialize_blob_store(settings)
+    initialize_rendition_service(settings)
+    initialize_reference_preprocessor(settings)
+    initialize_reference_assets(settings)
+    initialize_image_generator(settings)
+    initialize_payment_gateway(settings)
+    print("Provider clients initialized")
+
+    sweeper = asyncio.create_task(sweep_expired_holds(
+        ReleaseExpiredHoldsUseCase(SQLAlchemyUnitOfWork(db)),
+        settings.credit_hold_sweep_interval_seconds
+    ))
+
     yield
 
     # Shutdown
     print("Shutting down...")
+    sweeper.cancel()
+    with suppress(asyncio.CancelledError):
+        await sweeper
+    await close_image_generator()
+    await close_payment_gateway()
+    shutdown_cpu_executor()
 
 
 def create_application() -> FastAPI:
@@ -51,6 +125,9 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Refuse oversized bodies before the multipart parser spools them (room left for the form fields)
+    app.add_middleware(RequestSizeLimitMiddleware, max_body_bytes=settings.max_upload_bytes + 1024 * 1024)
+
     # Register routes
     app.include_router(health.router)
     app.include_router(feedback.router)
@@ -58,6 +135,8 @@ def create_application() -> FastAPI:
     app.include_router(payments.router)
     app.include_router(webhooks.router)
     app.include_router(image_generation.router)
+    app.include_router(images.router)
+    app.include_router(internal.router)
 
     return app
 
@@ -1,22 +1,55 @@
 from collections.abc import AsyncGenerator
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.application.use_cases.complete_payment import CompletePaymentUseCase
 from src.application.use_cases.generate_image import GenerateImageUseCase
+from src.application.use_cases.generate_image_batch import GenerateImageBatchUseCase
+from src.application.use_cases.get_generation_job import GetGenerationJobUseCase
 from src.application.use_cases.get_user_credits import GetUserCreditsUseCase
 from src.application.use_cases.purchase_credits import PurchaseCreditsUseCase
 from src.application.use_cases.submit_feedback import SubmitFeedbackUseCase
+from src.application.use_cases.submit_generation_job import SubmitGenerationJobUseCase
+from src.domain.repositories.unit_of_work import UnitOfWork
+from src.domain.services.blob_store import BlobStore
+from src.domain.services.image_generator import ImageGenerator
+from src.domain.services.payment_gateway import PaymentGateway
 from src.infrastructure.config.settings import Settings, get_settings
 from src.infrastructure.database.connection import get_database
-from src.infrastructure.external_services.gemini_image_generator import GeminiImageGenerator
-from src.infrastructure.external_services.stripe_payment_gateway import StripePaymentGateway
-from src.infrastructure.repositories import SQLAlchemyTransactionRepository, SQLAlchemyUserRepository
-
-
-async def get_db_session() -> AsyncGenerator[Session, None]:
-    """Get database session"""
+from src.infrastructure.external_services.registry import (
+    get_blob_store_instance,
+    get_image_generator_instance,
+    get_payment_gateway_instance,
+    get_reference_assets_instance,
+    get_reference_preprocessor_instance,
+    get_rendition_service_instance,
+)
+from src.infrastructure.imaging import (
+    ReferenceAssetStore,
+    ReferenceImagePreprocessor,
+    RenditionService,
+    UploadValidator,
+)
+from src.infrastructure.repositories import (
+    SQLAlchemyGenerationJobRepository,
+    SQLAlchemyTransactionRepository,
+    SQLAlchemyUnitOfWork,
+    SQLAlchemyUserRepository,
+    create_generation_job_repository,
+    create_transaction_repository,
+    create_user_repository,
+)
+
+
+async def get_db_session() -> AsyncGenerator[Session | AsyncSession, None]:
+    """
+    Get a request-scoped database session (an AsyncSession for async database URLs).
+
+    The session only checks out a connection on its first query, so routes that never query
+    don't take one from the pool. Use cases that call slow services take get_unit_of_work instead.
+    """
     db = get_database()
     async with db.get_session() as session:
         yield session
@@ -27,52 +60,119 @@ def get_app_settings() -> Settings:
     return get_settings()
 
 
-def get_user_repository(session: Session = Depends(get_db_session)) -> SQLAlchemyUserRepository:
+def get_user_repository(session: Session | AsyncSession = Depends(get_db_session)) -> SQLAlchemyUserRepository:
     """Get user repository"""
-    return SQLAlchemyUserRepository(session)
+    return create_user_repository(session)
 
 
-def get_transaction_repository(session: Session = Depends(get_db_session)) -> SQLAlchemyTransactionRepository:
+def get_transaction_repository(
+    session: Session | AsyncSession = Depends(get_db_session)
+) -> SQLAlchemyTransactionRepository:
     """Get transaction repository"""
-    return SQLAlchemyTransactionRepository(session)
+    return create_transaction_repository(session)
+
+
+def get_generation_job_repository(
+    session: Session | AsyncSession = Depends(get_db_session)
+) -> SQLAlchemyGenerationJobRepository:
+    """Get generation job repository"""
+    return create_generation_job_repository(session)
+
+
+def get_unit_of_work() -> UnitOfWork:
+    """Get a unit of work for use cases that open their own short transaction scopes"""
+    return SQLAlchemyUnitOfWork(get_database())
+
 
+def get_image_generator() -> ImageGenerator:
+    """Get the shared image generator service"""
+    return get_image_generator_instance()
 
-def get_image_generator(settings: Settings = Depends(get_app_settings)) -> GeminiImageGenerator:
-    """Get image generator service"""
-    return GeminiImageGenerator(api_key=settings.gemini_api_key)
 
+def get_reference_preprocessor() -> ReferenceImagePreprocessor:
+    """Get the shared reference image preprocessor"""
+    return get_reference_preprocessor_instance()
 
-def get_payment_gateway(settings: Settings = Depends(get_app_settings)) -> StripePaymentGateway:
-    """Get payment gateway service"""
-    return StripePaymentGateway(
-        api_key=settings.stripe_secret_key,
-        webhook_secret=settings.stripe_webhook_secret
+
+def get_reference_assets() -> ReferenceAssetStore:
+    """Get the shared store of reusable reference images"""
+    return get_reference_assets_instance()
+
+
+def get_rendition_service() -> RenditionService | None:
+    """Get the shared rendition service (None when images are returned inline)"""
+    return get_rendition_service_instance()
+
+
+def get_upload_validator(settings: Settings = Depends(get_app_settings)) -> UploadValidator:
+    """Get the upload validator configured with the upload limits"""
+    return UploadValidator(
+        max_bytes=settings.max_upload_bytes,
+        max_pixels=settings.max_upload_pixels,
+        max_dimension=settings.max_upload_dimension
     )
 
 
+def get_blob_store() -> BlobStore:
+    """Get the shared store of generated images"""
+    blob_store = get_blob_store_instance()
+    if blob_store is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image storage is disabled")
+    return blob_store
+
+
+def get_payment_gateway() -> PaymentGateway:
+    """Get the shared payment gateway service"""
+    return get_payment_gateway_instance()
+
+
 def get_generate_image_use_case(
-    user_repo: SQLAlchemyUserRepository = Depends(get_user_repository),
-    transaction_repo: SQLAlchemyTransactionRepository = Depends(get_transaction_repository),
-    image_generator: GeminiImageGenerator = Depends(get_image_generator)
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    image_generator: ImageGenerator = Depends(get_image_generator),
+    settings: Settings = Depends(get_app_settings)
 ) -> GenerateImageUseCase:
     """Get generate image use case"""
-    return GenerateImageUseCase(user_repo, transaction_repo, image_generator)
+    return GenerateImageUseCase(uow, image_generator, hold_ttl_seconds=settings.credit_hold_ttl_seconds)
+
+
+def get_generate_image_batch_use_case(
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    image_generator: ImageGenerator = Depends(get_image_generator),
+    settings: Settings = Depends(get_app_settings)
+) -> GenerateImageBatchUseCase:
+    """Get batch image generation use case"""
+    return GenerateImageBatchUseCase(uow, image_generator, hold_ttl_seconds=settings.credit_hold_ttl_seconds)
+
+
+def get_submit_generation_job_use_case(
+    user_repo: SQLAlchemyUserRepository = Depends(get_user_repository),
+    job_repo: SQLAlchemyGenerationJobRepository = Depends(get_generation_job_repository),
+    settings: Settings = Depends(get_app_settings)
+) -> SubmitGenerationJobUseCase:
+    """Get submit generation job use case"""
+    return SubmitGenerationJobUseCase(user_repo, job_repo, hold_ttl_seconds=settings.job_credit_hold_ttl_seconds)
+
+
+def get_generation_job_use_case(
+    job_repo: SQLAlchemyGenerationJobRepository = Depends(get_generation_job_repository)
+) -> GetGenerationJobUseCase:
+    """Get generation job polling use case"""
+    return GetGenerationJobUseCase(job_repo)
 
 
 def get_purchase_credits_use_case(
     user_repo: SQLAlchemyUserRepository = Depends(get_user_repository),
-    payment_gateway: StripePaymentGateway = Depends(get_payment_gateway)
+    payment_gateway: PaymentGateway = Depends(get_payment_gateway)
 ) -> PurchaseCreditsUseCase:
     """Get purchase credits use case"""
     return PurchaseCreditsUseCase(user_repo, payment_gateway)
 
 
 def get_complete_payment_use_case(
-    user_repo: SQLAlchemyUserRepository = Depends(get_user_repository),
-    transaction_repo: SQLAlchemyTransactionRepository = Depends(get_transaction_repository)
+    user_repo: SQLAlchemyUserRepository = Depends(get_user_repository)
 ) -> CompletePaymentUseCase:
     """Get complete payment use case"""
-    return CompletePaymentUseCase(user_repo, transaction_repo)
+    return CompletePaymentUseCase(user_repo)
 
 
 def get_user_credits_use_case(
@@ -1,14 +1,19 @@
 from fastapi import HTTPException, status
 
 from src.domain.exceptions import (
+    AssetNotFoundError,
     AuthenticationError,
     AuthorizationError,
     DomainException,
     ImageGenerationError,
+    ImageTooLargeError,
     InsufficientCreditsError,
     InvalidCreditPackageError,
     InvalidEmailError,
+    InvalidImageError,
+    JobNotFoundError,
     PaymentProcessingError,
+    ServiceOverloadedError,
     UserNotFoundError,
 )
 
@@ -27,18 +32,49 @@ def map_domain_exception_to_http(exception: Exception) -> HTTPException:
             detail=str(exception)
         )
 
+    if isinstance(exception, JobNotFoundError):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exception)
+        )
+
+    if isinstance(exception, AssetNotFoundError):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exception)
+        )
+
     if isinstance(exception, InvalidEmailError):
         return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exception)
         )
 
+    if isinstance(exception, ImageTooLargeError):
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(exception)
+        )
+
+    if isinstance(exception, InvalidImageError):
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exception)
+        )
+
     if isinstance(exception, InvalidCreditPackageError):
         return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exception)
         )
 
+    if isinstance(exception, ServiceOverloadedError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exception),
+            headers={"Retry-After": "5"}
+        )
+
     if isinstance(exception, ImageGenerationError):
         return HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1 +1 @@
-__all__ = ["credits", "feedback", "health", "image_generation", "payments", "webhooks"]
+__all__ = ["credits", "feedback", "health", "image_generation", "images", "internal", "payments", "webhooks"]
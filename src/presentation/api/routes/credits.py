@@ -23,5 +23,6 @@ async def get_credits(
 
     return CreditsResponse(
         credits=result.value.credits,
-        email=result.value.email
+        email=result.value.email,
+        held_credits=result.value.held_credits
     )
@@ -1,47 +1,182 @@
-from io import BytesIO
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
-from PIL import Image
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
 
-from src.application.use_cases.generate_image import GenerateImageRequest, GenerateImageUseCase
-from src.presentation.api.dependencies import get_generate_image_use_case
+from src.application.use_cases.generate_image import (
+    GenerateImageRequest,
+    GenerateImageResponse,
+    GenerateImageUseCase,
+)
+from src.application.use_cases.generate_image_batch import (
+    BatchItem,
+    GenerateImageBatchRequest,
+    GenerateImageBatchUseCase,
+)
+from src.application.use_cases.get_generation_job import GetGenerationJobRequest, GetGenerationJobUseCase
+from src.application.use_cases.submit_generation_job import (
+    SubmitGenerationJobRequest,
+    SubmitGenerationJobUseCase,
+)
+from src.domain.exceptions import AssetNotFoundError, DomainException, InvalidImageError, ServiceOverloadedError
+from src.domain.services.image_generator import VariationResult
+from src.infrastructure.imaging import (
+    PreparedImage,
+    ReferenceAssetStore,
+    ReferenceImagePreprocessor,
+    RenditionService,
+    UploadValidator,
+)
+from src.infrastructure.resilience.memory_budget import get_memory_budget
+from src.presentation.api.dependencies import (
+    get_generate_image_batch_use_case,
+    get_generate_image_use_case,
+    get_generation_job_use_case,
+    get_reference_assets,
+    get_reference_preprocessor,
+    get_rendition_service,
+    get_submit_generation_job_use_case,
+    get_upload_validator,
+)
 from src.presentation.api.error_handlers import map_domain_exception_to_http
-from src.presentation.api.schemas.responses import ImageGenerationResponse
+from src.presentation.api.schemas.responses import (
+    BatchGenerationResponse,
+    BatchItemResponse,
+    GenerationJobResponse,
+    GenerationJobSubmittedResponse,
+    ImageGenerationResponse,
+    ReferenceAssetResponse,
+)
 
 router = APIRouter(prefix="/api", tags=["generation"])
 
 
+async def _prepare_upload(
+        image: UploadFile,
+        validator: UploadValidator,
+        preprocessor: ReferenceImagePreprocessor
+) -> PreparedImage:
+    """Read the upload within the limits, check it really is an image and normalize it for the provider"""
+    try:
+        upload = await validator.read(image, declared_size=image.size)
+        # The raw upload is held while the decoded pixels are. Both are known once the header is
+        # checked, so they are reserved together: waiting for a second reservation while holding a
+        # first one lets a burst of uploads fill the budget and starve each other
+        async with get_memory_budget().reserve(len(upload.data) + upload.decoded_bytes):
+            return await preprocessor.prepare(upload.data)
+    except (InvalidImageError, ServiceOverloadedError) as e:
+        raise map_domain_exception_to_http(e)
+
+
+async def _resolve_reference(
+        image: UploadFile | None,
+        asset_id: str | None,
+        validator: UploadValidator,
+        preprocessor: ReferenceImagePreprocessor,
+        assets: ReferenceAssetStore
+) -> PreparedImage:
+    """Use the stored asset when an asset id is given, otherwise preprocess the uploaded image"""
+    if (image is None) == (asset_id is None):
+        raise HTTPException(status_code=400, detail="Provide either an image or an asset_id.")
+    if image is not None:
+        return await _prepare_upload(image, validator, preprocessor)
+    try:
+        return await assets.get(asset_id)
+    except AssetNotFoundError as e:
+        raise map_domain_exception_to_http(e)
+
+
+async def _render(
+        images: list[str],
+        output_format: str,
+        renditions: RenditionService | None
+) -> tuple[list[str], list[str | None]]:
+    """Re-encode images into the negotiated format and add thumbnails, where a blob store holds them"""
+    if renditions is None:
+        return images, [None] * len(images)
+    rendered = await asyncio.gather(*(renditions.render(image, output_format) for image in images))
+    return [r.image for r in rendered], [r.thumbnail for r in rendered]
+
+
+@router.post("/assets", response_model=ReferenceAssetResponse, status_code=status.HTTP_201_CREATED)
+async def upload_reference_asset(
+        image: UploadFile = File(...),
+        preprocessor: ReferenceImagePreprocessor = Depends(get_reference_preprocessor),
+        validator: UploadValidator = Depends(get_upload_validator),
+        assets: ReferenceAssetStore = Depends(get_reference_assets)
+):
+    """
+    Upload and preprocess a reference image once, for reuse by asset_id in the generate endpoints.
+
+    The asset expires after expires_in_seconds; uploading the same image again renews it.
+    """
+    prepared = await _prepare_upload(image, validator, preprocessor)
+    asset_id = await assets.put(prepared)
+    width, height = prepared.image.size
+    return ReferenceAssetResponse(
+        asset_id=asset_id,
+        content_type=prepared.content_type,
+        width=width,
+        height=height,
+        expires_in_seconds=assets.ttl_seconds
+    )
+
+
 @router.post("/generate", response_model=ImageGenerationResponse)
 async def generate_image(
         prompt: str = Form(...),
-        image: UploadFile = File(...),
+        image: UploadFile | None = File(default=None),
+        asset_id: str | None = Form(default=None),
         transformation_mode: str = Form(default="full-transformation"),
         user_email: str = Form(...),
-        use_case: GenerateImageUseCase = Depends(get_generate_image_use_case)
+        variations: int = Form(default=3),
+        quorum: int | None = Form(default=None),
+        deadline_seconds: float | None = Form(default=None),
+        image_format: str | None = Form(default=None),
+        accept: str | None = Header(default=None),
+        use_case: GenerateImageUseCase = Depends(get_generate_image_use_case),
+        preprocessor: ReferenceImagePreprocessor = Depends(get_reference_preprocessor),
+        validator: UploadValidator = Depends(get_upload_validator),
+        assets: ReferenceAssetStore = Depends(get_reference_assets),
+        renditions: RenditionService | None = Depends(get_rendition_service)
 ):
-    """Generate AI images based on prompt and reference image"""
-    if not image.content_type or not image.content_type.startswith("image/"):
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file type. Please upload an image."
-        )
+    """
+    Generate AI images based on prompt and reference image.
+
+    The reference is either an uploaded image or the asset_id of one stored with POST /api/assets.
+    Each image asked for costs one credit: all `variations`, or the quorum. Set quorum (and/or
+    deadline_seconds) to launch `variations` variations but return once quorum have succeeded or the
+    deadline passes; the rest are cancelled. Only delivered images are charged.
+    Images come back in the format named by image_format (webp, avif, jpeg, png or original),
+    else the best image type in the Accept header, each with a thumbnail.
+    """
+    prepared = await _resolve_reference(image, asset_id, validator, preprocessor, assets)
 
     try:
-        image_data = await image.read()
-        pil_image = Image.open(BytesIO(image_data))
         request = GenerateImageRequest(
             email=user_email,
             prompt=prompt,
-            image=pil_image,
-            transformation_mode=transformation_mode
+            image=prepared.image,
+            transformation_mode=transformation_mode,
+            variations=variations,
+            quorum=quorum,
+            deadline_seconds=deadline_seconds,
+            image_data=prepared.data,
+            image_content_type=prepared.content_type
         )
         result = await use_case.execute(request)
 
         if result.is_failure():
             raise map_domain_exception_to_http(result.error)
 
+        output_format = renditions.negotiate(image_format, accept) if renditions else "original"
+        images, thumbnails = await _render(result.value.images, output_format, renditions)
         return ImageGenerationResponse(
-            images=result.value.images,
+            images=images,
+            thumbnails=thumbnails,
             credits_remaining=result.value.credits_remaining
         )
 
@@ -50,3 +185,200 @@ async def generate_image(
     except Exception as e:
         print(f"Error in image generation endpoint: {e!s}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/generate/stream")
+async def generate_image_stream(
+        prompt: str = Form(...),
+        image: UploadFile | None = File(default=None),
+        asset_id: str | None = Form(default=None),
+        transformation_mode: str = Form(default="full-transformation"),
+        user_email: str = Form(...),
+        variations: int = Form(default=3),
+        quorum: int | None = Form(default=None),
+        deadline_seconds: float | None = Form(default=None),
+        image_format: str | None = Form(default=None),
+        accept: str = Header(default="application/x-ndjson"),
+        use_case: GenerateImageUseCase = Depends(get_generate_image_use_case),
+        preprocessor: ReferenceImagePreprocessor = Depends(get_reference_preprocessor),
+        validator: UploadValidator = Depends(get_upload_validator),
+        assets: ReferenceAssetStore = Depends(get_reference_assets),
+        renditions: RenditionService | None = Depends(get_rendition_service)
+):
+    """
+    Generate AI images, streaming each variation as soon as it is ready.
+
+    Emits one "variation" event (image and thumbnail) per finished variation and a final "done"
+    event with credits_remaining (or an "error" event). Server-Sent Events are used when the
+    client accepts text/event-stream, newline-delimited JSON otherwise. Quorum, deadline and image
+    formats work as for /generate.
+    """
+    prepared = await _resolve_reference(image, asset_id, validator, preprocessor, assets)
+    request = GenerateImageRequest(
+        email=user_email,
+        prompt=prompt,
+        image=prepared.image,
+        transformation_mode=transformation_mode,
+        variations=variations,
+        quorum=quorum,
+        deadline_seconds=deadline_seconds,
+        image_data=prepared.data,
+        image_content_type=prepared.content_type
+    )
+    result = await use_case.execute_stream(request)
+
+    if result.is_failure():
+        raise map_domain_exception_to_http(result.error)
+
+    use_sse = "text/event-stream" in accept
+    output_format = renditions.negotiate(image_format, accept) if renditions else "original"
+    return StreamingResponse(
+        _stream_events(result.value, use_sse, output_format, renditions),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _stream_events(
+        items: AsyncIterator[VariationResult | GenerateImageResponse],
+        use_sse: bool,
+        output_format: str,
+        renditions: RenditionService | None
+) -> AsyncIterator[str]:
+    """Serialize use case stream items as SSE or NDJSON events"""
+
+    def encode(event: str, data: dict) -> str:
+        if use_sse:
+            return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        return json.dumps({"event": event, **data}) + "\n"
+
+    try:
+        async with aclosing(items):
+            async for item in items:
+                if isinstance(item, GenerateImageResponse):
+                    yield encode("done", {"credits_remaining": item.credits_remaining})
+                elif item.succeeded:
+                    (image,), (thumbnail,) = await _render([item.image], output_format, renditions)
+                    yield encode("variation", {"index": item.index, "image": image, "thumbnail": thumbnail})
+                else:
+                    yield encode("variation_failed", {"index": item.index, "detail": str(item.error)})
+    except DomainException as e:
+        yield encode("error", {"detail": map_domain_exception_to_http(e).detail})
+    except Exception as e:
+        print(f"Error in image generation stream: {e!s}")
+        yield encode("error", {"detail": "An unexpected error occurred"})
+
+
+@router.post("/generate/batch", response_model=BatchGenerationResponse)
+async def generate_image_batch(
+        prompts: list[str] = Form(...),
+        image: UploadFile | None = File(default=None),
+        asset_id: str | None = Form(default=None),
+        transformation_modes: list[str] = Form(default=["full-transformation"]),
+        user_email: str = Form(...),
+        image_format: str | None = Form(default=None),
+        accept: str | None = Header(default=None),
+        use_case: GenerateImageBatchUseCase = Depends(get_generate_image_batch_use_case),
+        preprocessor: ReferenceImagePreprocessor = Depends(get_reference_preprocessor),
+        validator: UploadValidator = Depends(get_upload_validator),
+        assets: ReferenceAssetStore = Depends(get_reference_assets),
+        renditions: RenditionService | None = Depends(get_rendition_service)
+):
+    """
+    Generate several styles from one uploaded reference image.
+
+    Send one "prompts" field per style. "transformation_modes" is either a single mode for every
+    prompt or one per prompt. Items that fail are refunded individually. Image formats are
+    negotiated as for /generate.
+    """
+    if len(transformation_modes) == 1:
+        transformation_modes = transformation_modes * len(prompts)
+    if len(transformation_modes) != len(prompts):
+        raise HTTPException(
+            status_code=400,
+            detail="Provide one transformation mode, or one per prompt."
+        )
+
+    prepared = await _resolve_reference(image, asset_id, validator, preprocessor, assets)
+    request = GenerateImageBatchRequest(
+        email=user_email,
+        image=prepared.image,
+        items=[BatchItem(prompt, mode) for prompt, mode in zip(prompts, transformation_modes, strict=True)],
+        image_data=prepared.data,
+        image_content_type=prepared.content_type
+    )
+    result = await use_case.execute(request)
+
+    if result.is_failure():
+        raise map_domain_exception_to_http(result.error)
+
+    output_format = renditions.negotiate(image_format, accept) if renditions else "original"
+    rendered = await asyncio.gather(
+        *(_render(item.images, output_format, renditions) for item in result.value.results)
+    )
+    return BatchGenerationResponse(
+        results=[
+            BatchItemResponse(
+                prompt=item.prompt,
+                transformation_mode=item.transformation_mode,
+                images=images,
+                thumbnails=thumbnails,
+                error=item.error
+            )
+            for item, (images, thumbnails) in zip(result.value.results, rendered, strict=True)
+        ],
+        credits_remaining=result.value.credits_remaining
+    )
+
+
+@router.post("/generate/jobs", response_model=GenerationJobSubmittedResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_generation_job(
+        prompt: str = Form(...),
+        image: UploadFile | None = File(default=None),
+        asset_id: str | None = Form(default=None),
+        transformation_mode: str = Form(default="full-transformation"),
+        user_email: str = Form(...),
+        use_case: SubmitGenerationJobUseCase = Depends(get_submit_generation_job_use_case),
+        preprocessor: ReferenceImagePreprocessor = Depends(get_reference_preprocessor),
+        validator: UploadValidator = Depends(get_upload_validator),
+        assets: ReferenceAssetStore = Depends(get_reference_assets)
+):
+    """Reserve credits and queue a generation, returning a job id to poll (image or asset_id)"""
+    prepared = await _resolve_reference(image, asset_id, validator, preprocessor, assets)
+    request = SubmitGenerationJobRequest(
+        email=user_email,
+        prompt=prompt,
+        image_data=prepared.data,
+        transformation_mode=transformation_mode
+    )
+    result = await use_case.execute(request)
+
+    if result.is_failure():
+        raise map_domain_exception_to_http(result.error)
+
+    return GenerationJobSubmittedResponse(
+        job_id=result.value.job_id,
+        status=result.value.status,
+        credits_remaining=result.value.credits_remaining
+    )
+
+
+@router.get("/generate/jobs/{job_id}", response_model=GenerationJobResponse)
+async def get_generation_job(
+        job_id: str,
+        use_case: GetGenerationJobUseCase = Depends(get_generation_job_use_case)
+):
+    """Get the status and, once finished, the results of a generation job"""
+    result = await use_case.execute(GetGenerationJobRequest(job_id=job_id))
+
+    if result.is_failure():
+        raise map_domain_exception_to_http(result.error)
+
+    return GenerationJobResponse(
+        job_id=result.value.job_id,
+        status=result.value.status,
+        images=result.value.images,
+        error=result.value.error,
+        created_at=result.value.created_at,
+        updated_at=result.value.updated_at
+    )
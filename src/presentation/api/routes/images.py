@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+
+from src.domain.services.blob_store import BlobStore
+from src.presentation.api.dependencies import get_blob_store
+
+router = APIRouter(prefix="/api", tags=["images"])
+
+# Keys are content hashes, so a URL always points at the same bytes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/images/{key}")
+async def get_image(
+        key: str,
+        range_header: str | None = Header(default=None, alias="range"),
+        if_none_match: str | None = Header(default=None, alias="if-none-match"),
+        blob_store: BlobStore = Depends(get_blob_store)
+):
+    """Serve a generated image by content hash, with ETag revalidation and byte ranges"""
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    blob = await blob_store.get(key)
+    if blob is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+
+    byte_range = None
+    if range_header:
+        try:
+            byte_range = _parse_range(range_header, len(blob.data))
+        except ValueError:
+            # Malformed or multi-part ranges are ignored, as RFC 9110 allows
+            pass
+        else:
+            if byte_range is None:
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail="Requested range not satisfiable",
+                    headers={"Content-Range": f"bytes */{len(blob.data)}"}
+                )
+
+    if byte_range is None:
+        return Response(content=blob.data, media_type=blob.content_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{len(blob.data)}"
+    return Response(
+        content=blob.data[start:end + 1],
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=blob.content_type,
+        headers=headers
+    )
+
+
+def _parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single "bytes=start-end" range into inclusive bounds.
+
+    Returns None if the range is unsatisfiable (it starts at or past the end of the body, or is an
+    empty suffix), raises ValueError if it is malformed or unsupported, including a last byte
+    before the first one.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        raise ValueError(f"Unsupported range: {range_header}")
+
+    first, _, last = spec.strip().partition("-")
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length < 0:
+            raise ValueError(f"Invalid range: {range_header}")
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+
+    if last and end < start:
+        raise ValueError(f"Invalid range: {range_header}")
+    if start >= size:
+        return None
+    return start, min(end, size - 1)
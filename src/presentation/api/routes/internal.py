@@ -0,0 +1,35 @@
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from src.infrastructure.config.settings import Settings
+from src.infrastructure.database.connection import get_database
+from src.infrastructure.external_services.registry import collect_stats
+from src.presentation.api.dependencies import get_app_settings
+
+router = APIRouter(prefix="/api/internal", tags=["internal"], include_in_schema=False)
+
+
+def require_internal_token(
+        authorization: str | None = Header(default=None),
+        settings: Settings = Depends(get_app_settings)
+) -> None:
+    """Only serve internal endpoints when a token is configured and the request presents it"""
+    if not settings.internal_metrics_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.internal_metrics_token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+@router.get("/metrics", dependencies=[Depends(require_internal_token)])
+async def get_metrics() -> dict[str, dict]:
+    """Counters and gauges of the process-wide components"""
+    stats = collect_stats()
+    stats["database_pool"] = get_database().pool_stats()
+    return stats
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, Header, Request
 
 from src.application.use_cases.complete_payment import CompletePaymentRequest, CompletePaymentUseCase
+from src.domain.services.payment_gateway import PaymentGateway
 from src.infrastructure.config.settings import Settings
-from src.infrastructure.external_services.stripe_payment_gateway import StripePaymentGateway
 from src.presentation.api.dependencies import (
     get_app_settings,
     get_complete_payment_use_case,
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
 async def stripe_webhook(
         request: Request,
         stripe_signature: str = Header(None, alias="stripe-signature"),
-        payment_gateway: StripePaymentGateway = Depends(get_payment_gateway),
+        payment_gateway: PaymentGateway = Depends(get_payment_gateway),
         use_case: CompletePaymentUseCase = Depends(get_complete_payment_use_case),
         settings: Settings = Depends(get_app_settings)
 ):
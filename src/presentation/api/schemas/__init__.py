@@ -1,15 +1,22 @@
 from src.presentation.api.schemas.requests import CheckoutRequest, FeedbackRequest, GenerateImageFormRequest
 from src.presentation.api.schemas.responses import (
+    BatchGenerationResponse,
+    BatchItemResponse,
     CheckoutResponse,
     CreditsResponse,
     ErrorResponse,
     FeedbackResponse,
+    GenerationJobResponse,
+    GenerationJobSubmittedResponse,
     HealthResponse,
     ImageGenerationResponse,
+    ReferenceAssetResponse,
     WebhookResponse,
 )
 
 __all__ = [
+    "BatchGenerationResponse",
+    "BatchItemResponse",
     "CheckoutRequest",
     "CheckoutResponse",
     "CreditsResponse",
@@ -17,7 +24,10 @@ __all__ = [
     "FeedbackRequest",
     "FeedbackResponse",
     "GenerateImageFormRequest",
+    "GenerationJobResponse",
+    "GenerationJobSubmittedResponse",
     "HealthResponse",
     "ImageGenerationResponse",
+    "ReferenceAssetResponse",
     "WebhookResponse",
 ]
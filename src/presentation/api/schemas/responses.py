@@ -1,3 +1,4 @@
+from datetime import datetime
 
 from pydantic import BaseModel
 
@@ -16,10 +17,11 @@ class FeedbackResponse(BaseModel):
 
 
 class CreditsResponse(BaseModel):
-    """Response schema for user credits"""
+    """Response schema for user credits (available balance, plus credits held by generations in flight)"""
 
     credits: int
     email: str
+    held_credits: int = 0
 
 
 class CheckoutResponse(BaseModel):
@@ -29,13 +31,60 @@ class CheckoutResponse(BaseModel):
     session_id: str
 
 
+class ReferenceAssetResponse(BaseModel):
+    """Response schema for an uploaded reference image asset"""
+
+    asset_id: str
+    content_type: str
+    width: int
+    height: int
+    expires_in_seconds: int
+
+
 class ImageGenerationResponse(BaseModel):
     """Response schema for image generation"""
 
     images: list[str]
+    thumbnails: list[str | None] = []
+    credits_remaining: int
+
+
+class BatchItemResponse(BaseModel):
+    """Images generated for one prompt of a batch"""
+
+    prompt: str
+    transformation_mode: str
+    images: list[str]
+    thumbnails: list[str | None] = []
+    error: str | None = None
+
+
+class BatchGenerationResponse(BaseModel):
+    """Response schema for batch image generation, grouped by prompt"""
+
+    results: list[BatchItemResponse]
     credits_remaining: int
 
 
+class GenerationJobSubmittedResponse(BaseModel):
+    """Response schema for an accepted generation job"""
+
+    job_id: str
+    status: str
+    credits_remaining: int
+
+
+class GenerationJobResponse(BaseModel):
+    """Response schema for generation job status"""
+
+    job_id: str
+    status: str
+    images: list[str]
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+
 class HealthResponse(BaseModel):
     """Response schema for health check"""
 
@@ -0,0 +1,20 @@
+import asyncio
+from collections.abc import Awaitable, Callable, MutableMapping
+from typing import TypeVar
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+
+async def await_shared(tasks: MutableMapping[K, asyncio.Task], key: K, start: Callable[[], Awaitable[T]]) -> T:
+    """
+    Await the task computing key, starting it on first use, and share it with every caller.
+
+    The task is shielded, so a caller that is cancelled (a quorum deadline, a client disconnect)
+    stops waiting without cancelling it for the others. A task cancelled anyway is started again.
+    """
+    task = tasks.get(key)
+    if task is None or task.cancelled():
+        task = asyncio.ensure_future(start())
+        tasks[key] = task
+    return await asyncio.shield(task)
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import signal
+import socket
+from contextlib import suppress
+
+from PIL import Image
+
+from src.application.use_cases.complete_generation_job import (
+    CompleteGenerationJobRequest,
+    CompleteGenerationJobUseCase,
+)
+from src.domain.entities.generation_job import GenerationJob
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator, VariationResult
+from src.infrastructure.compute import get_cpu_executor, initialize_cpu_executor, shutdown_cpu_executor
+from src.infrastructure.config.settings import initialize_settings
+from src.infrastructure.database.connection import DatabaseConnection, initialize_database
+from src.infrastructure.external_services.registry import (
+    close_image_generator,
+    initialize_blob_store,
+    initialize_image_generator,
+)
+from src.infrastructure.imaging import decode_image
+from src.infrastructure.repositories import (
+    create_generation_job_repository,
+    create_user_repository,
+)
+from src.infrastructure.resilience import initialize_memory_budget
+
+
+class GenerationWorker:
+    """Pulls generation jobs from the queue table and runs them against the image generator"""
+
+    def __init__(
+            self,
+            db: DatabaseConnection,
+            image_generator: ImageGenerator,
+            concurrency: int,
+            poll_interval: float,
+            lease_seconds: int,
+            max_attempts: int
+    ):
+        self._db = db
+        self._image_generator = image_generator
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming new jobs; jobs in progress are allowed to finish"""
+        self._stopping.set()
+
+    async def run(self) -> None:
+        slots = asyncio.Semaphore(self._concurrency)
+        in_flight: set[asyncio.Task] = set()
+
+        def release(task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            slots.release()
+
+        while not self._stopping.is_set():
+            await slots.acquire()
+
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"[WORKER] Failed to claim a job: {e!s}")
+                job = None
+
+            if job is None:
+                slots.release()
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self._stopping.wait(), self._poll_interval)
+                continue
+
+            task = asyncio.create_task(self._process(job))
+            in_flight.add(task)
+            task.add_done_callback(release)
+
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _claim(self) -> GenerationJob | None:
+        async with self._db.get_session() as session:
+            return await create_generation_job_repository(session).claim_next(self._worker_id, self._lease_seconds)
+
+    async def _process(self, job: GenerationJob) -> None:
+        results: list[VariationResult] = []
+        error = None
+
+        if job.attempts > self._max_attempts:
+            error = f"Abandoned after {job.attempts - 1} attempts"
+        else:
+            try:
+                # Jobs store the preprocessed upload, which is sent to the provider as it is
+                reference = await get_cpu_executor().run(decode_image, job.reference_image)
+                request = GenerationRequest(
+                    prompt=job.prompt,
+                    reference_image=reference,
+                    variations=job.variations,
+                    reference_data=job.reference_image,
+                    reference_mime_type=Image.MIME.get(reference.format)
+                )
+                results = await self._image_generator.generate_variations(request)
+            except Exception as e:
+                error = str(e)
+
+        async with self._db.get_session() as session:
+            use_case = CompleteGenerationJobUseCase(
+                create_user_repository(session),
+                create_generation_job_repository(session)
+            )
+            result = await use_case.execute(CompleteGenerationJobRequest(job, self._worker_id, results, error))
+
+        if result.is_failure():
+            print(f"[WORKER] Failed to complete job {job.id}: {result.error}")
+        else:
+            print(f"[WORKER] Job {job.id} {result.value.status.value}")
+
+
+async def main() -> None:
+    """Generation worker entry point, scaled independently of the API processes"""
+    settings = initialize_settings()
+
+    db = initialize_database(
+        settings.database_url,
+        pool=settings.database_pool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_pool_max_overflow,
+        pool_timeout=settings.database_pool_timeout_seconds,
+        pool_recycle=settings.database_pool_recycle_seconds,
+        pool_pre_ping=settings.database_pool_pre_ping
+    )
+    await db.create_tables()
+
+    initialize_cpu_executor(
+        settings.cpu_executor_kind,
+        settings.cpu_executor_max_workers,
+        settings.cpu_executor_max_concurrency
+    )
+    initialize_memory_budget(settings.memory_budget_bytes, settings.memory_budget_wait_timeout_seconds)
+    initialize_blob_store(settings)
+
+    worker = GenerationWorker(
+        db=db,
+        image_generator=initialize_image_generator(settings),
+        concurrency=settings.job_worker_concurrency,
+        poll_interval=settings.job_poll_interval_seconds,
+        lease_seconds=settings.job_lease_seconds,
+        max_attempts=settings.job_max_attempts
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    print(f"Generation worker started (concurrency={settings.job_worker_concurrency})")
+    try:
+        await worker.run()
+    finally:
+        await close_image_generator()
+        shutdown_cpu_executor()
+        print("Generation worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
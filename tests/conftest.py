@@ -0,0 +1,45 @@
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+
+import httpx
+import pytest
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def start_app(tmp_path, monkeypatch) -> Callable[..., AbstractAsyncContextManager[httpx.AsyncClient]]:
+    """
+    Start the application with the fake image generator and a throwaway database.
+
+    Keyword arguments override settings by name, e.g. start_app(database_pool_size=2).
+    """
+    defaults = {
+        "database_url": f"sqlite+aiosqlite:///{tmp_path / 'credits.db'}",
+        "image_generator_backend": "fake",
+        "fake_generator_latency_p50_seconds": 0.05,
+        "fake_generator_latency_p99_seconds": 0.1,
+        "fake_generator_image_size": 32,
+        "blob_store_backend": "memory",
+        "generation_cache_enabled": False,
+        "reference_asset_dir": "",
+        "generation_record_dir": "",
+        "fake_generator_replay_dir": "",
+    }
+
+    @asynccontextmanager
+    async def start(**overrides) -> AsyncIterator[httpx.AsyncClient]:
+        for name, value in {**defaults, **overrides}.items():
+            monkeypatch.setenv(name.upper(), str(value))
+
+        from src.main import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+                yield client
+
+    return start
@@ -0,0 +1,22 @@
+import io
+
+from PIL import Image
+
+from src.domain.entities.user import User
+from src.domain.value_objects.credits import Credits
+from src.domain.value_objects.email import Email
+
+
+async def create_user(email: str, credits: int) -> User:
+    """Store a user in the running application's database"""
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.repositories import create_user_repository
+
+    async with get_database().get_session() as session:
+        return await create_user_repository(session).save(User.create(Email(email), Credits(credits)))
+
+
+def png_bytes(shade: int = 0) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), (shade, shade, shade)).save(buffer, "PNG")
+    return buffer.getvalue()
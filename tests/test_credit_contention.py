@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.domain.entities.credit_transaction import CreditTransaction
+from src.domain.value_objects.credits import Credits
+from src.infrastructure.database.connection import DatabaseConnection
+from src.infrastructure.database.models import TransactionModel, UserModel
+from src.infrastructure.repositories import create_user_repository
+from tests.helpers import create_user, png_bytes
+
+pytestmark = pytest.mark.anyio
+
+CHARGES = 60
+
+
+async def balance_and_ledger(db: DatabaseConnection) -> tuple[int, int]:
+    async with db.get_session() as session:
+        balance = (await session.execute(select(UserModel.credits))).scalar_one()
+        ledger = (await session.execute(select(func.count()).select_from(TransactionModel))).scalar_one()
+    return balance, ledger
+
+
+async def test_parallel_charges_never_overdraw(start_app):
+    from src.infrastructure.database.connection import get_database
+
+    async with start_app():
+        user = await create_user("contended@example.com", 100)
+
+        async def charge() -> bool:
+            async with get_database().get_session() as session:
+                usage = CreditTransaction.create_usage(user.id, Credits(3), "Image generation")
+                return await create_user_repository(session).apply_transaction(usage) is not None
+
+        granted = await asyncio.gather(*(charge() for _ in range(CHARGES)))
+
+        assert sum(granted) == 33
+        assert await balance_and_ledger(get_database()) == (1, 33)
+
+
+async def test_parallel_holds_never_overdraw(start_app):
+    from src.infrastructure.database.connection import get_database
+
+    async with start_app():
+        user = await create_user("held@example.com", 100)
+
+        async def hold() -> bool:
+            async with get_database().get_session() as session:
+                held = CreditTransaction.create_hold(user.id, Credits(3), "Image generation", datetime.now() + timedelta(minutes=5))
+                return await create_user_repository(session).hold_credits(held) is not None
+
+        granted = await asyncio.gather(*(hold() for _ in range(CHARGES)))
+
+        async with get_database().get_session() as session:
+            held = await create_user_repository(session).find_held_credits(user.id)
+        assert sum(granted) == 33 and held.value == 99
+        assert await balance_and_ledger(get_database()) == (1, 0)
+
+
+async def test_parallel_generations_for_one_user(start_app):
+    from src.infrastructure.database.connection import get_database
+
+    async with start_app() as client:
+        await create_user("busy@example.com", 20)
+
+        responses = await asyncio.gather(*(
+            client.post(
+                "/api/generate",
+                data={"prompt": f"style of test {i}", "user_email": "busy@example.com"},
+                files={"image": ("photo.png", png_bytes(i), "image/png")}
+            )
+            for i in range(12)
+        ))
+
+        statuses = sorted(response.status_code for response in responses)
+        assert statuses == [200] * 6 + [402] * 6
+        assert await balance_and_ledger(get_database()) == (2, 6)
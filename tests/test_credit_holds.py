@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from PIL import Image
+from sqlalchemy import event
+
+from src.application.use_cases.generate_image import GenerateImageRequest, GenerateImageUseCase
+from src.domain.entities.credit_transaction import CreditTransaction, TransactionType
+from src.domain.value_objects.credits import Credits
+from tests.helpers import create_user, png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+def unit_of_work():
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.repositories import SQLAlchemyUnitOfWork
+
+    return SQLAlchemyUnitOfWork(get_database())
+
+
+async def balances(user_id: int) -> tuple[int, int]:
+    async with unit_of_work().begin() as repos:
+        user = await repos.users.find_by_id(user_id)
+        return user.credits.value, (await repos.users.find_held_credits(user_id)).value
+
+
+@pytest.mark.parametrize("driver", ["sqlite", "sqlite+aiosqlite"])
+async def test_hold_capture_and_release(start_app, tmp_path, driver):
+    async with start_app(database_url=f"{driver}:///{tmp_path / 'holds.db'}"):
+        user = await create_user("holds@example.com", 10)
+
+        def hold() -> CreditTransaction:
+            return CreditTransaction.create_hold(user.id, Credits(3), "Image generation", datetime.now() + timedelta(minutes=5))
+
+        full, partial, released = hold(), hold(), hold()
+        async with unit_of_work().begin() as repos:
+            assert (await repos.users.hold_credits(full)).value == 7
+            assert (await repos.users.hold_credits(partial)).value == 4
+            assert (await repos.users.hold_credits(released)).value == 1
+            assert await repos.users.hold_credits(hold()) is None
+        assert await balances(user.id) == (1, 9)
+
+        async with unit_of_work().begin() as repos:
+            assert (await repos.users.capture_hold(CreditTransaction.create_capture(full, Credits(3), "all"))).value == 1
+            assert (await repos.users.capture_hold(CreditTransaction.create_capture(partial, Credits(1), "one"))).value == 3
+            assert (await repos.users.release_hold(CreditTransaction.create_release(released, "failed"))).value == 6
+
+            # A hold settles once
+            assert await repos.users.capture_hold(CreditTransaction.create_capture(full, Credits(3), "again")) is None
+            assert await repos.users.release_hold(CreditTransaction.create_release(released, "again")) is None
+        assert await balances(user.id) == (6, 0)
+
+        # Captures are recorded with the hold they settled; releases leave no ledger row
+        async with unit_of_work().begin() as repos:
+            ledger = await repos.transactions.find_by_user_id(user.id)
+        assert sorted(((t.transaction_type, t.hold_id, t.credits.value) for t in ledger), key=lambda row: row[2]) == sorted([
+            (TransactionType.CAPTURE, full.hold_id, -3),
+            (TransactionType.CAPTURE, partial.hold_id, -1),
+        ], key=lambda row: row[2])
+
+
+async def test_successful_generation_writes_four_statements_on_sqlite(start_app):
+    from src.infrastructure.database.connection import get_database
+
+    async with start_app() as client:
+        await create_user("writes@example.com", 10)
+
+        writes = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().split()[0].upper() in ("INSERT", "UPDATE", "DELETE"):
+                writes.append(statement.split()[0].upper())
+
+        engine = get_database().engine.sync_engine
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = await client.post(
+                "/api/generate",
+                data={"prompt": "style of test", "user_email": "writes@example.com"},
+                files={"image": ("photo.png", png_bytes(), "image/png")}
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200 and response.json()["credits_remaining"] == 7
+    # Hold: balance update and hold row. Full capture: hold delete and ledger row.
+    assert writes == ["UPDATE", "INSERT", "DELETE", "INSERT"]
+
+
+async def test_closing_a_generation_stream_early_releases_its_hold(start_app):
+    from src.infrastructure.external_services.registry import get_image_generator_instance
+
+    async with start_app(fake_generator_latency_p50_seconds=0.05, fake_generator_latency_p99_seconds=2.0):
+        user = await create_user("stream@example.com", 10)
+        use_case = GenerateImageUseCase(unit_of_work(), get_image_generator_instance())
+
+        def request() -> GenerateImageRequest:
+            return GenerateImageRequest(
+                "stream@example.com", "style of test", Image.new("RGB", (64, 64)), "full-transformation"
+            )
+
+        # The client disconnects after the first variation
+        stream = (await use_case.execute_stream(request())).value
+        await anext(stream)
+        await stream.aclose()
+        assert await balances(user.id) == (10, 0)
+
+        # The request task is cancelled while it waits for a variation
+        async def consume() -> None:
+            async for _ in (await use_case.execute_stream(request())).value:
+                await asyncio.Event().wait()
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.5)
+        assert await balances(user.id) == (7, 3)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0.1)
+        assert await balances(user.id) == (10, 0)
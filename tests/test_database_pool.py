@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from tests.helpers import create_user, png_bytes
+
+pytestmark = pytest.mark.anyio
+
+GENERATIONS = 30
+
+
+async def test_concurrent_generations_do_not_exhaust_a_small_pool(start_app):
+    from src.infrastructure.database.connection import get_database
+
+    async with start_app(
+        database_pool_size=2,
+        database_pool_max_overflow=0,
+        database_pool_timeout_seconds=2,
+        fake_generator_latency_p50_seconds=1.0,
+        fake_generator_latency_p99_seconds=1.2,
+        generation_single_flight_enabled=False,
+        generation_max_concurrent_calls=GENERATIONS * 3,
+        provider_limiter_initial_limit=GENERATIONS * 3,
+        provider_limiter_max_limit=GENERATIONS * 3,
+    ) as client:
+        for i in range(GENERATIONS):
+            await create_user(f"user{i}@example.com", 10)
+
+        responses = await asyncio.gather(*(
+            client.post(
+                "/api/generate",
+                data={"prompt": f"style of test {i}", "user_email": f"user{i}@example.com"},
+                files={"image": ("photo.png", png_bytes(i), "image/png")}
+            )
+            for i in range(GENERATIONS)
+        ))
+        stats = get_database().pool_stats()
+
+    # Each generation holds a connection only for its hold and its capture, not while generating
+    assert [response.status_code for response in responses] == [200] * GENERATIONS
+    assert stats["size"] == 2 and stats["max_in_use"] <= 2
+    assert stats["timeouts"] == 0
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import pytest
+
+from tests.helpers import create_user, png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_health_answers_quickly_while_generations_run(start_app):
+    async with start_app(fake_generator_latency_p50_seconds=1.0, fake_generator_latency_p99_seconds=1.2) as client:
+        for i in range(4):
+            await create_user(f"user{i}@example.com", 10)
+
+        generations = [
+            asyncio.create_task(client.post(
+                "/api/generate",
+                data={"prompt": f"style of test {i}", "user_email": f"user{i}@example.com"},
+                files={"image": ("photo.png", png_bytes(i), "image/png")}
+            ))
+            for i in range(4)
+        ]
+        await asyncio.sleep(0.3)
+
+        latencies = []
+        while not all(task.done() for task in generations):
+            started = time.perf_counter()
+            response = await client.get("/api/health")
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+            await asyncio.sleep(0.05)
+
+        responses = await asyncio.gather(*generations)
+
+    assert [response.status_code for response in responses] == [200] * 4
+    assert len(latencies) >= 5
+    assert max(latencies) < 0.25
@@ -0,0 +1,61 @@
+import pytest
+from PIL import Image
+
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.infrastructure.cache.generation_cache import CachingImageGenerator, GenerationResultCache
+from src.infrastructure.imaging.renditions import RenditionService
+from src.infrastructure.storage import InMemoryBlobStore
+from tests.helpers import png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+class StoringImageGenerator(ImageGenerator):
+    """Stores a new 60-byte image in the blob store on every call"""
+
+    def __init__(self, blob_store: InMemoryBlobStore) -> None:
+        self.blob_store = blob_store
+        self.calls = 0
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        self.calls += 1
+        return self.blob_store.url_for(await self.blob_store.put(bytes([self.calls]) * 60, "image/png"))
+
+
+async def test_cached_urls_to_evicted_blobs_are_generated_again():
+    blob_store = InMemoryBlobStore("http://test/api/images", max_bytes=100)
+    inner = StoringImageGenerator(blob_store)
+    cache = GenerationResultCache(1 << 20)
+    generator = CachingImageGenerator(inner, cache, "model", blob_store=blob_store)
+    request = GenerationRequest("a lighthouse", Image.new("RGB", (16, 16)), variations=1)
+
+    (first,) = await generator.generate_variations(request)
+    (hit,) = await generator.generate_variations(request)
+    assert hit.cached and hit.image == first.image and inner.calls == 1
+
+    await blob_store.put(b"x" * 60, "image/png")
+    (regenerated,) = await generator.generate_variations(request)
+
+    assert not regenerated.cached and inner.calls == 2
+    assert await blob_store.exists(blob_store.key_from_url(regenerated.image))
+    assert cache.stats()["invalidations"] == 1
+
+
+async def test_renditions_of_evicted_blobs_are_produced_again(start_app):
+    async with start_app():
+        source = png_bytes(shade=200)
+        blob_store = InMemoryBlobStore("http://test/api/images", max_bytes=len(source) * 4)
+        renditions = RenditionService(blob_store)
+        image = blob_store.url_for(await blob_store.put(source, "image/png"))
+
+        first = await renditions.render(image, "original")
+        assert first.thumbnail is not None
+
+        # A blob over the budget evicts everything else, then the source comes back
+        await blob_store.put(b"x" * len(source) * 4, "image/png")
+        await blob_store.put(source, "image/png")
+
+        second = await renditions.render(image, "original")
+        assert second.thumbnail == first.thumbnail
+        assert await blob_store.exists(blob_store.key_from_url(second.thumbnail))
+        assert renditions.stats()["stale"] == 1 and renditions.stats()["produced"] == 2
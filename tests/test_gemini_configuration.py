@@ -0,0 +1,26 @@
+import pytest
+
+from tests.helpers import create_user, png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_service_starts_without_a_gemini_key(start_app, monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+    async with start_app(image_generator_backend="gemini", gemini_api_key="") as client:
+        await create_user("user@example.com", 10)
+
+        health = await client.get("/api/health")
+        credits = await client.get("/api/credits/user@example.com")
+        generation = await client.post(
+            "/api/generate",
+            data={"prompt": "style of test", "user_email": "user@example.com"},
+            files={"image": ("photo.png", png_bytes(), "image/png")}
+        )
+        after = await client.get("/api/credits/user@example.com")
+
+    assert health.status_code == 200
+    assert credits.json()["credits"] == 10
+    assert generation.status_code == 500
+    assert after.json() == {"credits": 10, "email": "user@example.com", "held_credits": 0}
@@ -0,0 +1,136 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.application.use_cases.complete_generation_job import (
+    CompleteGenerationJobRequest,
+    CompleteGenerationJobUseCase,
+)
+from src.domain.entities.credit_transaction import TransactionType
+from src.domain.entities.generation_job import GenerationJob, JobStatus
+from src.domain.exceptions import JobLeaseLostError
+from src.domain.services.image_generator import VariationResult
+from src.domain.value_objects.credits import Credits
+from tests.helpers import create_user, png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+async def claim(worker_id: str, lease_seconds: int = 600) -> GenerationJob:
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.repositories import create_generation_job_repository
+
+    async with get_database().get_session() as session:
+        return await create_generation_job_repository(session).claim_next(worker_id, lease_seconds)
+
+
+async def complete(job: GenerationJob, worker_id: str, results: list[VariationResult], error: str | None = None):
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.repositories import create_generation_job_repository, create_user_repository
+
+    async with get_database().get_session() as session:
+        use_case = CompleteGenerationJobUseCase(
+            create_user_repository(session),
+            create_generation_job_repository(session)
+        )
+        return await use_case.execute(CompleteGenerationJobRequest(job, worker_id, results, error))
+
+
+async def submit(client, email: str):
+    return await client.post(
+        "/api/generate/jobs",
+        data={"prompt": "a lighthouse", "user_email": email},
+        files={"image": ("photo.png", png_bytes(), "image/png")}
+    )
+
+
+async def test_a_job_reclaimed_after_its_lease_expired_is_refunded_once(start_app):
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.repositories import create_generation_job_repository, create_user_repository
+
+    async with start_app():
+        user = await create_user("lease@example.com", 10)
+        async with get_database().get_session() as session:
+            await create_generation_job_repository(session).save(GenerationJob(
+                id=uuid.uuid4().hex,
+                user_id=user.id,
+                prompt="a lighthouse",
+                reference_image=png_bytes(),
+                credits_charged=Credits(3)
+            ))
+
+        first = await claim("worker-a", lease_seconds=0)
+        await asyncio.sleep(0.01)
+        second = await claim("worker-b", lease_seconds=0)
+        assert first.id == second.id and second.attempts == 2
+
+        late = await complete(first, "worker-a", [], "provider down")
+        assert late.is_failure() and isinstance(late.error, JobLeaseLostError)
+
+        current = await complete(second, "worker-b", [], "provider down")
+        assert current.is_success() and current.value.status is JobStatus.FAILED
+
+        repeated = await complete(second, "worker-b", [], "provider down")
+        assert repeated.is_failure() and isinstance(repeated.error, JobLeaseLostError)
+
+        async with get_database().get_session() as session:
+            refunded = await create_user_repository(session).find_by_id(user.id)
+        assert refunded.credits.value == 13
+
+
+async def test_a_job_holds_its_credits_until_it_completes(start_app):
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.repositories import SQLAlchemyUnitOfWork
+
+    async with start_app() as client:
+        user = await create_user("held-job@example.com", 10)
+        submitted = await submit(client, "held-job@example.com")
+        held = await client.get("/api/credits/held-job@example.com")
+
+        job = await claim("worker-a")
+        results = [VariationResult(0, "a"), VariationResult(1, "b"), VariationResult(2, error=TimeoutError())]
+        completed = await complete(job, "worker-a", results)
+        settled = await client.get("/api/credits/held-job@example.com")
+
+        async with SQLAlchemyUnitOfWork(get_database()).begin() as repos:
+            ledger = await repos.transactions.find_by_user_id(user.id)
+
+    assert submitted.status_code == 202 and submitted.json()["credits_remaining"] == 7
+    assert held.json()["held_credits"] == 3
+    assert completed.is_success() and completed.value.images == ["a", "b"]
+    # Two of three images were delivered: two credits are captured and one is released
+    assert settled.json()["credits"] == 8 and settled.json()["held_credits"] == 0
+    assert [(row.transaction_type, row.credits.value, row.hold_id) for row in ledger] == [
+        (TransactionType.CAPTURE, -2, job.hold_id)
+    ]
+
+
+async def test_a_job_that_never_completes_has_its_hold_swept_back(start_app):
+    from src.application.use_cases.release_expired_holds import (
+        ReleaseExpiredHoldsRequest,
+        ReleaseExpiredHoldsUseCase,
+    )
+    from src.infrastructure.database.connection import get_database
+    from src.infrastructure.repositories import SQLAlchemyUnitOfWork
+
+    async with start_app(job_credit_hold_ttl_seconds=60) as client:
+        await create_user("crashed-job@example.com", 10)
+        await submit(client, "crashed-job@example.com")
+        job = await claim("worker-a")
+
+        # The worker crashed; the sweeper returns the credits once the hold expires
+        sweep = await ReleaseExpiredHoldsUseCase(SQLAlchemyUnitOfWork(get_database())).execute(
+            ReleaseExpiredHoldsRequest(datetime.now() + timedelta(seconds=61))
+        )
+        swept = await client.get("/api/credits/crashed-job@example.com")
+
+        # A worker that finishes the job after all charges what it delivered directly
+        completed = await complete(job, "worker-a", [VariationResult(i, f"image-{i}") for i in range(3)])
+        charged = await client.get("/api/credits/crashed-job@example.com")
+
+    assert sweep.value.released == 1
+    assert swept.json() == {"credits": 10, "email": "crashed-job@example.com", "held_credits": 0}
+    assert completed.is_success()
+    assert charged.json()["credits"] == 7
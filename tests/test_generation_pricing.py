@@ -0,0 +1,40 @@
+import pytest
+
+from tests.helpers import create_user, png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize(("form", "charged"), [
+    ({}, 3),
+    ({"variations": 8}, 8),
+    ({"variations": 8, "deadline_seconds": 30}, 8),
+    ({"variations": 8, "quorum": 2}, 2),
+])
+async def test_generations_are_charged_per_image(start_app, form, charged):
+    async with start_app() as client:
+        await create_user("priced@example.com", 20)
+
+        response = await client.post(
+            "/api/generate",
+            data={"prompt": "style of test", "user_email": "priced@example.com", **form},
+            files={"image": ("photo.png", png_bytes(), "image/png")}
+        )
+
+    assert response.status_code == 200
+    assert response.json()["credits_remaining"] == 20 - charged
+
+
+async def test_variations_beyond_the_balance_are_refused(start_app):
+    async with start_app() as client:
+        await create_user("short@example.com", 5)
+
+        response = await client.post(
+            "/api/generate",
+            data={"prompt": "style of test", "user_email": "short@example.com", "variations": 8},
+            files={"image": ("photo.png", png_bytes(), "image/png")}
+        )
+        credits = await client.get("/api/credits/short@example.com")
+
+    assert response.status_code == 402
+    assert credits.json()["credits"] == 5
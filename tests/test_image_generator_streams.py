@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from PIL import Image
+
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.infrastructure.cache.generation_cache import CachingImageGenerator, GenerationResultCache
+
+pytestmark = pytest.mark.anyio
+
+
+class StallingImageGenerator(ImageGenerator):
+    """Returns the first variation at once and never finishes the others"""
+
+    def __init__(self) -> None:
+        self.cancelled: set[int] = set()
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        if index == 0:
+            return "first"
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled.add(index)
+            raise
+
+
+@pytest.mark.parametrize("cached", [False, True])
+async def test_closing_a_stream_early_cancels_the_remaining_variations(cached):
+    inner = StallingImageGenerator()
+    generator = CachingImageGenerator(inner, GenerationResultCache(1 << 20), "model") if cached else inner
+    request = GenerationRequest("a lighthouse", Image.new("RGB", (16, 16)), variations=3)
+
+    stream = generator.stream_variations(request)
+    first = await anext(stream)
+    await stream.aclose()
+    await asyncio.sleep(0)
+
+    assert first.image == "first"
+    assert inner.cancelled == {1, 2}
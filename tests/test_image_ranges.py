@@ -0,0 +1,26 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_byte_ranges(start_app):
+    from src.infrastructure.external_services.registry import get_blob_store_instance
+
+    async with start_app() as client:
+        key = await get_blob_store_instance().put(bytes(range(100)), "image/png")
+
+        partial = await client.get(f"/api/images/{key}", headers={"Range": "bytes=10-19"})
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == "bytes 10-19/100"
+        assert partial.content == bytes(range(10, 20))
+
+        suffix = await client.get(f"/api/images/{key}", headers={"Range": "bytes=-5"})
+        assert suffix.status_code == 206 and suffix.content == bytes(range(95, 100))
+
+        # A last byte before the first one is invalid, so the range is ignored
+        backwards = await client.get(f"/api/images/{key}", headers={"Range": "bytes=20-10"})
+        assert backwards.status_code == 200 and backwards.content == bytes(range(100))
+
+        past_the_end = await client.get(f"/api/images/{key}", headers={"Range": "bytes=100-"})
+        assert past_the_end.status_code == 416
+        assert past_the_end.headers["content-range"] == "bytes */100"
@@ -0,0 +1,23 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_are_disabled_without_a_token(start_app, monkeypatch):
+    monkeypatch.delenv("INTERNAL_METRICS_TOKEN", raising=False)
+
+    async with start_app() as client:
+        response = await client.get("/api/internal/metrics")
+
+    assert response.status_code == 404
+
+
+async def test_metrics_require_the_configured_token(start_app):
+    async with start_app(internal_metrics_token="s3cret") as client:
+        missing = await client.get("/api/internal/metrics")
+        wrong = await client.get("/api/internal/metrics", headers={"Authorization": "Bearer nope"})
+        right = await client.get("/api/internal/metrics", headers={"Authorization": "Bearer s3cret"})
+
+    assert missing.status_code == 401 and wrong.status_code == 401
+    assert right.status_code == 200
+    assert "database_pool" in right.json()
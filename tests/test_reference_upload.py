@@ -0,0 +1,40 @@
+import pytest
+
+from src.domain.services.image_generator import GenerationRequest
+from src.infrastructure.cache.fingerprint import reference_fingerprint
+from src.infrastructure.external_services.gemini_image_generator import GeminiImageGenerator
+from src.infrastructure.imaging import PreparedImage, ReferenceImagePreprocessor
+from tests.helpers import png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+def generation_request(prepared: PreparedImage) -> GenerationRequest:
+    return GenerationRequest(
+        "a lighthouse",
+        prepared.image,
+        reference_data=prepared.data,
+        reference_mime_type=prepared.content_type
+    )
+
+
+async def test_gemini_uploads_the_preprocessed_bytes_unchanged():
+    prepared = await ReferenceImagePreprocessor().prepare(png_bytes(40))
+    generator = GeminiImageGenerator(api_key="test")
+    try:
+        part = await generator._get_reference_part(generation_request(prepared))
+    finally:
+        await generator.aclose()
+
+    assert prepared.content_type == "image/jpeg"
+    assert part.inline_data.data == prepared.data
+    assert part.inline_data.mime_type == "image/jpeg"
+
+
+async def test_a_preprocessor_cache_hit_fingerprints_like_the_miss():
+    preprocessor = ReferenceImagePreprocessor()
+    miss = await preprocessor.prepare(png_bytes(40))
+    hit = await preprocessor.prepare(png_bytes(40))
+
+    assert preprocessor.hits == 1
+    assert await reference_fingerprint(generation_request(miss)) == await reference_fingerprint(generation_request(hit))
@@ -0,0 +1,103 @@
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.domain.entities.credit_transaction import CreditTransaction, TransactionType
+from src.domain.entities.generation_job import GenerationJob, JobStatus
+from src.domain.entities.user import User
+from src.domain.value_objects.credits import Credits
+from src.domain.value_objects.email import Email
+from src.domain.value_objects.money import Money
+from src.infrastructure.database.connection import DatabaseConnection
+from src.infrastructure.repositories import (
+    AsyncSQLAlchemyUserRepository,
+    create_generation_job_repository,
+    create_transaction_repository,
+    create_user_repository,
+)
+from tests.helpers import png_bytes
+
+pytestmark = pytest.mark.anyio
+
+
+@asynccontextmanager
+async def open_database(url: str) -> AsyncIterator[DatabaseConnection]:
+    db = DatabaseConnection(url)
+    await db.create_tables()
+    try:
+        yield db
+    finally:
+        if db.is_async:
+            await db.engine.dispose()
+        else:
+            db.engine.dispose()
+
+
+@pytest.fixture(params=["sqlite+aiosqlite", "sqlite"])
+def database_url(request, tmp_path) -> str:
+    return f"{request.param}:///{tmp_path / 'repositories.db'}"
+
+
+async def test_users_and_their_transactions(database_url):
+    async with open_database(database_url) as db:
+        async with db.get_session() as session:
+            users = create_user_repository(session)
+            assert isinstance(users, AsyncSQLAlchemyUserRepository) == db.is_async
+
+            user = await users.save(User.create(Email("repo@example.com"), Credits(10)))
+            purchase = CreditTransaction.create_purchase(user.id, Credits(50), Money(9.99), "cs_1", "Starter pack")
+            assert (await users.apply_transaction(purchase)).value == 60
+            assert (await users.apply_transaction(CreditTransaction.create_usage(user.id, Credits(3), "Image"))).value == 57
+
+        async with db.get_session() as session:
+            users = create_user_repository(session)
+            found = await users.find_by_email(Email("repo@example.com"))
+            assert found.id == user.id and found.credits.value == 57
+            assert str(found.total_purchased.value) == "9.99"
+            assert await users.exists_by_email(Email("repo@example.com"))
+            assert await users.find_by_id(user.id + 1) is None
+
+            found.set_stripe_customer_id("cus_1")
+            await users.update(found)
+
+            transactions = create_transaction_repository(session)
+            history = await transactions.find_by_user_id(user.id)
+            assert {t.transaction_type for t in history} == {TransactionType.PURCHASE, TransactionType.USAGE}
+            assert (await transactions.find_by_payment_id("cs_1")).credits.value == 50
+
+        async with db.get_session() as session:
+            assert (await create_user_repository(session).find_by_id(user.id)).stripe_customer_id == "cus_1"
+
+
+async def test_usage_that_would_overdraw_is_refused(database_url):
+    async with open_database(database_url) as db:
+        async with db.get_session() as session:
+            users = create_user_repository(session)
+            user = await users.save(User.create(Email("poor@example.com"), Credits(2)))
+
+            assert await users.apply_transaction(CreditTransaction.create_usage(user.id, Credits(3), "Image")) is None
+            assert (await users.find_by_id(user.id)).credits.value == 2
+            assert await create_transaction_repository(session).find_by_user_id(user.id) == []
+
+
+async def test_generation_jobs_are_claimed_once(database_url):
+    async with open_database(database_url) as db:
+        async with db.get_session() as session:
+            user = await create_user_repository(session).save(User.create(Email("jobs@example.com"), Credits(10)))
+            jobs = create_generation_job_repository(session)
+            job = await jobs.save(GenerationJob(
+                id=uuid.uuid4().hex,
+                user_id=user.id,
+                prompt="a lighthouse",
+                reference_image=png_bytes(),
+                credits_charged=Credits(3)
+            ))
+
+        async with db.get_session() as session:
+            jobs = create_generation_job_repository(session)
+            claimed = await jobs.claim_next("worker-a", lease_seconds=60)
+            assert claimed.id == job.id and claimed.status is JobStatus.RUNNING and claimed.attempts == 1
+            assert await jobs.claim_next("worker-b", lease_seconds=60) is None
+            assert (await jobs.find_by_id(job.id)).reference_image == job.reference_image
@@ -0,0 +1,51 @@
+import httpx
+import pytest
+from google.genai import errors
+from PIL import Image
+
+from src.domain.exceptions import ImageGenerationError
+from src.domain.services.image_generator import GenerationRequest, ImageGenerator
+from src.infrastructure.external_services.fake_image_generator import SimulatedProviderError
+from src.infrastructure.resilience.circuit_breaker import CircuitBreaker
+from src.infrastructure.resilience.resilient_image_generator import ResilientImageGenerator
+from src.infrastructure.resilience.retry import RetryBudget
+
+pytestmark = pytest.mark.anyio
+
+
+class FailingImageGenerator(ImageGenerator):
+    """Raises the same error on every call"""
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+        self.calls = 0
+
+    async def generate_variation(self, request: GenerationRequest, index: int) -> str:
+        self.calls += 1
+        raise self.error
+
+
+@pytest.mark.parametrize(("error", "calls"), [
+    (ImageGenerationError("Gemini API key not configured"), 1),
+    (ImageGenerationError("Variation 1: response contained no image data"), 1),
+    (errors.ClientError(400, {"error": {"message": "bad prompt"}}), 1),
+    (errors.ClientError(429, {"error": {"message": "rate limited"}}), 3),
+    (errors.ServerError(503, {"error": {"message": "unavailable"}}), 3),
+    (SimulatedProviderError("Simulated provider failure"), 3),
+    (TimeoutError(), 3),
+    (httpx.ConnectError("connection refused"), 3),
+])
+async def test_only_transient_errors_are_retried(error, calls):
+    inner = FailingImageGenerator(error)
+    generator = ResilientImageGenerator(
+        inner,
+        CircuitBreaker("test", failure_threshold=100),
+        RetryBudget(min_per_second=100),
+        max_retries=2,
+        base_delay=0
+    )
+
+    with pytest.raises(type(error)):
+        await generator.generate_variation(GenerationRequest("a lighthouse", Image.new("RGB", (16, 16))), 0)
+
+    assert inner.calls == calls
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from PIL import Image
+
+from src.domain.services.image_generator import GenerationRequest
+from src.shared.shared_tasks import await_shared
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_shared_task():
+    tasks: dict[str, asyncio.Task] = {}
+    release = asyncio.Event()
+    starts = 0
+
+    async def work() -> str:
+        nonlocal starts
+        starts += 1
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(await_shared(tasks, "key", work))
+    second = asyncio.create_task(await_shared(tasks, "key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    assert await await_shared(tasks, "key", work) == "done"
+    assert first.cancelled() and starts == 1
+
+
+async def test_a_cancelled_shared_task_is_started_again():
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def work() -> str:
+        return "done"
+
+    tasks["key"] = asyncio.ensure_future(asyncio.sleep(10))
+    tasks["key"].cancel()
+    await asyncio.sleep(0)
+
+    assert await await_shared(tasks, "key", work) == "done"
+
+
+async def test_reference_fingerprint_survives_a_cancelled_caller(start_app):
+    from src.infrastructure.cache.fingerprint import reference_fingerprint
+
+    async with start_app():
+        request = GenerationRequest("a lighthouse", Image.new("RGB", (512, 512)), variations=3)
+
+        caller = asyncio.create_task(reference_fingerprint(request))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+
+        assert len(await reference_fingerprint(request)) == 64
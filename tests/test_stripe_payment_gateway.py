@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.stripe_checkout_pool import StandIn, create_session
+from src.infrastructure.external_services.stripe_payment_gateway import StripePaymentGateway
+
+pytestmark = pytest.mark.anyio
+
+SESSIONS = 8
+LATENCY = 0.2
+
+
+async def test_concurrent_checkout_sessions_run_in_parallel_on_pooled_connections():
+    stand_in = StandIn(LATENCY)
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    api_base = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    gateway = StripePaymentGateway(api_key="sk_test_pool", api_base=api_base, max_network_retries=0)
+
+    async with server:
+        try:
+            started = time.perf_counter()
+            first = await asyncio.gather(*(create_session(gateway) for _ in range(SESSIONS)))
+            elapsed = time.perf_counter() - started
+            second = await asyncio.gather(*(create_session(gateway) for _ in range(SESSIONS)))
+        finally:
+            await gateway.aclose()
+
+    assert len(set(first + second)) == 2 * SESSIONS
+    assert stand_in.peak_in_flight == SESSIONS
+    assert elapsed < SESSIONS * LATENCY / 2
+    # The second round reuses the first round's keep-alive connections
+    assert stand_in.connections == SESSIONS
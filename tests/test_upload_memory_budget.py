@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+
+from tests.helpers import png_bytes
+
+pytestmark = pytest.mark.anyio
+
+UPLOADS = 8
+
+
+async def test_a_burst_of_uploads_shares_a_tight_memory_budget(start_app):
+    images = [png_bytes(shade) for shade in range(UPLOADS)]
+    # Room for one upload and its decoded pixels at a time, plus a little
+    budget = 64 * 64 * 4 + 2 * max(len(image) for image in images)
+
+    async with start_app(memory_budget_bytes=budget, memory_budget_wait_timeout_seconds=2) as client:
+        responses = await asyncio.gather(*(
+            client.post("/api/assets", files={"image": ("photo.png", image, "image/png")})
+            for image in images
+        ))
+
+    assert [response.status_code for response in responses] == [201] * UPLOADS